@@ -1,19 +1,25 @@
 import os
 import sys
 import yaml
+import socket
 import argparse
 import pandas as pd
+from datetime import date, datetime
 
 SDAM_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.dirname(SDAM_DIR)
 LOG_DIR = os.path.join(ROOT_DIR, "log")
 RESULT_DIR = os.path.join(ROOT_DIR, "results")
+CACHE_DIR = os.path.join(ROOT_DIR, "cache")
 sys.path.append(ROOT_DIR)
 
 from utils import get_logger
-from SDAM.collector import DART
-from annotator import Annotator
+from SDAM.collector import DART, WorkQueue
+from SDAM.collector._scheduler import KST
+from annotator import Annotator, SnapshotPriceSource, PriceCache
 from indicator import Indicator
+from store import ResultStore
+from pipeline import StreamingPipeline
 
 
 def get_args() -> argparse.Namespace:
@@ -22,8 +28,39 @@ def get_args() -> argparse.Namespace:
         "-k",
         "--key",
         type=str,
+        nargs="+",
         required=True,
-        help="DART API key from https://opendart.fss.or.kr/",
+        help="DART API keys from https://opendart.fss.or.kr/. "
+        "Requests are spread across the keys",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Overlap collection, annotation and indication in chunks",
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Request only the companies that filed since the last run "
+        "and patch the stored table",
+    )
+    parser.add_argument(
+        "--role",
+        choices=["enqueue", "work", "merge"],
+        help="Distributed collection through the work queue at --queue: "
+        "enqueue work items, collect them as a worker, or merge the results",
+    )
+    parser.add_argument(
+        "--queue",
+        type=str,
+        default=os.path.join(CACHE_DIR, "work_queue.sqlite3"),
+        help="Work queue file on a filesystem shared by the workers",
+    )
+    parser.add_argument(
+        "--worker",
+        type=str,
+        default=f"{socket.gethostname()}-{os.getpid()}",
+        help="Name of this worker in the work queue",
     )
 
     return parser.parse_args()
@@ -39,18 +76,103 @@ if __name__ == "__main__":
     CONFIG = load_config()
     CONFIG["DART"]["KEY"] = ARGS.key
     CONFIG["ENV"]["SAVE_DIR"] = RESULT_DIR
+    CONFIG["ENV"]["CACHE_DIR"] = CACHE_DIR
     INDEX_COL = "KRX_CODE"
     LOGGER = get_logger("MAIN", file_path=os.path.join(LOG_DIR, "main.log"))
     os.makedirs(RESULT_DIR, exist_ok=True)
 
+    ACCOUNT_NAMES = ["유동자산", "유동부채", "비유동자산", "비유동부채"]
+    TODAY = datetime.now(KST).date()
+    store = ResultStore(os.path.join(RESULT_DIR, CONFIG["ENV"]["STORE_DIR"]))
+
     DART_API = DART(CONFIG, logger=LOGGER)
-    table = DART_API.create_table(["유동자산", "유동부채", "비유동자산", "비유동부채"], 2022, 1)
-    table.to_csv(os.path.join(RESULT_DIR, "finance_table.csv"))
+    price_source = None
+    if CONFIG["ANNOTATOR"]["PRICE_SNAPSHOT"]:
+        price_source = SnapshotPriceSource(
+            os.path.join(ROOT_DIR, CONFIG["ANNOTATOR"]["PRICE_SNAPSHOT"]), LOGGER
+        )
+    price_cache_config = CONFIG["ANNOTATOR"]["PRICE_CACHE"]
+    price_cache = PriceCache(
+        os.path.join(CACHE_DIR, price_cache_config["FILE"]),
+        open_ttl=price_cache_config["OPEN_TTL"],
+        max_entries=price_cache_config["MAX_ENTRIES"],
+    )
+    annotator = Annotator(
+        LOGGER,
+        price_source=price_source,
+        price_cache=price_cache,
+        n_workers=CONFIG["ANNOTATOR"]["N_WORKERS"],
+        max_requests_per_second=CONFIG["ANNOTATOR"]["MAX_REQUESTS_PER_SECOND"],
+    )
+    indicator = Indicator(LOGGER)
 
-    annotator = Annotator(LOGGER)
-    table = annotator.annotate(table)
-    table.to_csv(os.path.join(RESULT_DIR, "annotated_table.csv"), encoding="utf-8")
+    if ARGS.role:
+        queue_config = CONFIG["COLLECTOR"]["WORK_QUEUE"]
+        queue = WorkQueue(
+            ARGS.queue,
+            lease_seconds=queue_config["LEASE_SECONDS"],
+            max_attempts=queue_config["MAX_ATTEMPTS"],
+        )
+        if ARGS.role == "enqueue":
+            DART_API.enqueue_work(queue, ACCOUNT_NAMES, (2022, 1), (2022, 1))
+        elif ARGS.role == "work":
+            DART_API.work(
+                queue,
+                ARGS.worker,
+                chunk_size=CONFIG["PIPELINE"]["CHUNK_SIZE"],
+                batch=True,
+            )
+        else:
+            # an incomplete queue only patches in the collected rows, so the
+            # companies not collected yet keep their stored rows
+            progress = queue.progress()
+            complete = not (
+                progress["pending"] or progress["leased"] or progress["failed"]
+            )
+            panel = DART_API.merge_work(queue)
+            for (year, quarter), table in panel.groupby(level=["YEAR", "QUARTER"]):
+                table = table.droplevel(["YEAR", "QUARTER"])
+                table = annotator.annotate(table)
+                table = indicator.indicate(table)
+                if complete:
+                    store.write(table, year, quarter)
+                    store.mark_refreshed(year, quarter, TODAY.isoformat())
+                else:
+                    store.patch(table, year, quarter)
+        sys.exit(0)
 
-    indicator = Indicator(LOGGER)
-    indicator.indicate(table)
-    table.to_csv(os.path.join(RESULT_DIR, "indicated_table.csv"), encoding="utf-8")
+    if ARGS.stream:
+        pipeline = StreamingPipeline(
+            DART_API,
+            annotator,
+            indicator,
+            logger=LOGGER,
+            queue_size=CONFIG["PIPELINE"]["QUEUE_SIZE"],
+        )
+        pipeline.run(
+            ACCOUNT_NAMES,
+            2022,
+            1,
+            store,
+            batch=True,
+            chunk_size=CONFIG["PIPELINE"]["CHUNK_SIZE"],
+        )
+
+    elif ARGS.delta and store.refreshed_on(2022, 1):
+        since = date.fromisoformat(store.refreshed_on(2022, 1))
+        table = DART_API.refresh_table(
+            ACCOUNT_NAMES, 2022, 1, since, until=TODAY, batch=True
+        )
+        if len(table):
+            table = annotator.annotate(table)
+            table = indicator.indicate(table)
+            store.patch(table, 2022, 1)
+
+    else:
+        table = DART_API.create_table(ACCOUNT_NAMES, 2022, 1, batch=True)
+        table = annotator.annotate(table)
+        table = indicator.indicate(table)
+        store.write(table, 2022, 1)
+
+    if not DART_API.failures:
+        store.mark_refreshed(2022, 1, TODAY.isoformat())
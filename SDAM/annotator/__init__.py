@@ -1,3 +1,11 @@
 from ._annotator import Annotator
+from price_source import PriceSource, SnapshotPriceSource
+from price_cache import PriceCache, CachedPriceSource
 
-__all__ = ["Annotator"]
+__all__ = [
+    "Annotator",
+    "PriceSource",
+    "SnapshotPriceSource",
+    "PriceCache",
+    "CachedPriceSource",
+]
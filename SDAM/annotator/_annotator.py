@@ -7,13 +7,43 @@ import pandas as pd
 ANNOT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(ANNOT_DIR)
 
+from price_source import PriceSource
+from price_cache import PriceCache, CachedPriceSource
 from financial_data_crawler import FinancialDataCrawler
 
 
 class Annotator:
-    def __init__(self, logger: Logger):
+    """Annotate tables indexed by KRX code with current stock prices
+
+    Parameters
+    ----------
+    logger (Logger): python built-in logger
+    price_source (PriceSource): source of stock prices
+        (default: FinancialDataCrawler crawling Naver finance)
+    price_cache (PriceCache): cache consulted before the price source, unless
+        the source is not cacheable (e.g. SnapshotPriceSource)
+    n_workers (int): number of tickers crawled concurrently by the default source
+    max_requests_per_second (float): request rate cap per host of the default source
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        price_source: PriceSource = None,
+        price_cache: PriceCache = None,
+        n_workers: int = 1,
+        max_requests_per_second: float = None,
+    ):
         self.logger = logger
-        self.finantial_crawler = FinancialDataCrawler(logger)
+        self.price_source = price_source or FinancialDataCrawler(
+            logger,
+            n_workers=n_workers,
+            max_requests_per_second=max_requests_per_second,
+        )
+        if price_cache is not None and self.price_source.cacheable:
+            self.price_source = CachedPriceSource(
+                self.price_source, price_cache, logger
+            )
 
     def annotate(self, table: pd.DataFrame) -> pd.DataFrame:
 
@@ -22,12 +52,7 @@ class Annotator:
         if table.index.name is None:
             ValueError("Expected table with index, passed not set-index table")
 
-        prices = list()
-        for idx, row in table.iterrows():
-            stock_code = row.name
-            prices.append(self.finantial_crawler.get_stock_price(stock_code))
-
-        table["STOCK_PRICE"] = prices
+        table["STOCK_PRICE"] = self.price_source.get_stock_prices(list(table.index))
 
         self.logger.info("End of processing: Annotation of stock price.")
         return table
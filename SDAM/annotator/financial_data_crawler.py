@@ -1,18 +1,72 @@
+import os
+import re
+import sys
+from html import unescape
 from logging import Logger
-from urllib.request import urlopen
+from urllib.parse import urlparse
+
+import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+
+ANNOT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(ANNOT_DIR)
+sys.path.append(ROOT_DIR)
+
+from throttle import RateLimiter
+from price_source import PriceSource
 
+REDIRECTION_TITLE = "네이버 :: 세상의 모든 지식, 네이버"
+TITLE_PATTERN = re.compile(r"<title\b[^>]*>(.*?)</title>", re.S | re.I)
+NO_TODAY_PATTERN = re.compile(
+    r'<p\b[^>]*\bclass="[^"]*\bno_today\b[^"]*"[^>]*>(.*?)</p>', re.S
+)
+SPAN_PATTERN = re.compile(r"<span\b[^>]*>(.*?)</span>", re.S)
+TAG_PATTERN = re.compile(r"<[^>]+>")
 
-class FinancialDataCrawler(object):
+
+class FinancialDataCrawler(PriceSource):
     """financial Data Crawler from Naver finance
 
     Parameters
     ----------
     logger (Logger): python built-in logger
+    n_workers (int): number of tickers crawled concurrently, which is also
+        the number of keep-alive connections kept per host
+    max_requests_per_second (float): request rate cap applied to each host
+    base_url (str): root of Naver finance, e.g. a local stand-in for benchmarks
     """
 
-    def __init__(self, logger: Logger = Logger(__name__)) -> None:
+    def __init__(
+        self,
+        logger: Logger = Logger(__name__),
+        n_workers: int = 1,
+        max_requests_per_second: float = None,
+        base_url: str = "https://finance.naver.com/",
+    ) -> None:
         self.logger = logger
+        self.base_url = base_url
+        self.n_workers = n_workers
+        self.max_requests_per_second = max_requests_per_second
+        self.rate_limiters = dict()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=n_workers, pool_maxsize=n_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _get(self, url: str) -> bytes:
+        """Request url through the pooled session, throttled per host"""
+        host = urlparse(url).netloc
+        rate_limiter = self.rate_limiters.setdefault(
+            host, RateLimiter(self.max_requests_per_second)
+        )
+        rate_limiter.acquire()
+
+        response = self.session.get(url)
+        response.raise_for_status()
+        return response.content
 
     def _check_redirection(self, bs_obj):
         """To check rediction due to not existing ticker
@@ -21,7 +75,21 @@ class FinancialDataCrawler(object):
         ------
         bool
         """
-        return bs_obj.find("title").get_text() == "네이버 :: 세상의 모든 지식, 네이버"
+        return bs_obj.find("title").get_text() == REDIRECTION_TITLE
+
+    def _is_redirection(self, html: str) -> bool:
+        """_check_redirection on the raw page, without building a tree"""
+        return unescape(TITLE_PATTERN.search(html).group(1)) == REDIRECTION_TITLE
+
+    def get_html(self, corp_code: str) -> str:
+        """get decoded item page from naver financial.
+
+        Args:
+            corp_code (str): cooperation code nominated by KRX
+        """
+
+        URL = "{}item/main.nhn?code={}".format(self.base_url, corp_code)
+        return self._get(URL).decode("cp949")
 
     def get_bs4_obj(self, corp_code: str):
         """get attribute from naver financial.
@@ -31,9 +99,7 @@ class FinancialDataCrawler(object):
             attribute (str): data label
         """
 
-        URL = "https://finance.naver.com/item/main.nhn?code={}".format(corp_code)
-        res = urlopen(URL).read().decode("cp949")
-        bs_obj = BeautifulSoup(res, "html.parser")
+        bs_obj = BeautifulSoup(self.get_html(corp_code), "html.parser")
 
         if self._check_redirection(bs_obj):
             raise ValueError("Ticker not existed")
@@ -44,20 +110,48 @@ class FinancialDataCrawler(object):
         self.logger.debug(f"In processing: {corp_code} stock_price crawling")
 
         try:
-            bs4_obj = self.get_bs4_obj(corp_code)
+            html = self.get_html(corp_code)
+            if self._is_redirection(html):
+                raise ValueError("Ticker not existed")
         except:
             self.logger.warning(f"{corp_code} was not found")
             return 0
 
-        market_sum = bs4_obj.find("p", attrs={"class": "no_today"})
-
         try:
-            spans = market_sum.find_all("span")[1:]
-            csv = [tag.get_text() for tag in spans]
-            current_price = "".join(csv)
-            current_price = int(current_price.replace(",", ""))
-            return current_price
+            return self.extract_stock_price(html)
 
         except:
             self.logger.debug(f"{corp_code} was not parsed")
             return 0
+
+    @staticmethod
+    def parse_stock_price(bs_obj: BeautifulSoup) -> int:
+        """current price from the full tree of an item page"""
+        market_sum = bs_obj.find("p", attrs={"class": "no_today"})
+
+        spans = market_sum.find_all("span")[1:]
+        csv = [tag.get_text() for tag in spans]
+        current_price = "".join(csv)
+        return int(current_price.replace(",", ""))
+
+    @staticmethod
+    def extract_stock_price(html: str) -> int:
+        """current price from the p.no_today fragment of an item page
+
+        Same result as parse_stock_price, but only the fragment is scanned with
+        precompiled patterns instead of building the tree of the whole page.
+        The spans inside p.no_today are expected not to be nested.
+        """
+        market_sum = NO_TODAY_PATTERN.search(html).group(1)
+
+        spans = SPAN_PATTERN.findall(market_sum)[1:]
+        csv = [unescape(TAG_PATTERN.sub("", span)) for span in spans]
+        current_price = "".join(csv)
+        return int(current_price.replace(",", ""))
+
+    def get_stock_prices(self, corp_codes: list) -> list:
+        if self.n_workers <= 1:
+            return super().get_stock_prices(corp_codes)
+
+        with ThreadPoolExecutor(max_workers=self.n_workers) as executor:
+            return list(executor.map(self.get_stock_price, corp_codes))
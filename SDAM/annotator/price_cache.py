@@ -0,0 +1,171 @@
+import os
+import time
+import sqlite3
+import threading
+from logging import Logger
+from datetime import datetime, timedelta, timezone
+
+from price_source import PriceSource
+
+KST = timezone(timedelta(hours=9))
+SESSION_OPEN = (9, 0)
+SESSION_CLOSE = (15, 30)
+SQLITE_MAX_VARIABLES = 500
+
+
+def trading_session(now: datetime = None) -> tuple:
+    """Return (trading date, whether the session is open) of KRX at now
+
+    Before the opening bell the last trading day is the previous weekday, and
+    weekends map to the preceding Friday. Exchange holidays are not modeled.
+
+    Example:
+        >>> trading_session(datetime(2022, 5, 14, 10, 0, tzinfo=KST))  # Saturday
+        ('2022-05-13', False)
+    """
+
+    now = (now or datetime.now(KST)).astimezone(KST)
+    hour_minute = (now.hour, now.minute)
+
+    day = now.date()
+    is_open = now.weekday() < 5 and SESSION_OPEN <= hour_minute < SESSION_CLOSE
+    if now.weekday() < 5 and hour_minute < SESSION_OPEN:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+
+    return day.isoformat(), is_open
+
+
+class PriceCache(object):
+    """Stock prices persisted in SQLite, keyed by (ticker, trading date)
+
+    Prices fetched while the session is open expire after open_ttl seconds,
+    prices of closed sessions never expire. Once more than max_entries
+    prices are stored, the least recently read ones are evicted.
+
+    Parameters
+    ----------
+    path (str): path of the sqlite file
+    open_ttl (int): seconds a price fetched during an open session is valid
+    max_entries (int): maximum number of prices kept
+
+    Example
+    -------
+        >>> cache = PriceCache("cache/price_cache.sqlite3")
+        >>> cache.put_many({"005930": 66500}, "2022-05-13", is_final=True)
+        >>> cache.get_many(["005930", "000660"], "2022-05-13")
+        {'005930': 66500}
+    """
+
+    def __init__(
+        self, path: str, open_ttl: int = 5 * 60, max_entries: int = 200_000
+    ) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.open_ttl = open_ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS prices (
+                    ticker TEXT NOT NULL,
+                    trading_date TEXT NOT NULL,
+                    price INTEGER NOT NULL,
+                    is_final INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (ticker, trading_date)
+                )
+                """
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS prices_accessed_at ON prices (accessed_at)"
+            )
+
+    def get_many(self, tickers: list, trading_date: str) -> dict:
+        now = time.time()
+        prices = dict()
+        with self.lock, self.conn:
+            for i in range(0, len(tickers), SQLITE_MAX_VARIABLES):
+                chunk = list(tickers[i : i + SQLITE_MAX_VARIABLES])
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    "SELECT ticker, price FROM prices "
+                    f"WHERE trading_date=? AND ticker IN ({placeholders}) "
+                    "AND (is_final=1 OR fetched_at>=?)",
+                    [trading_date] + chunk + [now - self.open_ttl],
+                ).fetchall()
+                self.conn.executemany(
+                    "UPDATE prices SET accessed_at=? WHERE ticker=? AND trading_date=?",
+                    [(now, ticker, trading_date) for ticker, _ in rows],
+                )
+                prices.update(rows)
+
+        return prices
+
+    def put_many(self, prices: dict, trading_date: str, is_final: bool) -> None:
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO prices VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (ticker, trading_date, price, int(is_final), now, now)
+                    for ticker, price in prices.items()
+                ],
+            )
+
+            (n_entries,) = self.conn.execute("SELECT COUNT(*) FROM prices").fetchone()
+            if n_entries > self.max_entries:
+                self.conn.execute(
+                    "DELETE FROM prices WHERE rowid IN "
+                    "(SELECT rowid FROM prices ORDER BY accessed_at LIMIT ?)",
+                    (n_entries - self.max_entries,),
+                )
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class CachedPriceSource(PriceSource):
+    """PriceSource answering from a PriceCache before asking the wrapped source
+
+    Prices of 0 (not found or not parsed) are not cached.
+
+    Parameters
+    ----------
+    source (PriceSource): source asked for the prices missing in the cache
+    cache (PriceCache): cache of prices
+    logger (Logger): python built-in logger
+    """
+
+    def __init__(
+        self, source: PriceSource, cache: PriceCache, logger: Logger = Logger(__name__)
+    ) -> None:
+        self.source = source
+        self.cache = cache
+        self.logger = logger
+
+    def get_stock_price(self, corp_code: str) -> int:
+        return self.get_stock_prices([corp_code])[0]
+
+    def get_stock_prices(self, corp_codes: list) -> list:
+        trading_date, is_open = trading_session()
+        prices = self.cache.get_many(corp_codes, trading_date)
+
+        missing = [corp_code for corp_code in corp_codes if corp_code not in prices]
+        self.logger.debug(
+            f"{len(prices)} prices from cache, {len(missing)} requested ({trading_date})"
+        )
+        if missing:
+            fetched = dict(zip(missing, self.source.get_stock_prices(missing)))
+            self.cache.put_many(
+                {corp_code: price for corp_code, price in fetched.items() if price},
+                trading_date,
+                is_final=not is_open,
+            )
+            prices.update(fetched)
+
+        return [prices[corp_code] for corp_code in corp_codes]
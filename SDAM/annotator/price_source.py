@@ -0,0 +1,82 @@
+from logging import Logger
+
+import pandas as pd
+
+
+class PriceSource(object):
+    """Interface of the stock price sources used by Annotator
+
+    Implementations return the current price of a ticker nominated by KRX,
+    or 0 if the price is not available. Sources whose prices are not the
+    prices of the current trading session set cacheable to False, so they are
+    not cached under the session's date.
+    """
+
+    cacheable = True
+
+    def get_stock_price(self, corp_code: str) -> int:
+        raise NotImplementedError
+
+    def get_stock_prices(self, corp_codes: list) -> list:
+        return [self.get_stock_price(corp_code) for corp_code in corp_codes]
+
+
+class SnapshotPriceSource(PriceSource):
+    """Whole-market daily price snapshot loaded with a single read
+
+    The default columns follow the KRX end-of-day CSV (전종목 시세) downloaded
+    from data.krx.co.kr, but any CSV with a ticker and a price column works,
+    e.g. a file dropped by the market data job.
+
+    Parameters
+    ----------
+    path (str): path of the snapshot CSV
+    logger (Logger): python built-in logger
+    code_column (str): column of tickers nominated by KRX
+    price_column (str): column of closing prices
+    encoding (str): encoding of the CSV
+
+    The snapshot is already held in memory and its prices are of the day the
+    file was taken, so it is not cached by PriceCache.
+
+    Example
+    -------
+        >>> source = SnapshotPriceSource("data/krx_20220513.csv")
+        >>> source.get_stock_price("005930")
+        66500
+    """
+
+    cacheable = False
+
+    def __init__(
+        self,
+        path: str,
+        logger: Logger = Logger(__name__),
+        code_column: str = "종목코드",
+        price_column: str = "종가",
+        encoding: str = "cp949",
+    ) -> None:
+        self.logger = logger
+
+        data = pd.read_csv(
+            path,
+            encoding=encoding,
+            usecols=[code_column, price_column],
+            dtype={code_column: str, price_column: str},
+        )
+        codes = data[code_column].str.strip()
+        codes = codes.where(~codes.str.isdigit(), codes.str.zfill(6))
+        prices = pd.to_numeric(
+            data[price_column].str.replace(",", ""), errors="coerce"
+        ).fillna(0)
+
+        self.prices = dict(zip(codes, prices.astype("int64").tolist()))
+        self.logger.info(f"{len(self.prices)} prices loaded from {path}")
+
+    def get_stock_price(self, corp_code: str) -> int:
+        price = self.prices.get(corp_code)
+        if price is None:
+            self.logger.warning(f"{corp_code} was not found")
+            return 0
+
+        return price
@@ -6,15 +6,26 @@ from unittest.mock import Mock
 
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
 ANNOT_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(ANNOT_DIR)
 
-sys.path.append(ANNOT_DIR)
+sys.path.append(ROOT_DIR)
 
 from annotator import Annotator
 
+# 900070 was delisted and naver redirects its item page
+PAGES = {"950130": "naver_950130.html", "900070": "naver_redirect.html"}
+
+
+def load_page(corp_code):
+    with open(os.path.join(TEST_DIR, "data", PAGES[corp_code]), encoding="UTF-8") as fh:
+        return fh.read()
+
 
 @pytest.fixture()
 def annotator():
-    return Annotator(Mock())
+    _annotator = Annotator(Mock())
+    _annotator.price_source.get_html = Mock(side_effect=load_page)
+    return _annotator
 
 
 def test_annotate_error(annotator):
@@ -51,4 +62,4 @@ def test_annotate_error(annotator):
     )
     table.set_index("stock_code", inplace=True)
     result_table = annotator.annotate(table)
-    assert "stock_price" in result_table.columns
+    assert list(result_table["STOCK_PRICE"]) == [7000, 0]
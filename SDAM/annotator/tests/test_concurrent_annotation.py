@@ -0,0 +1,44 @@
+import os
+import sys
+import time
+import random
+import pandas as pd
+from unittest.mock import Mock
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+ANNOT_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(ANNOT_DIR)
+
+sys.path.append(ROOT_DIR)
+
+from annotator import Annotator
+
+
+def get_stock_price(stock_code):
+    time.sleep(random.random() / 100)
+    return int(stock_code) * 10
+
+
+def test_annotate_concurrent_keeps_order():
+    table = pd.DataFrame(
+        {"KRX_CODE": [f"{idx:06}" for idx in range(30)], "CURRENT_ASSET": 1}
+    ).set_index("KRX_CODE")
+
+    annotator = Annotator(Mock(), n_workers=4)
+    annotator.price_source.get_stock_price = Mock(side_effect=get_stock_price)
+    result_table = annotator.annotate(table)
+
+    assert list(result_table["STOCK_PRICE"]) == [idx * 10 for idx in range(30)]
+
+
+def test_crawler_throttles_per_host():
+    annotator = Annotator(Mock(), n_workers=2, max_requests_per_second=5)
+    crawler = annotator.price_source
+    crawler.session = Mock()
+    crawler.session.get.return_value.content = b"<html></html>"
+
+    crawler._get("https://finance.naver.com/item/main.nhn?code=005930")
+    crawler._get("https://finance.naver.com/item/main.nhn?code=000660")
+
+    assert list(crawler.rate_limiters) == ["finance.naver.com"]
+    assert crawler.session.get.call_count == 2
@@ -13,14 +13,49 @@ sys.path.append(ANNOT_DIR)
 from financial_data_crawler import FinancialDataCrawler
 
 
-@pytest.fixture(scope="module")
-def crawler():
-    return FinancialDataCrawler(Mock())
+def load_page(file_name):
+    with open(os.path.join(TEST_DIR, "data", file_name), encoding="UTF-8") as fh:
+        return fh.read()
 
 
-def test_get_bs4_obj(crawler):
-    assert isinstance(crawler.get_bs4_obj("005930"), BeautifulSoup)
-
+def test_get_bs4_obj():
+    crawler = FinancialDataCrawler(Mock())
+    crawler.get_html = Mock(return_value=load_page("naver_005930.html"))
 
-def test_get_stock_price(crawler):
-    assert isinstance(crawler.get_stock_price("005930"), int)
+    assert isinstance(crawler.get_bs4_obj("005930"), BeautifulSoup)
+    crawler.get_html.assert_called_once_with("005930")
+
+
+def test_get_stock_price():
+    crawler = FinancialDataCrawler(Mock())
+    crawler.get_html = Mock(return_value=load_page("naver_005930.html"))
+
+    assert crawler.get_stock_price("005930") == 66500
+
+
+def full_tree_price(crawler, html):
+    bs_obj = BeautifulSoup(html, "html.parser")
+    if crawler._check_redirection(bs_obj):
+        return 0
+    try:
+        return crawler.parse_stock_price(bs_obj)
+    except:
+        return 0
+
+
+@pytest.mark.parametrize(
+    "file_name, expected",
+    [
+        ("naver_005930.html", 66500),
+        ("naver_950130.html", 7000),
+        ("naver_redirect.html", 0),
+        ("naver_suspended.html", 0),
+    ],
+)
+def test_extract_matches_full_tree(file_name, expected):
+    html = load_page(file_name)
+    crawler = FinancialDataCrawler(Mock())
+    crawler.get_html = Mock(return_value=html)
+
+    assert crawler.get_stock_price("000000") == expected
+    assert full_tree_price(crawler, html) == expected
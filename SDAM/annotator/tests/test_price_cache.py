@@ -0,0 +1,88 @@
+import os
+import sys
+import pytest
+import pandas as pd
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+ANNOT_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(ANNOT_DIR)
+
+sys.path.append(ROOT_DIR)
+
+from annotator import Annotator, PriceCache, SnapshotPriceSource
+from annotator._annotator import CachedPriceSource
+from price_cache import KST, trading_session
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    _cache = PriceCache(str(tmp_path / "price_cache.sqlite3"), max_entries=3)
+    yield _cache
+    _cache.close()
+
+
+@pytest.mark.parametrize(
+    "now, expected",
+    [
+        (datetime(2022, 5, 13, 10, 0, tzinfo=KST), ("2022-05-13", True)),
+        (datetime(2022, 5, 13, 16, 0, tzinfo=KST), ("2022-05-13", False)),
+        (datetime(2022, 5, 16, 8, 0, tzinfo=KST), ("2022-05-13", False)),
+        (datetime(2022, 5, 15, 12, 0, tzinfo=KST), ("2022-05-13", False)),
+    ],
+)
+def test_trading_session(now, expected):
+    assert trading_session(now) == expected
+
+
+def test_open_session_expires(cache):
+    cache.put_many({"005930": 66500}, "2022-05-13", is_final=False)
+    assert cache.get_many(["005930"], "2022-05-13") == {"005930": 66500}
+
+    cache.open_ttl = -1
+    assert cache.get_many(["005930"], "2022-05-13") == {}
+
+    cache.put_many({"005930": 66500}, "2022-05-13", is_final=True)
+    assert cache.get_many(["005930"], "2022-05-13") == {"005930": 66500}
+
+
+def test_lru_eviction(cache):
+    cache.put_many({"000001": 1, "000002": 2, "000003": 3}, "2022-05-13", True)
+    cache.get_many(["000001"], "2022-05-13")
+    cache.put_many({"000004": 4}, "2022-05-13", True)
+
+    assert set(cache.get_many(["000001", "000002", "000003", "000004"], "2022-05-13")) == {
+        "000001",
+        "000003",
+        "000004",
+    }
+
+
+def test_annotator_uses_cache(cache):
+    annotator = Annotator(Mock(), price_cache=cache)
+    source = annotator.price_source.source
+    prices = {"005930": 1000, "999999": 0}
+    source.get_stock_prices = Mock(side_effect=lambda codes: [prices[c] for c in codes])
+
+    with patch("price_cache.trading_session", return_value=("2022-05-13", False)):
+        assert annotator.price_source.get_stock_prices(["005930", "999999"]) == [1000, 0]
+        assert annotator.price_source.get_stock_prices(["005930", "999999"]) == [1000, 0]
+
+    assert isinstance(annotator.price_source, CachedPriceSource)
+    assert source.get_stock_prices.call_args_list[1].args == (["999999"],)
+
+
+def test_annotator_does_not_cache_snapshots(cache, tmp_path):
+    path = tmp_path / "krx.csv"
+    path.write_text("종목코드,종가\n005930,\"66,500\"\n", encoding="cp949")
+
+    annotator = Annotator(
+        Mock(), price_source=SnapshotPriceSource(str(path)), price_cache=cache
+    )
+    table = pd.DataFrame(index=pd.Index(["005930"], name="KRX_CODE"))
+    table = annotator.annotate(table)
+
+    assert list(table["STOCK_PRICE"]) == [66500]
+    assert isinstance(annotator.price_source, SnapshotPriceSource)
+    assert cache.get_many(["005930"], trading_session()[0]) == dict()
@@ -0,0 +1,33 @@
+import os
+import sys
+import pandas as pd
+from unittest.mock import Mock
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+ANNOT_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(ANNOT_DIR)
+
+sys.path.append(ROOT_DIR)
+
+from annotator import Annotator, SnapshotPriceSource
+
+
+def test_snapshot_price_source(tmp_path):
+    path = str(tmp_path / "krx.csv")
+    with open(path, "w", encoding="cp949") as fh:
+        fh.write("종목코드,종목명,시장구분,종가\n")
+        fh.write('005930,삼성전자,KOSPI,"66,500"\n')
+        fh.write("950130,엑세스바이오,KOSDAQ,7000\n")
+        fh.write("00104K,CJ4우(전환),KOSPI,-\n")
+
+    source = SnapshotPriceSource(path, Mock())
+    assert source.get_stock_prices(["005930", "950130", "00104K", "000000"]) == [
+        66500,
+        7000,
+        0,
+        0,
+    ]
+
+    table = pd.DataFrame({"KRX_CODE": ["950130", "005930"]}).set_index("KRX_CODE")
+    result_table = Annotator(Mock(), price_source=source).annotate(table)
+    assert list(result_table["STOCK_PRICE"]) == [7000, 66500]
@@ -0,0 +1,98 @@
+"""Micro-benchmark of the price extraction from Naver item pages
+
+Compares building the full BeautifulSoup tree (FinancialDataCrawler.parse_stock_price)
+with the fragment extraction used by get_stock_price, on the saved pages under
+annotator/tests/data padded to the size of a live item page.
+
+    $ python3 SDAM/benchmarks/bench_html_extraction.py -n 200
+"""
+import os
+import sys
+import glob
+import json
+import timeit
+import argparse
+
+from bs4 import BeautifulSoup
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+PAGE_DIR = os.path.join(ROOT_DIR, "annotator", "tests", "data")
+sys.path.append(os.path.join(ROOT_DIR, "annotator"))
+
+from financial_data_crawler import FinancialDataCrawler
+
+# 시세, 투자정보, 뉴스 등 실제 종목 페이지의 나머지 영역을 흉내낸 블록
+FILLER_BLOCK = """
+<div class="section trade_compare">
+    <table class="tb_type1 tb_num" summary="동일업종비교">
+        <tr><th scope="row">현재가</th><td><em>66,500</em></td><td><em>118,000</em></td></tr>
+        <tr><th scope="row">전일대비</th><td><em class="bu_p bu_pdn">200</em></td><td>0</td></tr>
+        <tr><th scope="row">시가총액(억)</th><td>3,969,928</td><td>859,050</td></tr>
+    </table>
+    <ul class="news_section"><li><span class="txt"><a href="#">시황 뉴스 제목</a></span></li></ul>
+</div>
+"""
+
+
+def load_pages(page_size: int) -> dict:
+    pages = dict()
+    for path in sorted(glob.glob(os.path.join(PAGE_DIR, "naver_*.html"))):
+        with open(path, encoding="UTF-8") as fh:
+            html = fh.read()
+
+        n_blocks = max(0, (page_size - len(html)) // len(FILLER_BLOCK))
+        pages[os.path.basename(path)] = html.replace(
+            "</body>", FILLER_BLOCK * n_blocks + "</body>"
+        )
+
+    return pages
+
+
+def full_tree(crawler: FinancialDataCrawler, html: str) -> int:
+    bs_obj = BeautifulSoup(html, "html.parser")
+    if crawler._check_redirection(bs_obj):
+        return 0
+    try:
+        return crawler.parse_stock_price(bs_obj)
+    except:
+        return 0
+
+
+def fragment(crawler: FinancialDataCrawler, html: str) -> int:
+    if crawler._is_redirection(html):
+        return 0
+    try:
+        return crawler.extract_stock_price(html)
+    except:
+        return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--number", type=int, default=100)
+    parser.add_argument("--page-size", type=int, default=200_000)
+    args = parser.parse_args()
+
+    crawler = FinancialDataCrawler()
+    results = list()
+    for name, html in load_pages(args.page_size).items():
+        assert full_tree(crawler, html) == fragment(crawler, html), name
+
+        full_tree_sec = timeit.timeit(lambda: full_tree(crawler, html), number=args.number)
+        fragment_sec = timeit.timeit(lambda: fragment(crawler, html), number=args.number)
+        results.append(
+            {
+                "page": name,
+                "bytes": len(html.encode("UTF-8")),
+                "full_tree_us": full_tree_sec / args.number * 1e6,
+                "fragment_us": fragment_sec / args.number * 1e6,
+                "speedup": full_tree_sec / fragment_sec,
+            }
+        )
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark of Indicator.indicate on large synthetic tables
+
+Times the column-wise Indicator.indicate on a table of --rows rows and the
+former row-wise apply on the first --legacy-rows rows, checking both agree.
+
+    $ python3 SDAM/benchmarks/bench_indicator.py --rows 1000000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.append(ROOT_DIR)
+
+from indicator import Indicator
+
+
+def make_table(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    amounts = lambda: rng.integers(0, 10**14, n_rows, dtype=np.int64)
+    table = pd.DataFrame(
+        {
+            "KRX_CODE": np.char.zfill(np.arange(n_rows).astype(str), 6),
+            "CURRENT_ASSET": amounts(),
+            "CURRENT_LIAB": amounts(),
+            "NON_CURRENT_ASSET": amounts(),
+            "NON_CURRENT_LIAB": amounts(),
+            "ISSUED_STOCK": rng.integers(0, 6 * 10**9, n_rows, dtype=np.int64),
+            "STOCK_PRICE": rng.integers(0, 10**6, n_rows, dtype=np.int64),
+        }
+    )
+    # 거래정지, 발행주식수 미기재 기업
+    table.loc[rng.random(n_rows) < 0.05, "STOCK_PRICE"] = 0
+    table.loc[rng.random(n_rows) < 0.05, "ISSUED_STOCK"] = 0
+    return table.set_index("KRX_CODE")
+
+
+def indicate_by_row(table: pd.DataFrame) -> pd.DataFrame:
+    """Former row-wise Indicator.indicate"""
+
+    table["NCAV"] = table.apply(
+        lambda x: x["CURRENT_ASSET"] - (x["CURRENT_LIAB"] + x["NON_CURRENT_LIAB"]),
+        axis=1,
+    )
+    table["NCAV_SHARE"] = table.apply(
+        lambda x: 0
+        if x["STOCK_PRICE"] == 0 or x["ISSUED_STOCK"] == 0
+        else x["NCAV"] / (x["STOCK_PRICE"] * x["ISSUED_STOCK"]),
+        axis=1,
+    )
+    return table
+
+
+def timed(func, *args) -> tuple:
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--legacy-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    indicator = Indicator()
+    table = make_table(args.rows)
+    legacy_table = table.iloc[: args.legacy_rows].copy()
+
+    result, column_sec = timed(indicator.indicate, table)
+    expected, row_sec = timed(indicate_by_row, legacy_table)
+    pd.testing.assert_frame_equal(result.iloc[: args.legacy_rows], expected)
+
+    print(
+        json.dumps(
+            {
+                "rows": args.rows,
+                "column_wise_sec": column_sec,
+                "column_wise_rows_per_sec": args.rows / column_sec,
+                "legacy_rows": len(legacy_table),
+                "row_wise_sec": row_sec,
+                "row_wise_rows_per_sec": len(legacy_table) / row_sec,
+                "speedup": (args.rows / column_sec) / (len(legacy_table) / row_sec),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
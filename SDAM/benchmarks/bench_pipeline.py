@@ -0,0 +1,409 @@
+"""End-to-end benchmark of create_table, annotate and indicate against a local stand-in
+
+Starts a ThreadingHTTPServer that answers the DART API and Naver finance paths
+used by the collector and the annotator. It replays collector/test/data/
+samsung_2019_1Q.txt and annotator/tests/data/naver_005930.html for --companies
+synthetic companies. Each response is delayed by an exponentially distributed
+latency with mean --latency seconds, and --error-rate of the responses fail with
+HTTP 503. Companies in --ofs-only have no consolidated statements, like small
+caps without subsidiaries.
+
+The synthetic universe replaces DART.set_stock_codes, so corpCode.xml and the
+market table are not requested. Throughput and client-side request latency
+percentiles of each stage are printed as JSON, and written to --output to compare
+runs. Memory is reported as the running max RSS of the process after each stage
+and how much the stage raised it. A stage that stays under the peak of earlier
+stages or runs raises it by 0, so only the growth of the first stage of the first
+run is its own peak. --trace-memory adds the tracemalloc peak of each stage, but
+tracing slows Python code down several times, so only compare runs with the same
+setting.
+
+    $ python3 SDAM/benchmarks/bench_pipeline.py --companies 2500 25000 --batch
+"""
+import os
+import sys
+import json
+import time
+import yaml
+import random
+import logging
+import argparse
+import threading
+import resource
+import tracemalloc
+import multiprocessing
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import numpy as np
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+STATEMENT_PATH = os.path.join(
+    ROOT_DIR, "collector", "test", "data", "samsung_2019_1Q.txt"
+)
+PAGE_PATH = os.path.join(ROOT_DIR, "annotator", "tests", "data", "naver_005930.html")
+sys.path.append(ROOT_DIR)
+
+from collector import DART
+from collector._collector import MULTI_ACCOUNTS
+from annotator import Annotator
+from financial_data_crawler import FinancialDataCrawler
+from indicator import Indicator
+
+ACCOUNT_NAMES = ["유동자산", "유동부채", "비유동자산", "비유동부채"]
+CORP_CODE = "{CORP_CODE}"
+NO_DATA = {"status": "013", "message": "조회된 데이타가 없습니다."}
+
+
+def load_fixtures() -> dict:
+    """Response bodies of the stand-in with CORP_CODE in place of the company"""
+
+    with open(STATEMENT_PATH, encoding="UTF-8") as fh:
+        items = json.loads("[" + fh.read() + "]")
+    for item in items:
+        item["corp_code"] = CORP_CODE
+
+    multi_items = [
+        dict(item, fs_div="CFS")
+        for item in items
+        if item["account_nm"] in MULTI_ACCOUNTS and item["sj_div"] in ("BS", "IS")
+    ]
+    with open(PAGE_PATH, encoding="UTF-8") as fh:
+        page = fh.read().encode("cp949", errors="replace")
+
+    return {
+        "statement": json.dumps(
+            {"status": "000", "message": "정상", "list": items}, ensure_ascii=False
+        ),
+        "multi_item": multi_items,
+        "shares": json.dumps(
+            {
+                "status": "000",
+                "message": "정상",
+                "list": [{"corp_code": CORP_CODE, "istc_totqy": "5,969,782,550"}],
+            },
+            ensure_ascii=False,
+        ),
+        "page": page,
+    }
+
+
+class StandInServer(object):
+    """Local stand-in of opendart.fss.or.kr/api and finance.naver.com
+
+    Parameters
+    ----------
+    latency (float): mean delay of a response in seconds
+    error_rate (float): fraction of responses failing with HTTP 503
+    ofs_only (float): fraction of companies without consolidated statements
+    seed (int): seed of the latency and error draws
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        ofs_only: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.ofs_only = ofs_only
+        self.random = random.Random(seed)
+        self.fixtures = load_fixtures()
+        self.lock = threading.Lock()
+        self.requests = dict()
+        self.errors = 0
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.request_queue_size = 256
+
+    @property
+    def url(self) -> str:
+        return "http://127.0.0.1:{}/".format(self.httpd.server_address[1])
+
+    def is_ofs_only(self, corp_code: str) -> bool:
+        return random.Random(corp_code).random() < self.ofs_only
+
+    def respond(self, path: str, query: dict) -> tuple:
+        """(content type, body) of a request"""
+
+        if path == "/_stats":
+            with self.lock:
+                stats = {"requests": dict(self.requests), "errors": self.errors}
+            return "application/json", json.dumps(stats).encode("UTF-8")
+
+        corp_code = query.get("corp_code", query.get("code", [""]))[0]
+        if path == "/api/fnlttSinglAcntAll.json":
+            if query["fs_div"][0] == "CFS" and self.is_ofs_only(corp_code):
+                body = json.dumps(NO_DATA, ensure_ascii=False)
+            else:
+                body = self.fixtures["statement"].replace(CORP_CODE, corp_code)
+        elif path == "/api/fnlttMultiAcnt.json":
+            items = list()
+            for code in corp_code.split(","):
+                fs_div = "OFS" if self.is_ofs_only(code) else "CFS"
+                items += [
+                    dict(item, corp_code=code, stock_code=code[-6:], fs_div=fs_div)
+                    for item in self.fixtures["multi_item"]
+                ]
+            body = json.dumps(
+                {"status": "000", "message": "정상", "list": items},
+                ensure_ascii=False,
+            )
+        elif path == "/api/stockTotqySttus.json":
+            body = self.fixtures["shares"].replace(CORP_CODE, corp_code)
+        elif path == "/item/main.nhn":
+            return "text/html; charset=euc-kr", self.fixtures["page"]
+        else:
+            return None, None
+
+        return "application/json; charset=utf-8", body.encode("UTF-8")
+
+    def handle(self, handler: BaseHTTPRequestHandler) -> None:
+        url = urlparse(handler.path)
+        if url.path == "/_stats":
+            content_type, body = self.respond(url.path, dict())
+            handler.send_response(200)
+            handler.send_header("Content-Type", content_type)
+            handler.send_header("Content-Length", str(len(body)))
+            handler.end_headers()
+            handler.wfile.write(body)
+            return
+
+        with self.lock:
+            self.requests[url.path] = self.requests.get(url.path, 0) + 1
+            delay = self.random.expovariate(1 / self.latency) if self.latency else 0
+            failed = self.random.random() < self.error_rate
+            self.errors += failed
+
+        time.sleep(delay)
+        content_type, body = self.respond(url.path, parse_qs(url.query))
+        if content_type is None or failed:
+            status = 404 if content_type is None else 503
+            content_type, body = "text/plain", b"unavailable"
+        else:
+            status = 200
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+
+def serve(conn, *settings) -> None:
+    """Run a StandInServer until the process is terminated, sending its url to conn
+
+    The stand-in runs in its own process so that it neither competes with the
+    benchmarked threads for the GIL nor shows up in their tracemalloc peak.
+    """
+
+    server = StandInServer(*settings)
+    conn.send(server.url)
+    server.httpd.serve_forever()
+
+
+def server_stats(url: str) -> dict:
+    return requests.get(url + "_stats").json()
+
+
+def synthetic_stock_codes(n_companies: int) -> dict:
+    return {
+        f"기업{idx:06d}": {"dart_code": f"{idx:08d}", "stock_code": f"{idx:06d}"}
+        for idx in range(1, n_companies + 1)
+    }
+
+
+def record_latency(session, latencies: list) -> None:
+    """Append the seconds each session.get takes to latencies"""
+
+    get = session.get
+
+    def timed_get(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return get(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    session.get = timed_get
+
+
+def measure(func, *args) -> tuple:
+    """(result, seconds, memory in MB) of func(*args)
+
+    ru_maxrss is the peak of the whole process, so it is reported as the running
+    max after func and the growth of that max during func.
+    """
+
+    # ru_maxrss is in KB on linux
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+
+    stage_max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    memory = {
+        "max_rss_mb": stage_max_rss / 2**10,
+        "max_rss_growth_mb": (stage_max_rss - max_rss) / 2**10,
+    }
+    if tracemalloc.is_tracing():
+        memory["traced_peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+    return result, seconds, memory
+
+
+def summarize(n_rows: int, seconds: float, memory: dict, latencies: list) -> dict:
+    summary = {
+        "rows": n_rows,
+        "sec": seconds,
+        "rows_per_sec": n_rows / seconds,
+        **memory,
+    }
+    if latencies:
+        summary["requests"] = len(latencies)
+        summary["requests_per_sec"] = len(latencies) / seconds
+        summary["latency_ms"] = {
+            f"p{q}": float(np.percentile(latencies, q)) * 1e3 for q in (50, 90, 99)
+        }
+        summary["latency_ms"]["max"] = max(latencies) * 1e3
+
+    return summary
+
+
+def make_config(args: argparse.Namespace, url: str) -> dict:
+    with open(os.path.join(ROOT_DIR, "config.yaml")) as fh:
+        config = yaml.safe_load(fh)
+
+    config["DART"]["KEY"] = "bench"
+    config["DART"]["URL"] = url + "api/"
+    config["ENV"]["CACHE_DIR"] = ""
+    config["COLLECTOR"]["MAX_REQUESTS_PER_SECOND"] = args.rate
+    config["COLLECTOR"]["RETRY"]["BACKOFF_BASE"] = args.backoff
+    config["COLLECTOR"]["RETRY"]["BACKOFF_MAX"] = args.backoff * 16
+    return config
+
+
+def run(args: argparse.Namespace, url: str, n_companies: int) -> dict:
+    logger = logging.getLogger("bench_pipeline")
+    config = make_config(args, url)
+
+    dart = DART(config, logger, n_workers=args.workers)
+    stock_codes = synthetic_stock_codes(n_companies)
+    dart.set_stock_codes = lambda market=None: setattr(
+        dart, "stock_codes", stock_codes
+    )
+    dart_latencies = list()
+    record_latency(dart.session, dart_latencies)
+
+    crawler = FinancialDataCrawler(
+        logger,
+        n_workers=args.workers,
+        max_requests_per_second=args.rate or None,
+        base_url=url,
+    )
+    naver_latencies = list()
+    record_latency(crawler.session, naver_latencies)
+    annotator = Annotator(logger, price_source=crawler)
+    indicator = Indicator(logger)
+
+    stats = server_stats(url)
+    table, create_sec, create_memory = measure(
+        dart.create_table, ACCOUNT_NAMES, 2019, 1, args.batch
+    )
+    table, annotate_sec, annotate_memory = measure(annotator.annotate, table)
+    table, indicate_sec, indicate_memory = measure(indicator.indicate, table)
+    served = server_stats(url)
+
+    return {
+        "companies": n_companies,
+        "failed_companies": len(dart.failures),
+        "zero_prices": int((table["STOCK_PRICE"] == 0).sum()),
+        "stages": {
+            "create_table": summarize(
+                len(table), create_sec, create_memory, dart_latencies
+            ),
+            "annotate": summarize(
+                len(table), annotate_sec, annotate_memory, naver_latencies
+            ),
+            "indicate": summarize(
+                len(table), indicate_sec, indicate_memory, list()
+            ),
+        },
+        "server": {
+            "requests": {
+                path: count - stats["requests"].get(path, 0)
+                for path, count in served["requests"].items()
+            },
+            "errors": served["errors"] - stats["errors"],
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--companies", type=int, nargs="+", default=[2500])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--batch", action="store_true")
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument("--ofs-only", type=float, default=0.3)
+    parser.add_argument("--rate", type=float, default=0, help="0 disables the limit")
+    parser.add_argument("--backoff", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-memory", action="store_true")
+    parser.add_argument("--output", type=str, help="also write the results here")
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench_pipeline")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    conn, server_conn = multiprocessing.Pipe()
+    server = multiprocessing.Process(
+        target=serve,
+        args=(server_conn, args.latency, args.error_rate, args.ofs_only, args.seed),
+        daemon=True,
+    )
+    server.start()
+    url = conn.recv()
+
+    if args.trace_memory:
+        tracemalloc.start()
+    try:
+        runs = [run(args, url, n_companies) for n_companies in args.companies]
+    finally:
+        tracemalloc.stop()
+        server.terminate()
+
+    results = {
+        "settings": {
+            key: value for key, value in vars(args).items() if key != "output"
+        },
+        "runs": runs,
+    }
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w", encoding="UTF-8") as fh:
+            json.dump(results, fh, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
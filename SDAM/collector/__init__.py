@@ -1,3 +1,5 @@
 from ._collector import DART
+from ._universe import CorpUniverse
+from ._workqueue import WorkQueue
 
-__all__ = ["DART"]
+__all__ = ["DART", "CorpUniverse", "WorkQueue"]
@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+
+NO_DATA_STATUS = "013"  # 조회된 데이타가 없습니다
+CACHE_KEYS = ("corp_code", "bsns_year", "reprt_code", "fs_div")
+
+
+class ResponseCache(object):
+    """SQLite에 저장되는 DART API 응답 캐시
+
+    공시된 보고서는 바뀌지 않으므로 정상 응답은 만료되지 않으며, 데이터가 없다는
+    응답(status 013)은 negative_ttl 이후 다시 조회합니다. 캐시 크기가 max_size를
+    넘으면 가장 오래 조회되지 않은 응답부터 삭제합니다.
+
+    Parameters
+    ----------
+    path (str): sqlite 파일 경로
+    negative_ttl (int): status 013 응답의 유효시간(초)
+    max_size (int): 저장된 응답의 최대 크기 합(byte)
+
+    Example
+    -------
+        >>> cache = ResponseCache("cache/dart.sqlite3")
+        >>> cache.set("stockTotqySttus.json", params, response)
+        >>> cache.get("stockTotqySttus.json", params)
+        {'status': '000', 'message': '정상', 'list': [...]}
+    """
+
+    def __init__(
+        self,
+        path: str,
+        negative_ttl: int = 24 * 60 * 60,
+        max_size: int = 1024 * 1024 * 1024,
+    ) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    endpoint TEXT NOT NULL,
+                    corp_code TEXT NOT NULL,
+                    bsns_year TEXT NOT NULL,
+                    reprt_code TEXT NOT NULL,
+                    fs_div TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (endpoint, corp_code, bsns_year, reprt_code, fs_div)
+                )
+                """
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at "
+                "ON responses (accessed_at)"
+            )
+
+    @staticmethod
+    def _key(endpoint: str, params: dict) -> tuple:
+        return (endpoint,) + tuple(str(params.get(key, "")) for key in CACHE_KEYS)
+
+    def get(self, endpoint: str, params: dict) -> dict:
+        """캐시된 응답을 반환합니다. 없거나 만료된 경우 None을 반환합니다."""
+
+        key = self._key(endpoint, params)
+        now = time.time()
+        with self.lock:
+            record = self.conn.execute(
+                "SELECT status, body, created_at FROM responses "
+                "WHERE endpoint=? AND corp_code=? AND bsns_year=? "
+                "AND reprt_code=? AND fs_div=?",
+                key,
+            ).fetchone()
+
+            if record is None:
+                return None
+
+            status, body, created_at = record
+            if status == NO_DATA_STATUS and now - created_at > self.negative_ttl:
+                return None
+
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE responses SET accessed_at=? "
+                    "WHERE endpoint=? AND corp_code=? AND bsns_year=? "
+                    "AND reprt_code=? AND fs_div=?",
+                    (now,) + key,
+                )
+
+        return json.loads(zlib.decompress(body).decode("UTF-8"))
+
+    def set(self, endpoint: str, params: dict, response: dict) -> None:
+        """정상(000) 또는 데이터 없음(013) 응답만 저장합니다."""
+
+        status = response.get("status")
+        if status not in ("000", NO_DATA_STATUS):
+            return
+
+        body = zlib.compress(json.dumps(response, ensure_ascii=False).encode("UTF-8"))
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._key(endpoint, params) + (status, body, len(body), now, now),
+            )
+            self._evict()
+
+    def invalidate(
+        self, corp_code: str, bsns_year: str = None, reprt_code: str = None
+    ) -> int:
+        """corp_code의 응답을 지우고 지운 응답의 수를 반환합니다.
+
+        bsns_year와 reprt_code가 주어지면 그 보고서의 응답만 지웁니다. 여러
+        회사를 한 번에 조회한 응답(corp_code가 쉼표로 이어진 경우)도 corp_code가
+        포함되어 있으면 지웁니다.
+        """
+
+        query = "DELETE FROM responses WHERE ',' || corp_code || ',' LIKE ?"
+        params = (f"%,{corp_code},%",)
+        if bsns_year is not None:
+            query += " AND bsns_year=?"
+            params += (str(bsns_year),)
+        if reprt_code is not None:
+            query += " AND reprt_code=?"
+            params += (str(reprt_code),)
+
+        with self.lock, self.conn:
+            return self.conn.execute(query, params).rowcount
+
+    def _evict(self) -> None:
+        """max_size를 넘으면 오래 조회되지 않은 응답부터 max_size의 90%까지 삭제"""
+
+        (total_size,) = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total_size <= self.max_size:
+            return
+
+        excess = total_size - int(self.max_size * 0.9)
+        rows = self.conn.execute(
+            "SELECT rowid, size FROM responses ORDER BY accessed_at"
+        )
+        evicted = list()
+        for rowid, size in rows:
+            if excess <= 0:
+                break
+            evicted.append((rowid,))
+            excess -= size
+
+        self.conn.executemany("DELETE FROM responses WHERE rowid=?", evicted)
+
+    def close(self) -> None:
+        self.conn.close()
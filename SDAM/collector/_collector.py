@@ -1,19 +1,91 @@
 import os
+import re
 import sys
+import json
 import time
-import xmltodict
+import hashlib
 import pandas as pd
+from datetime import date, datetime, timedelta
 
 import requests
-from io import BytesIO
 from logging import Logger
-from zipfile import ZipFile
-from urllib.request import urlopen
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from requests.adapters import HTTPAdapter
 
 COLLECTOR_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.dirname(COLLECTOR_DIR)
 sys.path.append(ROOT_DIR)
 
+from throttle import RateLimiter
+from error_handler import DartAPIError, CollectionAborted
+from ._cache import ResponseCache
+from ._corpcode import CorpCodeLoader
+from ._universe import CorpUniverse
+from ._journal import CheckpointJournal
+from ._statement import FinancialStatement
+from ._extraction import ExtractionPlan, read_account_specs
+from ._scheduler import KST, RequestScheduler
+from ._keys import KeyPool
+from ._workqueue import WorkQueue
+from ._shares import ShareCountStore
+from ._fsdiv import FS_DIVS, StatementTypeResolver
+
+# 공시검색(list.json)에서 재무제표가 바뀌었을 수 있는 정기공시의 보고서명
+PERIODIC_REPORTS = ("사업보고서", "반기보고서", "분기보고서")
+
+# 공시검색(list.json)에서 발행주식수가 바뀌었을 수 있는 공시의 보고서명
+SHARE_CHANGE_REPORTS = (
+    "유상증자결정",
+    "무상증자결정",
+    "유무상증자결정",
+    "감자결정",
+    "주식분할결정",
+    "주식병합결정",
+    "주식소각결정",
+    "추가상장",
+    "변경상장",
+)
+
+# 정기공시 보고서명의 보고서 기준일, 예) 분기보고서 (2022.03)
+REPORT_PERIOD = re.compile(r"\((\d{4})\.(\d{2})\)")
+
+# 회사를 지정하지 않은 공시검색(list.json)의 최대 검색기간
+MAX_DISCLOSURE_DAYS = 90
+
+# 다중회사 주요계정(fnlttMultiAcnt.json)에서 제공하는 계정명
+MULTI_ACCOUNTS = frozenset(
+    [
+        "유동자산",
+        "비유동자산",
+        "자산총계",
+        "유동부채",
+        "비유동부채",
+        "부채총계",
+        "자본금",
+        "이익잉여금",
+        "자본총계",
+        "매출액",
+        "영업이익",
+        "법인세차감전 순이익",
+        "당기순이익",
+    ]
+)
+
+
+def iter_periods(start: tuple, end: tuple):
+    """start부터 end까지(포함)의 (year, quarter)를 순서대로 반환합니다.
+
+    Example:
+        >>> list(iter_periods((2021, 4), (2022, 2)))
+        [(2021, 4), (2022, 1), (2022, 2)]
+    """
+
+    year, quarter = start
+    while (year, quarter) <= tuple(end):
+        yield year, quarter
+        year, quarter = (year, quarter + 1) if quarter < 4 else (year + 1, 1)
+
 
 class DART(object):
     """
@@ -23,9 +95,22 @@ class DART(object):
     Parameters
     ----------
     cert_key: cert key (https://opendart.fss.or.kr/intro/main.do)
+        config["DART"]["KEY"]가 인증키의 목록이면 요청을 인증키들에
+        나누고(KeyPool), 요청 한도가 초과된 인증키는 다음 인증키로 대체함
     corp_code : unique key in Open Dart (is not differ in stock code) **
     is_consolidation: 연결 또는 별도 재무재표 여부
-        (default: True (연결))
+        (default: True (연결)). 선호하는 종류가 없는 기업은 다른 종류를 조회하고
+        기업별로 기억함(StatementTypeResolver)
+    n_workers: 동시에 요청을 보내는 worker의 수
+        (default: config["COLLECTOR"]["N_WORKERS"])
+    max_requests_per_second: 초당 DART API 요청 수 상한
+        (default: config["COLLECTOR"]["MAX_REQUESTS_PER_SECOND"])
+
+    Attributes
+    ----------
+    failures: 마지막 create_table, iter_table, create_panel에서 요청에 실패한
+        기업. {(dart_code, year, quarter): 에러 메시지}. 실패한 기업은 테이블에서
+        빠지며, 같은 인자로 다시 실행하면 journal에 없는 이 기업들만 요청합니다.
 
     Example
     -------
@@ -38,57 +123,133 @@ class DART(object):
         config: dict,
         logger=Logger(__name__),
         is_consolidation=True,
+        n_workers: int = None,
+        max_requests_per_second: float = None,
     ):
 
         self.config = config
         self.mapper = config["DART"]["MAPPER"]
+        self.api_url = config["DART"]["URL"]
         self.logger = logger
-        self.cert_key = config["DART"]["KEY"]
+        keys = config["DART"]["KEY"]
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        self.cert_key = keys[0]
         self.cope_code_map = dict()
         self.stock_codes = dict()
         self.is_consolidation = is_consolidation
+        self.n_workers = n_workers or config["COLLECTOR"]["N_WORKERS"]
+        self.rate_limiter = RateLimiter(
+            max_requests_per_second or config["COLLECTOR"]["MAX_REQUESTS_PER_SECOND"]
+        )
+        self.key_pool = KeyPool(
+            keys,
+            path=(
+                os.path.join(config["ENV"]["CACHE_DIR"], "key_usage.json")
+                if config["ENV"]["CACHE_DIR"]
+                else None
+            ),
+            daily_quota=config["DART"]["DAILY_QUOTA"],
+            logger=logger,
+        )
+        retry_config = config["COLLECTOR"]["RETRY"]
+        self.scheduler = RequestScheduler(
+            self.rate_limiter,
+            logger=logger,
+            max_retries=retry_config["MAX_RETRIES"],
+            backoff_base=retry_config["BACKOFF_BASE"],
+            backoff_max=retry_config["BACKOFF_MAX"],
+            wait_on_quota=retry_config["WAIT_ON_QUOTA"],
+            key_pool=self.key_pool,
+        )
+        self.failures = dict()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.n_workers, pool_maxsize=self.n_workers
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.cache = None
+        if config["ENV"]["CACHE_DIR"]:
+            cache_config = config["COLLECTOR"]["CACHE"]
+            self.cache = ResponseCache(
+                os.path.join(config["ENV"]["CACHE_DIR"], cache_config["FILE"]),
+                negative_ttl=cache_config["NEGATIVE_TTL"],
+                max_size=cache_config["MAX_SIZE_MB"] * 1024 * 1024,
+            )
+
+        fs_div_config = config["COLLECTOR"]["FS_DIV"]
+        self.fs_divs = StatementTypeResolver(
+            path=(
+                os.path.join(config["ENV"]["CACHE_DIR"], fs_div_config["FILE"])
+                if config["ENV"]["CACHE_DIR"]
+                else None
+            ),
+            preferred="CFS" if is_consolidation else "OFS",
+            max_age=fs_div_config["MAX_AGE"],
+        )
+
+        self.share_counts = None
+        if config["ENV"]["CACHE_DIR"]:
+            shares_config = config["COLLECTOR"]["SHARES"]
+            self.share_counts = ShareCountStore(
+                os.path.join(config["ENV"]["CACHE_DIR"], shares_config["FILE"]),
+                carry_quarters=shares_config["CARRY_QUARTERS"],
+                fill_quarters=shares_config["FILL_QUARTERS"],
+                max_age=shares_config["MAX_AGE"],
+            )
 
     def set_translation_dict(self) -> None:
-        self.translation_dict = dict()
+        """mapping 파일(kr2eng.txt)에서 계정명칭별 열 이름과 AccountSpec을 읽습니다."""
 
         mapping_file_path = os.path.join(
             COLLECTOR_DIR, self.config["COLLECTOR"]["FILE"]["KR2ENG"]
         )
-        with open(
-            mapping_file_path,
-            "r",
-            encoding="UTF-8",
-        ) as fh:
-            for line in fh:
-                kr, en = line.strip().split(":")
-                self.translation_dict[kr] = en
+        self.account_specs = read_account_specs(mapping_file_path)
+        self.translation_dict = {
+            kr: spec.column for kr, spec in self.account_specs.items()
+        }
+        self._extraction_plans = dict()
 
         return
 
+    def get_extraction_plan(self, account_names: list) -> ExtractionPlan:
+        """account_names를 뽑아내는 ExtractionPlan을 반환합니다.
+
+        같은 account_names의 plan은 set_translation_dict 이후 한 번만 만들어집니다.
+        """
+
+        key = tuple(account_names)
+        if key not in self._extraction_plans:
+            self._extraction_plans[key] = ExtractionPlan(
+                account_names, self.account_specs
+            )
+
+        return self._extraction_plans[key]
+
     def _get_corpcode(self) -> list:
-        """Get XML file from DART API and parse it
+        """DART 고유번호 목록 중 종목코드가 있는 항목을 반환합니다.
 
         Return
         ------
 
         list: including
-            OrderedDict(['corp_code', '0043728'],
-                        ['corp_name', '다코])
+            {'corp_code': '00126380', 'corp_name': '삼성전자',
+             'stock_code': '005930', 'modify_date': '20220509'}
         """
 
-        request_url = (
-            "https://opendart.fss.or.kr/api/corpCode.xml?"
-            + "crtfc_key="
-            + self.cert_key
+        corpcode_config = self.config["COLLECTOR"]["CORPCODE"]
+        loader = CorpCodeLoader(
+            self.cert_key,
+            url=self.api_url + "corpCode.xml",
+            cache_dir=self.config["ENV"]["CACHE_DIR"],
+            max_age=corpcode_config["MAX_AGE"],
+            session=self.session,
+            logger=self.logger,
+            scheduler=self.scheduler,
         )
-        xml_zip = urlopen(request_url).read()
-        zip_file = ZipFile(BytesIO(xml_zip))
-        file = zip_file.namelist()[0]
-
-        with zip_file.open(file) as corpcode_xml:
-            corp_xml = xmltodict.parse(corpcode_xml.read())
-
-        return corp_xml["result"]["list"]
+        return loader.load()
 
     def set_stock_codes(self, market: list = ["KOSPI", "KOSDAQ"]) -> None:
         """상장된 기업의 기업명, 종목코드를 인스턴스 변수에 저장합니다.
@@ -105,44 +266,108 @@ class DART(object):
 
         self.logger.info("In process: load codes of listing companies")
 
-        stokc_list_path = os.path.join(COLLECTOR_DIR, self.config["DATA"]["MARKET"])
-        data = pd.read_csv(stokc_list_path, encoding="cp949")
+        self.universe = self.get_universe()
+        self.stock_codes = self.universe.filter(market).to_stock_codes()
+
+        self.logger.info(f"Process completed: {len(self.stock_codes)} collected.")
+        return
+
+    def get_universe(self) -> CorpUniverse:
+        """KRX 종목 목록과 DART 고유번호 목록을 합친 CorpUniverse를 반환합니다.
+
+        ENV.CACHE_DIR이 설정되어 있으면 만들어진 index를 저장하고, 종목 목록보다
+        새롭고 COLLECTOR.CORPCODE.MAX_AGE가 지나지 않은 경우 다시 불러옵니다.
+        """
+
+        stock_list_path = os.path.join(COLLECTOR_DIR, self.config["DATA"]["MARKET"])
+        cache_dir = self.config["ENV"]["CACHE_DIR"]
+        universe_path = None
+        if cache_dir:
+            universe_path = os.path.join(cache_dir, "corp_universe.json")
 
-        data = data.loc[data["시장구분"].isin(market)]
-        data["단축코드"] = data["단축코드"].apply(
-            lambda x: "{:06}".format((int(x)))
-            if sum([char.isalpha() for char in x]) == 0
-            else str(x)
+        if universe_path and os.path.exists(universe_path):
+            saved_at = os.path.getmtime(universe_path)
+            max_age = self.config["COLLECTOR"]["CORPCODE"]["MAX_AGE"]
+            if (
+                saved_at > os.path.getmtime(stock_list_path)
+                and time.time() - saved_at < max_age
+            ):
+                return CorpUniverse.load(universe_path)
+
+        universe = CorpUniverse.build(
+            CorpUniverse.read_market_table(stock_list_path), self._get_corpcode()
         )
+        if universe_path:
+            universe.save(universe_path)
 
-        for corp_info in self._get_corpcode():
-            if not corp_info["stock_code"]:
-                continue
+        return universe
 
-            if corp_info["stock_code"] in list(data["단축코드"]):
-                self.stock_codes[corp_info["corp_name"]] = {
-                    "dart_code": corp_info["corp_code"],
-                    "stock_code": corp_info["stock_code"],
-                }
+    def _get_json(self, url: str, params: dict, cache: bool = True) -> dict:
+        """DART API 응답을 dict로 반환합니다. 캐시된 응답이 있으면 요청하지 않습니다.
 
-        self.logger.info(f"Process completed: {len(self.stock_codes)} collected.")
-        return
+        요청은 scheduler를 거치며, status가 000 또는 013이 아닌 응답은
+        DartAPIError로 발생합니다. cache가 False이면 캐시를 사용하지 않습니다.
+        """
+
+        def send(key):
+            response = self.session.get(url, params=dict(params, crtfc_key=key))
+            self.logger.debug("End of processing: request URL:" + response.url)
+            response.raise_for_status()
+            return response.json()
+
+        if not cache:
+            return self.scheduler.run(send)
+
+        endpoint = url.rstrip("?").rsplit("/", 1)[-1]
+        if self.cache is not None:
+            cached = self.cache.get(endpoint, params)
+            if cached is not None:
+                self.logger.debug(f"Cache hit: {endpoint} {params['corp_code']}")
+                return cached
+
+        result = self.scheduler.run(send)
+
+        if self.cache is not None:
+            self.cache.set(endpoint, params, result)
+
+        return result
 
     def get_finance_sheet(
-        self, dart_code: str, year: int, quarter: int, doctype: str = "CFS"
-    ) -> list:
-        """단일회사의 전체 재무제표를 조회하여 반환함.
+        self,
+        dart_code: str,
+        year: int,
+        quarter: int,
+        doctype: str = "CFS",
+        fs_div: str = None,
+    ) -> FinancialStatement:
+        """단일회사의 전체 재무제표를 조회하여 FinancialStatement로 반환함.
+
+        응답의 계정 목록은 받는 즉시 FinancialStatement로 압축되며, 조회된
+        데이타가 없는 경우(status 013) 빈 FinancialStatement를 반환합니다.
+        요청에 실패하면 DartAPIError가 발생합니다.
+
+        fs_div가 주어지지 않으면 fs_divs가 기억한 종류(기본값: is_consolidation에
+        따라 CFS 또는 OFS)를 먼저 요청하고, 조회된 데이타가 없으면 다른 종류를
+        요청합니다. 다른 종류에서 찾은 경우 다음 요청부터 그 종류를 먼저
+        요청하도록 기억합니다.
 
         Args:
             dart_code (str): 회계 대상의 DART_CODE
             year (int): 회계년도.
             quarter (int): 회계년도의 분기
             doctype (str): 문서타입
-                - 'CFS':  연결재무재표 (Consolidated Finantial Statement)
+                - 'CFS':  전체 재무제표 (fnlttSinglAcntAll.json)
                 - 'IS' 손익계산서 (Income statetment)
+            fs_div (str): 재무제표의 종류 (doctype이 'CFS'인 경우)
+                - 'CFS': 연결재무제표 (Consolidated Finantial Statement)
+                - 'OFS': 재무제표 (Separate Finantial Statement)
 
         Example:
-        >>> self.get_finance_sheet("00261285", 2022, 1)
+        >>> fs = self.get_finance_sheet("00261285", 2022, 1)
+        >>> fs.amount("유동자산")
+        16255251734327
+
+        응답의 계정 항목 (FinancialStatement.parse에 전달됨)
         [
             {
                 'rcept_no': '20220516002597',
@@ -174,53 +399,141 @@ class DART(object):
 
         # URL Type
         if doctype == "CFS":
-            url = "https://opendart.fss.or.kr/api/fnlttSinglAcntAll.json?"
+            url = self.api_url + "fnlttSinglAcntAll.json"
         elif doctype == "IS":
-            url = "https://opendart.fss.or.kr/api/fnlttSinglAcnt.json?"
+            url = self.api_url + "fnlttSinglAcnt.json"
+            fs_div = doctype
         else:
             raise ValueError(f"doctype not expected, given {doctype}")
 
+        if fs_div is not None:
+            return self._request_finance_sheet(url, dart_code, year, quarter, fs_div)
+
+        fs_divs = self.fs_divs.order(dart_code)
+        for fs_div in fs_divs:
+            fs = self._request_finance_sheet(url, dart_code, year, quarter, fs_div)
+            if len(fs):
+                if fs_div != fs_divs[0]:
+                    self.fs_divs.learn(dart_code, fs_div)
+                return fs
+
+        return fs
+
+    def _request_finance_sheet(
+        self, url: str, dart_code: str, year: int, quarter: int, fs_div: str
+    ) -> FinancialStatement:
         # Requested parameters
+        stock_info = self._get_json(
+            url,
+            params={
+                "crtfc_key": self.cert_key,
+                "corp_code": dart_code,
+                "bsns_year": year,
+                "reprt_code": self.mapper[quarter],
+                "fs_div": fs_div,
+            },
+        )
+
+        if stock_info["message"] != "정상":
+            self.logger.debug(stock_info["message"])
+            return FinancialStatement.parse(list())
+
+        return FinancialStatement.parse(stock_info["list"])
+
+    def get_multi_finance_sheets(
+        self, corp_code_infos: list, year: int, quarter: int
+    ) -> dict:
+        """여러 회사의 주요계정(MULTI_ACCOUNTS)을 한 번에 조회하여 회사별로 나누어 반환함.
+
+        회사마다 fs_divs가 기억한 종류(기본값: 연결재무제표(CFS))의 항목만 남겨
+        FinancialStatement로 압축하며, 그 종류의 항목이 없는 회사는 다른 종류의
+        항목을 사용하고 기억합니다.
+        요청에 실패한 경우(CollectionAborted 제외) 빈 dict를 반환하므로 호출한
+        쪽에서 단일회사 조회로 대체할 수 있습니다.
+
+        Args:
+            corp_code_infos (list): {'dart_code', 'stock_code'}의 목록
+                (최대 COLLECTOR.MULTI_BATCH_SIZE개)
+            year (int): 회계년도.
+            quarter (int): 회계년도의 분기
+
+        Example:
+        >>> self.get_multi_finance_sheets(
+        ...     [{"dart_code": "00126380", "stock_code": "005930"}], 2022, 1
+        ... )
+        {'00126380': <FinancialStatement>}
+
+        See Also:
+            https://opendart.fss.or.kr/guide/detail.do?apiGrpCd=DS003&apiId=2019017
+        """
+
+        dart_codes = [info["dart_code"] for info in corp_code_infos]
+        stock_to_dart = {info["stock_code"]: info["dart_code"] for info in corp_code_infos}
+
         try:
-            stock_info = requests.get(
-                url,
+            stock_info = self._get_json(
+                self.api_url + "fnlttMultiAcnt.json",
                 params={
                     "crtfc_key": self.cert_key,
-                    "corp_code": dart_code,
+                    "corp_code": ",".join(dart_codes),
                     "bsns_year": year,
                     "reprt_code": self.mapper[quarter],
-                    "fs_div": doctype,
                 },
-            ).json()
-
-        except:
-            self.logger.debug("request fail")
-            time.sleep(3)
-            return list()
+            )
+        except CollectionAborted:
+            raise
+        except DartAPIError as error:
+            self.logger.debug(f"request fail: fnlttMultiAcnt.json {error}")
+            return dict()
 
-        if stock_info["message"] != "정상":
+        if stock_info["message"] != "정상" and stock_info.get("status") != "013":
             self.logger.debug(stock_info["message"])
-            return list()
+            return dict()
+
+        account_items = {
+            dart_code: {fs_div: list() for fs_div in FS_DIVS}
+            for dart_code in dart_codes
+        }
+        for account_item in stock_info.get("list", list()):
+            dart_code = account_item.get("corp_code") or stock_to_dart.get(
+                account_item.get("stock_code")
+            )
+            fs_div = account_item.get("fs_div", "CFS")
+            if dart_code in account_items and fs_div in FS_DIVS:
+                account_items[dart_code][fs_div].append(account_item)
+
+        sheets = dict()
+        for dart_code, items in account_items.items():
+            fs_divs = self.fs_divs.order(dart_code)
+            fs_div = next((fs_div for fs_div in fs_divs if items[fs_div]), fs_divs[0])
+            if fs_div != fs_divs[0]:
+                self.fs_divs.learn(dart_code, fs_div)
+            sheets[dart_code] = FinancialStatement.parse(items[fs_div])
 
-        return stock_info["list"]
+        return sheets
 
-    def get_assets(self, fs: list, asset_names: set) -> dict:
+    def get_assets(self, fs: FinancialStatement, asset_names: set) -> dict:
         """
         계정명칭(예, 유동자산, 유동부채 등)에 해당하는 당기 금액을 반환합니다.
 
         Args:
-            fs (list): finantial sheet. nested list
+            fs (FinancialStatement): finantial sheet. 응답의 계정 목록(list)을
+                받으면 FinancialStatement로 압축하여 사용
             asset_names (set): 계정명칭들
 
         Return:
-            int: 계정명칭의 보고서내 당기금액.
-                (못 찾은 경우는 -을 반환)
+            dict: 계정명칭별 보고서내 당기금액.
+                (못 찾은 계정명칭은 포함하지 않음)
         """
 
+        if not isinstance(fs, FinancialStatement):
+            fs = FinancialStatement.parse(fs)
+
         assets = dict()
-        for account_item in fs:
-            if account_item["account_nm"] in asset_names:
-                assets[account_item["account_nm"]] = int(account_item["thstrm_amount"])
+        for asset_name in asset_names:
+            amount = fs.amount(asset_name, default=None)
+            if amount is not None:
+                assets[asset_name] = amount
 
         return assets
 
@@ -250,28 +563,48 @@ class DART(object):
                 distb_stock_co	유통주식수	Ⅵ. 유통주식수 (Ⅳ-Ⅴ), 9,999,999,999
 
             일부 회사들에서는 분기보고서에서는 발행된 주식의 수를 작성하지 않음(예, 코스맥스)
+            요청에 실패하면 DartAPIError가 발생함
+
+            ENV.CACHE_DIR이 설정되어 있으면 조회한 값을 share_counts
+            (ShareCountStore)에 저장하여, COLLECTOR.SHARES.CARRY_QUARTERS 분기
+            이내의 다음 분기에는 요청하지 않고 이어 쓰며, 작성되지 않아 0인 경우
+            COLLECTOR.SHARES.FILL_QUARTERS 분기 이내에 조회한 값으로 대신함
         Args:
             corp_code (str): 공시대상회사의 고유번호 8자리 (공시정보->고유번호)
 
         """
 
-        try:
-            response = requests.get(
-                "https://opendart.fss.or.kr/api/stockTotqySttus.json",
-                params={
-                    "crtfc_key": self.cert_key,
-                    "corp_code": corp_code,
-                    "bsns_year": year,
-                    "reprt_code": self.mapper[quarter],
-                },
+        if self.share_counts is None:
+            return self._request_issued_stocks(corp_code, year, quarter)
+
+        n_stock_issue = self.share_counts.get(corp_code, year, quarter)
+        if n_stock_issue is None:
+            n_stock_issue = self.share_counts.set(
+                corp_code,
+                year,
+                quarter,
+                self._request_issued_stocks(corp_code, year, quarter),
             )
-            self.logger.debug("End of processing: request URL:" + response.url)
-        except:
-            self.logger.debug("Failed process: request URL:" + response.url)
-            time.sleep(3)
-            return 0
 
-        stock_info = response.json()
+        return n_stock_issue
+
+    def _request_issued_stocks(self, corp_code: str, year: int, quarter: int) -> int:
+        """stockTotqySttus.json에서 발행주식의 총수를 조회합니다.
+
+        share_counts가 있으면 응답 캐시 대신 share_counts가 조회 여부를 정하므로
+        응답 캐시를 사용하지 않습니다.
+        """
+
+        stock_info = self._get_json(
+            self.api_url + "stockTotqySttus.json",
+            params={
+                "crtfc_key": self.cert_key,
+                "corp_code": corp_code,
+                "bsns_year": year,
+                "reprt_code": self.mapper[quarter],
+            },
+            cache=self.share_counts is None,
+        )
 
         if stock_info["message"] != "정상":
             self.logger.debug(
@@ -285,8 +618,112 @@ class DART(object):
 
         return int(n_stock_issue) if n_stock_issue != "-" else 0
 
+    def get_disclosures(self, start: date, end: date, pblntf_ty: str) -> list:
+        """start부터 end까지(포함) 접수된 공시유형 pblntf_ty의 공시 목록을 반환함.
+
+        회사를 지정하지 않고 조회하므로 검색기간은 MAX_DISCLOSURE_DAYS일을
+        넘을 수 없습니다.
+
+        Args:
+            start (date): 검색시작 접수일자
+            end (date): 검색종료 접수일자
+            pblntf_ty (str): 공시유형
+                - 'A': 정기공시
+                - 'B': 주요사항보고
+                - 'I': 거래소공시
+
+        Example:
+        >>> self.get_disclosures(date(2022, 5, 16), date(2022, 5, 16), "A")
+        [
+            {
+                'corp_code': '00126380',
+                'corp_name': '삼성전자',
+                'stock_code': '005930',
+                'corp_cls': 'Y',
+                'report_nm': '분기보고서 (2022.03)',
+                'rcept_no': '20220516001751',
+                'flr_nm': '삼성전자',
+                'rcept_dt': '20220516',
+                'rm': ''
+            },
+            ...
+        ]
+
+        See Also:
+            https://opendart.fss.or.kr/guide/detail.do?apiGrpCd=DS001&apiId=2019001
+        """
+
+        if (end - start).days >= MAX_DISCLOSURE_DAYS:
+            raise ValueError(
+                f"list.json searches at most {MAX_DISCLOSURE_DAYS} days, "
+                f"given {start} ~ {end}"
+            )
+
+        disclosures = list()
+        page_no = 1
+        while True:
+            disclosure_info = self._get_json(
+                self.api_url + "list.json",
+                params={
+                    "crtfc_key": self.cert_key,
+                    "bgn_de": start.strftime("%Y%m%d"),
+                    "end_de": end.strftime("%Y%m%d"),
+                    "pblntf_ty": pblntf_ty,
+                    "page_no": page_no,
+                    "page_count": 100,
+                },
+                cache=False,
+            )
+            disclosures += disclosure_info.get("list", list())
+            if page_no >= int(disclosure_info.get("total_page", 1)):
+                return disclosures
+
+            page_no += 1
+
+    def find_updated_companies(
+        self, start: date, end: date, year: int = None, quarter: int = None
+    ) -> dict:
+        """start부터 end까지(포함) 정기보고서나 발행주식수가 바뀌는 공시를 접수한
+        상장기업을 {dart_code: 보고서명 목록}으로 반환함.
+
+        year와 quarter가 주어지면 보고서 기준일(예, (2022.03))이 그 분기의
+        마지막 달인 정기보고서만 포함함. 12월 결산법인을 기준으로 함.
+
+        Example:
+            >>> self.find_updated_companies(date(2022, 5, 16), date(2022, 5, 16))
+            {'00126380': ['분기보고서 (2022.03)'], ...}
+        """
+
+        listed = {
+            corp_code_info["dart_code"] for corp_code_info in self.stock_codes.values()
+        }
+        period = None
+        if year is not None and quarter is not None:
+            period = (int(year), int(quarter) * 3)
+
+        updated = dict()
+        for pblntf_ty, report_names in (
+            ("A", PERIODIC_REPORTS),
+            ("B", SHARE_CHANGE_REPORTS),
+            ("I", SHARE_CHANGE_REPORTS),
+        ):
+            for disclosure in self.get_disclosures(start, end, pblntf_ty):
+                report_nm = disclosure["report_nm"]
+                if pblntf_ty == "A" and period is not None:
+                    matched = REPORT_PERIOD.search(report_nm)
+                    if matched is None or tuple(map(int, matched.groups())) != period:
+                        continue
+                if disclosure["corp_code"] in listed and any(
+                    report_name in report_nm for report_name in report_names
+                ):
+                    updated.setdefault(disclosure["corp_code"], list()).append(
+                        report_nm.strip()
+                    )
+
+        return updated
+
     def create_table(
-        self, account_names: list, year: int, quarter: int
+        self, account_names: list, year: int, quarter: int, batch: bool = False
     ) -> pd.DataFrame:
         """Create data table with columns including passed account_names
 
@@ -294,6 +731,9 @@ class DART(object):
             account_names (list): names of account name
             year (int): fisical year
             quater (int): fisical quater
+            batch (bool): whether to request major accounts of up to
+                COLLECTOR.MULTI_BATCH_SIZE companies at once (fnlttMultiAcnt.json).
+                Accounts not in MULTI_ACCOUNTS are still requested per company.
 
         Return:
             stock_tables (pd.DataFrame): dataframe with index dart_code and
@@ -316,26 +756,583 @@ class DART(object):
         """
         self.set_stock_codes()
         self.set_translation_dict()
+        self.failures = dict()
 
-        hashed_account_names = set(account_names)
-        rows = list()
+        journal = self._open_journal(account_names, year, quarter)
+        try:
+            rows = self._collect_rows(
+                list(self.stock_codes.items()),
+                account_names,
+                year,
+                quarter,
+                batch,
+                journal,
+            )
+            self._close_journal(journal, year, quarter)
+        finally:
+            if journal is not None:
+                journal.close()
 
-        for corp_name, corp_code_info in self.stock_codes.items():
+        self.key_pool.save()
+        self.fs_divs.save()
+        self.logger.info("End process: create_table.")
+        return self._to_frame(rows, account_names).set_index("KRX_CODE")
 
-            dart_code = corp_code_info["dart_code"]
-            krx_code = corp_code_info["stock_code"]
+    def iter_table(
+        self,
+        account_names: list,
+        year: int,
+        quarter: int,
+        batch: bool = False,
+        chunk_size: int = 100,
+    ):
+        """Yield tables of create_table in chunks of chunk_size rows
 
-            fs = self.get_finance_sheet(dart_code, year, quarter)
-            asset_info = self.get_assets(fs, hashed_account_names)
+        Rows are yielded in the order their requests complete rather than in
+        universe order, so downstream stages can start on the first companies
+        while the rest are still being collected.
+
+        Example:
+            >>> for chunk in DART_API.iter_table(account_names, 2022, 1):
+            ...     annotator.annotate(chunk)
+        """
+        self.set_stock_codes()
+        self.set_translation_dict()
+        self.failures = dict()
+
+        journal = self._open_journal(account_names, year, quarter)
+        try:
+            rows = list()
+            for _, row in self._iter_rows(
+                list(self.stock_codes.items()),
+                account_names,
+                year,
+                quarter,
+                batch,
+                journal,
+            ):
+                rows.append(row)
+                if len(rows) == chunk_size:
+                    yield self._to_frame(rows, account_names).set_index("KRX_CODE")
+                    rows = list()
+
+            if rows:
+                yield self._to_frame(rows, account_names).set_index("KRX_CODE")
+
+            self._close_journal(journal, year, quarter)
+        finally:
+            if journal is not None:
+                journal.close()
+
+        self.key_pool.save()
+        self.fs_divs.save()
+        self.logger.info("End process: iter_table.")
+
+    def create_panel(
+        self,
+        account_names: list,
+        start: tuple,
+        end: tuple,
+        panel: pd.DataFrame = None,
+        batch: bool = False,
+    ) -> pd.DataFrame:
+        """Create long format panel of create_table over periods from start to end
+
+        Only the (KRX_CODE, YEAR, QUARTER) cells missing in the passed panel are
+        requested, so extending a panel by a quarter costs a quarter of requests.
+        If the passed panel lacks one of the account columns, every cell is
+        requested again.
+
+        Args:
+            account_names (list): names of account name
+            start (tuple): first (year, quarter) of the panel
+            end (tuple): last (year, quarter) of the panel, inclusive
+            panel (pd.DataFrame): panel returned by a previous create_panel call
+            batch (bool): see create_table
+
+        Return:
+            panel (pd.DataFrame): dataframe with index (KRX_CODE, YEAR, QUARTER)
+                and columns of create_table
+
+        Example:
+            >>> panel = DART_API.create_panel(account_names, (2021, 1), (2022, 1))
+            >>> panel = DART_API.create_panel(
+            ...     account_names, (2021, 1), (2022, 2), panel=panel
+            ... )  # requests 2022 Q2 only
+        """
+        self.set_stock_codes()
+        self.set_translation_dict()
+        self.failures = dict()
+
+        columns = [self.translation_dict[asset_name] for asset_name in account_names]
+        existing = set()
+        if panel is not None and set(columns).issubset(panel.columns):
+            existing = set(panel.index)
+
+        frames = list() if panel is None else [panel]
+        journals = list()
+        try:
+            for year, quarter in iter_periods(start, end):
+                companies = [
+                    (corp_name, corp_code_info)
+                    for corp_name, corp_code_info in self.stock_codes.items()
+                    if (corp_code_info["stock_code"], year, quarter) not in existing
+                ]
+                if not companies:
+                    continue
+
+                self.logger.info(
+                    f"In process: {len(companies)} companies of {year} Q{quarter}"
+                )
+                journal = self._open_journal(account_names, year, quarter)
+                journals.append((journal, year, quarter))
+                rows = self._collect_rows(
+                    companies, account_names, year, quarter, batch, journal
+                )
+                frame = self._to_frame(rows, account_names)
+                frame["YEAR"] = year
+                frame["QUARTER"] = quarter
+                frames.append(frame.set_index(["KRX_CODE", "YEAR", "QUARTER"]))
+
+            for journal, year, quarter in journals:
+                self._close_journal(journal, year, quarter)
+        finally:
+            for journal, _, _ in journals:
+                if journal is not None:
+                    journal.close()
+
+        self.key_pool.save()
+        self.fs_divs.save()
+        self.logger.info("End process: create_panel.")
+        if not frames:
+            return self._to_frame(list(), account_names).assign(
+                YEAR=[], QUARTER=[]
+            ).set_index(["KRX_CODE", "YEAR", "QUARTER"])
+
+        panel = pd.concat(frames)
+        panel = panel.loc[~panel.index.duplicated(keep="last")]
+        return panel.sort_index()
+
+    def refresh_table(
+        self,
+        account_names: list,
+        year: int,
+        quarter: int,
+        since: date,
+        until: date = None,
+        batch: bool = False,
+    ) -> pd.DataFrame:
+        """Create rows of create_table only for companies that filed since a date
+
+        Companies that filed the periodic report of year and quarter
+        (사업/반기/분기보고서, including corrections) or a disclosure changing
+        the number of issued shares between since and until (default: today
+        in KST) are requested again, so the cost of a daily refresh follows
+        the filings of the stored period rather than the size of the market.
+        The cached responses of that report and the stored share count of the
+        period are invalidated first, so amended reports and statements that
+        were not filed yet are requested again. A disclosure changing shares
+        only invalidates the share count. Patch the stored table with the
+        result, e.g. ResultStore.patch.
+
+        Args:
+            account_names (list): names of account name
+            year (int): fisical year of the stored table
+            quarter (int): fisical quater of the stored table
+            since (date): first filing date to look at, usually the date the
+                stored table was last brought up to date
+            until (date): last filing date to look at
+            batch (bool): see create_table
+
+        Return:
+            stock_tables (pd.DataFrame): table of create_table with the rows
+                of the companies that filed only
+
+        Example:
+            >>> since = date(2022, 5, 16)
+            >>> table = DART_API.refresh_table(account_names, 2022, 1, since)
+            >>> store.patch(indicator.indicate(annotator.annotate(table)), 2022, 1)
+        """
+        self.set_stock_codes()
+        self.set_translation_dict()
+        self.failures = dict()
+
+        until = until or datetime.now(KST).date()
+        updated = dict()
+        start = since
+        while start <= until:
+            end = min(until, start + timedelta(days=MAX_DISCLOSURE_DAYS - 1))
+            for dart_code, report_names in self.find_updated_companies(
+                start, end, year, quarter
+            ).items():
+                updated.setdefault(dart_code, list()).extend(report_names)
+            start = end + timedelta(days=1)
+
+        self.logger.info(
+            f"In process: {len(updated)} companies filed from {since} to {until}"
+        )
+        for dart_code, report_names in updated.items():
+            periodic = any(
+                name in report_nm
+                for report_nm in report_names
+                for name in PERIODIC_REPORTS
+            )
+            if self.cache is not None and periodic:
+                self.cache.invalidate(dart_code, year, self.mapper[quarter])
+            if self.share_counts is not None:
+                self.share_counts.invalidate(dart_code, year, quarter)
+        companies = [
+            (corp_name, corp_code_info)
+            for corp_name, corp_code_info in self.stock_codes.items()
+            if corp_code_info["dart_code"] in updated
+        ]
+        rows = self._collect_rows(companies, account_names, year, quarter, batch)
+
+        self.key_pool.save()
+        self.fs_divs.save()
+        self.logger.info("End process: refresh_table.")
+        return self._to_frame(rows, account_names).set_index("KRX_CODE")
+
+    def enqueue_work(
+        self, queue: WorkQueue, account_names: list, start: tuple, end: tuple
+    ) -> int:
+        """Add (company, period) work items of create_panel to a shared queue
+
+        Workers on other hosts collect the items with work, and merge_work
+        assembles the panel. Enqueueing the same periods again adds only the
+        companies newly listed since.
+
+        Example:
+            >>> queue = WorkQueue("/mnt/shared/queue.sqlite3")
+            >>> DART_API.enqueue_work(queue, account_names, (2021, 1), (2022, 1))
+            12465
+        """
+        self.set_stock_codes()
+
+        n_items = queue.enqueue(
+            account_names, list(self.stock_codes.items()), iter_periods(start, end)
+        )
+        self.logger.info(f"End process: enqueue_work. {n_items} items added.")
+        return n_items
+
+    def work(
+        self,
+        queue: WorkQueue,
+        worker: str,
+        chunk_size: int = 100,
+        batch: bool = False,
+    ) -> int:
+        """Collect work items claimed from a shared queue until none is left
+
+        Items are claimed chunk_size at a time and their rows written back to
+        the queue. Companies whose requests fail are released for another
+        attempt. On CollectionAborted the rows collected so far are written
+        and the rest of the claim is released before the error is raised.
+
+        Args:
+            queue (WorkQueue): queue filled by enqueue_work
+            worker (str): name of this worker, e.g. "hostname-pid"
+            chunk_size (int): number of items claimed at once
+            batch (bool): see create_table
+
+        Return:
+            int: number of rows written by this worker
+        """
+        self.set_translation_dict()
+        account_names = queue.account_names
+
+        n_rows = 0
+        while True:
+            claimed = queue.claim(worker, chunk_size)
+            if claimed is None:
+                break
+
+            year, quarter, companies = claimed
+            self.logger.info(
+                f"In process: {len(companies)} items of {year} Q{quarter}"
+            )
+            self.failures = dict()
+            rows = dict()
+            try:
+                for dart_code, row in self._iter_rows(
+                    companies, account_names, year, quarter, batch
+                ):
+                    rows[dart_code] = row
+            except CollectionAborted as error:
+                queue.complete(worker, year, quarter, rows)
+                queue.release(
+                    worker,
+                    year,
+                    quarter,
+                    {
+                        corp_code_info["dart_code"]: str(error)
+                        for _, corp_code_info in companies
+                        if corp_code_info["dart_code"] not in rows
+                    },
+                )
+                raise
+
+            queue.complete(worker, year, quarter, rows)
+            queue.release(
+                worker,
+                year,
+                quarter,
+                {
+                    dart_code: error
+                    for (dart_code, _, _), error in self.failures.items()
+                },
+            )
+            n_rows += len(rows)
+
+        self.key_pool.save()
+        self.fs_divs.save()
+        self.logger.info(f"End process: work. {n_rows} rows written.")
+        return n_rows
+
+    def merge_work(self, queue: WorkQueue) -> pd.DataFrame:
+        """Assemble the rows written to a shared queue into a create_panel panel
+
+        Merging only reads the queue, so it can be repeated at any time. Items
+        not collected yet are missing from the panel and reported in the log.
+
+        Return:
+            panel (pd.DataFrame): dataframe with index (KRX_CODE, YEAR, QUARTER)
+                and columns of create_table
+        """
+        self.set_translation_dict()
+        account_names = queue.account_names
+
+        progress = queue.progress()
+        if progress["pending"] or progress["leased"] or progress["failed"]:
+            self.logger.warning(f"Merging incomplete queue: {progress}")
+
+        frames = list()
+        for year, quarter in queue.periods():
+            frame = self._to_frame(queue.results(year, quarter), account_names)
+            frame["YEAR"] = year
+            frame["QUARTER"] = quarter
+            frames.append(frame.set_index(["KRX_CODE", "YEAR", "QUARTER"]))
+
+        self.logger.info("End process: merge_work.")
+        if not frames:
+            return self._to_frame(list(), account_names).assign(
+                YEAR=[], QUARTER=[]
+            ).set_index(["KRX_CODE", "YEAR", "QUARTER"])
 
-            row = [corp_name, krx_code, dart_code]
-            row += [asset_info.get(asset_name, 0) for asset_name in account_names]
-            row += [self.get_issued_stocks(dart_code, year, quarter)]
-            rows.append(row)
+        return pd.concat(frames).sort_index()
 
+    def _open_journal(
+        self, account_names: list, year: int, quarter: int
+    ) -> CheckpointJournal:
+        """같은 계정명, 회계년도, 분기로 수집하는 동안 사용할 journal을 반환합니다.
+
+        ENV.CACHE_DIR이 설정되지 않은 경우 None을 반환합니다.
+        """
+
+        if not self.config["ENV"]["CACHE_DIR"]:
+            return None
+
+        run_key = json.dumps([account_names, year, quarter], ensure_ascii=False)
+        file_name = hashlib.sha1(run_key.encode("UTF-8")).hexdigest() + ".jsonl"
+        return CheckpointJournal(
+            os.path.join(
+                self.config["ENV"]["CACHE_DIR"],
+                self.config["COLLECTOR"]["JOURNAL_DIR"],
+                file_name,
+            )
+        )
+
+    def _close_journal(
+        self, journal: CheckpointJournal, year: int, quarter: int
+    ) -> None:
+        """수집이 끝난 journal을 지웁니다.
+
+        요청에 실패한 기업이 있으면 journal을 닫기만 하고 남겨 두어, 같은 인자로
+        다시 실행할 때 실패한 기업들만 요청하도록 합니다.
+        """
+
+        failed = [key for key in self.failures if key[1:] == (year, quarter)]
+        if failed:
+            self.logger.warning(
+                f"{len(failed)} companies failed in {year} Q{quarter}; "
+                "run again to request them only."
+            )
+            if journal is not None:
+                journal.close()
+            return
+
+        if journal is not None:
+            journal.remove()
+
+    def _to_frame(self, rows: list, account_names: list) -> pd.DataFrame:
         columns = ["CORP_NAME", "KRX_CODE", "DART_CODE"]
         columns += [self.translation_dict[asset_name] for asset_name in account_names]
         columns += ["ISSUED_STOCK"]
 
-        self.logger.info("End process: create_table.")
-        return pd.DataFrame(rows, columns=columns).set_index("KRX_CODE")
+        return pd.DataFrame(rows, columns=columns)
+
+    def _collect_row(
+        self,
+        corp_name: str,
+        corp_code_info: dict,
+        account_names: list,
+        year: int,
+        quarter: int,
+        batch_sheet: FinancialStatement = None,
+        plan: ExtractionPlan = None,
+    ) -> list:
+        """한 기업의 재무제표와 발행주식수를 조회하여 create_table의 한 행을 반환합니다.
+
+        batch_sheet(다중회사 주요계정 조회 결과)가 주어지면 MULTI_ACCOUNTS에 없는
+        계정이 있을 때만 단일회사 재무제표를 조회합니다. 계정은 plan(기본값:
+        get_extraction_plan(account_names))으로 뽑아냅니다.
+        """
+
+        dart_code = corp_code_info["dart_code"]
+        krx_code = corp_code_info["stock_code"]
+        plan = plan or self.get_extraction_plan(account_names)
+
+        remaining_names = set(account_names)
+        asset_info = dict()
+        if batch_sheet is not None:
+            asset_info = plan.extract(batch_sheet)
+            remaining_names -= MULTI_ACCOUNTS
+
+        if remaining_names:
+            fs = self.get_finance_sheet(dart_code, year, quarter)
+            extracted = plan.extract(fs)
+            asset_info.update(
+                (asset_name, extracted[asset_name])
+                for asset_name in remaining_names
+                if asset_name in extracted
+            )
+
+        row = [corp_name, krx_code, dart_code]
+        row += [asset_info.get(asset_name, 0) for asset_name in account_names]
+        row += [self.get_issued_stocks(dart_code, year, quarter)]
+
+        return row
+
+    def _collect_rows(
+        self,
+        companies: list,
+        account_names: list,
+        year: int,
+        quarter: int,
+        batch: bool = False,
+        journal: CheckpointJournal = None,
+    ) -> list:
+        """companies((corp_name, corp_code_info) 목록)의 행을 입력 순서대로 반환합니다.
+
+        요청에 실패한 기업의 행은 포함하지 않습니다.
+        """
+
+        rows = dict(
+            self._iter_rows(companies, account_names, year, quarter, batch, journal)
+        )
+        return [
+            rows[corp_code_info["dart_code"]]
+            for _, corp_code_info in companies
+            if corp_code_info["dart_code"] in rows
+        ]
+
+    def _iter_rows(
+        self,
+        companies: list,
+        account_names: list,
+        year: int,
+        quarter: int,
+        batch: bool = False,
+        journal: CheckpointJournal = None,
+    ):
+        """companies의 (dart_code, 행)을 수집이 끝나는 순서대로 반환합니다.
+
+        journal이 주어지면 이미 기록된 기업은 요청하지 않고 먼저 반환하며, 새로
+        수집한 행은 완료되는 즉시 journal에 기록합니다. 요청에 실패한 기업은
+        반환하지 않고 failures에 기록하며, CollectionAborted가 발생하면 수집을
+        멈춥니다. worker pool에는 최대
+        n_workers * 2개의 기업만 대기시키고, batch이면 다중회사 조회도 그
+        기업들을 수집할 차례에 MULTI_BATCH_SIZE개씩 요청하므로 소비하는 쪽이
+        느려도 메모리 사용량이 늘어나지 않습니다.
+        """
+
+        done = dict() if journal is None else journal.load()
+        if done:
+            self.logger.info(f"Resume from journal: {len(done)} rows collected.")
+
+        pending = list()
+        for company in companies:
+            dart_code = company[1]["dart_code"]
+            if dart_code in done:
+                yield dart_code, done[dart_code]
+            else:
+                pending.append(company)
+        del done
+
+        use_batch = batch and MULTI_ACCOUNTS & set(account_names)
+        batch_size = self.config["COLLECTOR"]["MULTI_BATCH_SIZE"]
+        plan = self.get_extraction_plan(account_names)
+
+        def tasks():
+            # 다중회사 조회는 해당 기업들을 수집할 차례에 요청하므로 batch_size개
+            # 기업의 결과만 메모리에 남음
+            for i in range(0, len(pending), batch_size):
+                companies = pending[i : i + batch_size]
+                sheets = dict()
+                if use_batch:
+                    sheets = self.get_multi_finance_sheets(
+                        [corp_code_info for _, corp_code_info in companies],
+                        year,
+                        quarter,
+                    )
+                for company in companies:
+                    yield company, sheets.pop(company[1]["dart_code"], None)
+
+        def collect(task):
+            (corp_name, corp_code_info), batch_sheet = task
+            dart_code = corp_code_info["dart_code"]
+            try:
+                row = self._collect_row(
+                    corp_name,
+                    corp_code_info,
+                    account_names,
+                    year,
+                    quarter,
+                    batch_sheet,
+                    plan,
+                )
+            except CollectionAborted:
+                raise
+            except DartAPIError as error:
+                self.logger.warning(
+                    f"Failed to collect {corp_name}({dart_code}): {error}"
+                )
+                self.failures[(dart_code, year, quarter)] = str(error)
+                return dart_code, None
+
+            if journal is not None:
+                journal.append(dart_code, row)
+            return dart_code, row
+
+        if self.n_workers <= 1:
+            for task in tasks():
+                dart_code, row = collect(task)
+                if row is not None:
+                    yield dart_code, row
+            return
+
+        queued = tasks()
+        with ThreadPoolExecutor(max_workers=self.n_workers) as executor:
+            in_flight = {
+                executor.submit(collect, task)
+                for task in islice(queued, self.n_workers * 2)
+            }
+            while in_flight:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    dart_code, row = future.result()
+                    if row is not None:
+                        yield dart_code, row
+
+                for task in islice(queued, len(finished)):
+                    in_flight.add(executor.submit(collect, task))
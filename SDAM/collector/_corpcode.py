@@ -0,0 +1,203 @@
+import os
+import sys
+import json
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+
+import requests
+from io import BytesIO
+from logging import Logger
+from zipfile import ZipFile
+
+COLLECTOR_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(COLLECTOR_DIR)
+sys.path.append(ROOT_DIR)
+
+from error_handler import DartAPIError
+from ._scheduler import RequestScheduler
+
+CORPCODE_URL = "https://opendart.fss.or.kr/api/corpCode.xml"
+
+
+class CorpCodeLoader(object):
+    """DART 고유번호(corpCode.xml) 목록을 내려받아 상장기업만 반환합니다.
+
+    내려받은 zip 파일은 cache_dir에 저장되며, max_age가 지난 경우에만
+    조건부 요청(If-None-Match, If-Modified-Since)으로 갱신 여부를 확인합니다.
+    zip 파일 대신 에러 메시지(XML)를 받으면 저장된 zip 파일을 그대로 사용하고
+    다음 load에서 다시 갱신을 확인합니다. 저장된 zip 파일이 없으면
+    DartAPIError를 발생시킵니다.
+    XML은 스트리밍으로 파싱하며 stock_code가 없는 항목은 버립니다.
+
+    Parameters
+    ----------
+    cert_key (str): DART API key
+    cache_dir (str): zip 파일을 저장할 디렉토리. 없으면 매번 내려받음
+    max_age (int): 저장된 zip 파일을 갱신 확인 없이 사용하는 시간(초)
+    session (requests.Session): 요청에 사용할 세션
+    url (str): corpCode.xml의 URL
+    scheduler (RequestScheduler): 요청에 사용할 scheduler. key_pool이 있으면
+        cert_key 대신 key_pool의 인증키로 요청하고 요청 수를 셈
+
+    Example
+    -------
+        >>> loader = CorpCodeLoader(cert_key, cache_dir="cache")
+        >>> loader.load()
+        [
+            {
+                'corp_code': '00126380',
+                'corp_name': '삼성전자',
+                'stock_code': '005930',
+                'modify_date': '20220509'
+            },
+            ...
+        ]
+    """
+
+    def __init__(
+        self,
+        cert_key: str,
+        cache_dir: str = None,
+        max_age: int = 24 * 60 * 60,
+        session: requests.Session = None,
+        logger: Logger = Logger(__name__),
+        url: str = CORPCODE_URL,
+        scheduler: RequestScheduler = None,
+    ) -> None:
+        self.cert_key = cert_key
+        self.url = url
+        self.scheduler = scheduler
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.session = session or requests.Session()
+        self.logger = logger
+
+        if cache_dir:
+            self.zip_path = os.path.join(cache_dir, "corpCode.zip")
+            self.meta_path = os.path.join(cache_dir, "corpCode.json")
+
+    def _read_meta(self) -> dict:
+        if not os.path.exists(self.meta_path):
+            return dict()
+
+        with open(self.meta_path, "r", encoding="UTF-8") as fh:
+            return json.load(fh)
+
+    def _write_meta(self, meta: dict) -> None:
+        with open(self.meta_path, "w", encoding="UTF-8") as fh:
+            json.dump(meta, fh)
+
+    def _download(self, headers: dict = None) -> requests.Response:
+        """corpCode.xml을 요청합니다. zip 파일 대신 에러 메시지를 받으면
+        DartAPIError를 발생시킵니다.
+        """
+
+        def send(key=self.cert_key):
+            response = self.session.get(
+                self.url, params={"crtfc_key": key}, headers=headers
+            )
+            response.raise_for_status()
+            status, message = "000", "정상"
+            if response.status_code != 304:
+                status, message = self._status(response.content)
+            return {"status": status, "message": message, "response": response}
+
+        if self.scheduler is not None:
+            return self.scheduler.run(send)["response"]
+
+        result = send()
+        if result["status"] != "000":
+            raise DartAPIError(result["status"], result["message"])
+        return result["response"]
+
+    @staticmethod
+    def _status(content: bytes) -> tuple:
+        """응답의 (status, message)를 반환합니다. zip 파일이면 000입니다."""
+
+        if zipfile.is_zipfile(BytesIO(content)):
+            return "000", "정상"
+
+        try:
+            result = ET.fromstring(content)
+            return result.findtext("status"), result.findtext("message") or ""
+        except ET.ParseError:
+            return None, "corpCode.xml response is not a zip file"
+
+    def _refresh(self) -> None:
+        """저장된 zip 파일이 max_age보다 오래되었으면 서버에서 갱신합니다."""
+
+        meta = self._read_meta()
+        if (
+            os.path.exists(self.zip_path)
+            and time.time() - meta.get("checked_at", 0) < self.max_age
+        ):
+            return
+
+        headers = dict()
+        if os.path.exists(self.zip_path):
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            response = self._download(headers)
+        except DartAPIError as error:
+            if not os.path.exists(self.zip_path):
+                raise
+            self.logger.warning(f"corpCode.xml not refreshed: {error}")
+            return
+
+        if response.status_code == 304:
+            self.logger.debug("corpCode.xml not modified")
+        else:
+            tmp_path = self.zip_path + ".tmp"
+            with open(tmp_path, "wb") as fh:
+                fh.write(response.content)
+            os.replace(tmp_path, self.zip_path)
+            meta["etag"] = response.headers.get("ETag")
+            meta["last_modified"] = response.headers.get("Last-Modified")
+            self.logger.debug("corpCode.xml downloaded")
+
+        meta["checked_at"] = time.time()
+        self._write_meta(meta)
+
+    def _open_zip(self) -> ZipFile:
+        if not self.cache_dir:
+            return ZipFile(BytesIO(self._download().content))
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._refresh()
+        return ZipFile(self.zip_path)
+
+    @staticmethod
+    def parse(corpcode_xml) -> list:
+        """corpCode.xml 스트림을 순차적으로 파싱하여 상장기업 항목만 반환합니다."""
+
+        corps = list()
+        events = ET.iterparse(corpcode_xml, events=("start", "end"))
+        _, root = next(events)
+        for event, elem in events:
+            if event != "end" or elem.tag != "list":
+                continue
+
+            stock_code = (elem.findtext("stock_code") or "").strip()
+            if stock_code:
+                corps.append(
+                    {
+                        "corp_code": elem.findtext("corp_code"),
+                        "corp_name": elem.findtext("corp_name"),
+                        "stock_code": stock_code,
+                        "modify_date": elem.findtext("modify_date"),
+                    }
+                )
+            root.clear()
+
+        return corps
+
+    def load(self) -> list:
+        with self._open_zip() as zip_file:
+            file = zip_file.namelist()[0]
+            with zip_file.open(file) as corpcode_xml:
+                return self.parse(corpcode_xml)
@@ -0,0 +1,160 @@
+from ._statement import ACCOUNT_CODES, MISSING, AccountCodes, FinancialStatement
+
+ANY_STATEMENT = -2
+
+
+class AccountSpec(object):
+    """계정명칭을 재무제표의 계정과 맞추는 규칙
+
+    Args:
+        name (str): 계정명칭. create_table의 account_names에 사용하는 이름
+        column (str): 테이블의 열 이름
+        sj_divs (tuple): 계정을 찾을 재무제표 구분(BS, IS, CIS, CF, SCE).
+            비어 있으면 모든 재무제표에서 찾음
+        account_ids (tuple): 계정의 IFRS 표준계정코드(account_id)
+        synonyms (tuple): name 외에 같은 계정으로 보는 계정명칭
+    """
+
+    def __init__(
+        self,
+        name: str,
+        column: str,
+        sj_divs: tuple = (),
+        account_ids: tuple = (),
+        synonyms: tuple = (),
+    ) -> None:
+        self.name = name
+        self.column = column
+        self.sj_divs = tuple(sj_divs)
+        self.account_ids = tuple(account_ids)
+        self.synonyms = tuple(synonyms)
+
+    @classmethod
+    def parse(cls, line: str) -> "AccountSpec":
+        """kr2eng.txt의 한 줄을 읽습니다.
+
+        형식은 "계정명칭:열이름[:재무제표구분|...[:account_id,...[:동의어,...]]]"
+        이며, 뒤의 항목은 생략할 수 있습니다.
+
+        Example:
+            >>> spec = AccountSpec.parse(
+            ...     "영업이익:OPERATING_PROFIT:IS|CIS:dart_OperatingIncomeLoss:영업이익(손실)"
+            ... )
+            >>> spec.sj_divs, spec.synonyms
+            (('IS', 'CIS'), ('영업이익(손실)',))
+        """
+
+        fields = line.strip().split(":") + [""] * 3
+        name, column, sj_divs, account_ids, synonyms = fields[:5]
+
+        return cls(
+            name,
+            column,
+            sj_divs=[sj_div for sj_div in sj_divs.split("|") if sj_div],
+            account_ids=[
+                account_id for account_id in account_ids.split(",") if account_id
+            ],
+            synonyms=[synonym for synonym in synonyms.split(",") if synonym],
+        )
+
+
+def read_account_specs(path: str) -> dict:
+    """계정명칭별 AccountSpec을 mapping 파일(kr2eng.txt)에서 읽습니다."""
+
+    specs = dict()
+    with open(path, "r", encoding="UTF-8") as fh:
+        for line in fh:
+            if line.strip():
+                spec = AccountSpec.parse(line)
+                specs[spec.name] = spec
+
+    return specs
+
+
+class ExtractionPlan(object):
+    """요청한 계정들을 재무제표를 한 번 훑어서 모두 뽑아내는 계획
+
+    계정명칭 목록과 AccountSpec으로부터 한 번만 만들어지며, 각 account_id와
+    계정명칭의 코드(AccountCodes)를 (재무제표 구분, 열 위치, 우선순위) 후보로
+    미리 풀어 둡니다. extract는 재무제표의 각 행에서 dict를 두 번 조회하므로
+    요청한 계정의 수와 관계없이 재무제표의 행 수에만 비례합니다.
+
+    account_id가 맞는 행이 계정명칭이 맞는 행보다 우선하고, 계정명칭 중에서는
+    name, synonyms의 순서로 우선합니다. 우선순위가 같으면 먼저 나온 행을
+    사용합니다. AccountSpec이 없는 계정명칭은 이름이 같은 행과 맞추고,
+    sj_div가 없는 행은 모든 재무제표 구분에 맞춥니다.
+
+    Example:
+        >>> plan = ExtractionPlan(["유동자산", "영업이익"], read_account_specs(path))
+        >>> plan.extract(DART_API.get_finance_sheet("00126380", 2019, 1))
+        {'유동자산': 177388524000000, '영업이익': 6233282000000}
+    """
+
+    def __init__(
+        self, account_names: list, specs: dict, codes: AccountCodes = ACCOUNT_CODES
+    ) -> None:
+        self.account_names = list(account_names)
+        self.codes = codes
+        self.candidates = dict()
+
+        for column, account_name in enumerate(self.account_names):
+            spec = specs.get(account_name) or AccountSpec(account_name, account_name)
+            sj_divs = [codes.intern(sj_div) for sj_div in spec.sj_divs]
+            sj_divs = sj_divs or [ANY_STATEMENT]
+
+            keys = list(spec.account_ids) + [spec.name] + list(spec.synonyms)
+            for priority, key in enumerate(keys):
+                code = codes.intern(key)
+                for sj_div in sj_divs:
+                    self.candidates.setdefault(code, list()).append(
+                        (sj_div, column, priority)
+                    )
+
+        self.candidates = {
+            code: tuple(candidates) for code, candidates in self.candidates.items()
+        }
+
+    def extract(self, fs: FinancialStatement) -> dict:
+        """fs에서 찾은 계정명칭별 당기금액을 반환합니다. 못 찾은 계정은 포함하지 않습니다.
+
+        Args:
+            fs (FinancialStatement): finantial sheet. 응답의 계정 목록(list)을
+                받으면 FinancialStatement로 압축하여 사용
+        """
+
+        if not isinstance(fs, FinancialStatement):
+            fs = FinancialStatement.parse(fs, self.codes)
+        elif fs.codes is not self.codes:
+            raise ValueError("FinancialStatement parsed with other AccountCodes")
+
+        n_columns = len(self.account_names)
+        best = [None] * n_columns
+        rows = [MISSING] * n_columns
+
+        candidates = self.candidates
+        for row, (sj_div, account_id, account_name, has_current) in enumerate(
+            zip(
+                fs.sj_divs.tolist(),
+                fs.account_ids.tolist(),
+                fs.account_names.tolist(),
+                fs.has_current.tolist(),
+            )
+        ):
+            if not has_current:
+                continue
+
+            for code in (account_id, account_name):
+                for candidate_sj_div, column, priority in candidates.get(code, ()):
+                    if candidate_sj_div not in (ANY_STATEMENT, sj_div) and (
+                        sj_div != MISSING
+                    ):
+                        continue
+                    if best[column] is None or priority < best[column]:
+                        best[column] = priority
+                        rows[column] = row
+
+        return {
+            self.account_names[column]: int(fs.current[row])
+            for column, row in enumerate(rows)
+            if row != MISSING
+        }
@@ -0,0 +1,111 @@
+import os
+import json
+import time
+import threading
+
+FS_DIVS = ("CFS", "OFS")  # 연결재무제표, 재무제표
+
+
+def other_fs_div(fs_div: str) -> str:
+    return "OFS" if fs_div == "CFS" else "CFS"
+
+
+class StatementTypeResolver(object):
+    """기업별로 실제로 제출하는 재무제표의 종류(CFS/OFS)를 기억합니다.
+
+    종속회사가 없는 기업은 연결재무제표(CFS) 없이 재무제표(OFS)만 제출하므로
+    CFS를 먼저 요청하면 매번 요청이 하나씩 낭비됩니다. 선호하는 종류(preferred)
+    대신 다른 종류에서 재무제표를 찾은 기업은 그 종류를 기억해 두었다가 다음
+    요청부터 먼저 요청합니다. 기억한 종류는 max_age초가 지나면 잊고 다시
+    preferred부터 요청하므로, 종속회사가 생겨 CFS를 제출하기 시작한 기업도
+    다시 CFS로 돌아옵니다.
+
+    path가 주어지면 save_every번 바뀔 때마다, 그리고 save를 호출할 때 json으로
+    저장하고 다시 불러옵니다.
+
+    Parameters
+    ----------
+    path (str): 기억한 종류를 저장할 json 파일의 경로
+    preferred (str): 먼저 요청할 재무제표의 종류. 'CFS' 또는 'OFS'
+    max_age (int): 기억한 종류의 유효시간(초)
+    save_every (int): 저장하는 주기
+
+    Example
+    -------
+        >>> resolver = StatementTypeResolver("cache/fs_div.json")
+        >>> resolver.order("00152686")
+        ('CFS', 'OFS')
+        >>> resolver.learn("00152686", "OFS")
+        >>> resolver.order("00152686")
+        ('OFS', 'CFS')
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        preferred: str = "CFS",
+        max_age: int = 90 * 24 * 60 * 60,
+        save_every: int = 100,
+    ) -> None:
+        if preferred not in FS_DIVS:
+            raise ValueError(f"fs_div not expected, given {preferred}")
+
+        self.path = path
+        self.preferred = preferred
+        self.max_age = max_age
+        self.save_every = save_every
+        self.lock = threading.Lock()
+
+        self.learned = dict()
+        self.n_unsaved = 0
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="UTF-8") as fh:
+                self.learned = json.load(fh)
+
+    def order(self, corp_code: str) -> tuple:
+        """corp_code에 요청할 재무제표의 종류를 요청할 순서대로 반환합니다."""
+
+        with self.lock:
+            learned = self.learned.get(corp_code)
+
+        if learned is None or time.time() - learned["learned_at"] >= self.max_age:
+            return self.preferred, other_fs_div(self.preferred)
+
+        return learned["fs_div"], other_fs_div(learned["fs_div"])
+
+    def learn(self, corp_code: str, fs_div: str) -> None:
+        """먼저 요청한 종류에 재무제표가 없어 fs_div에서 찾았다는 것을 기억합니다.
+
+        fs_div가 preferred이면 기억한 종류를 잊습니다.
+        """
+
+        with self.lock:
+            if fs_div == self.preferred:
+                if self.learned.pop(corp_code, None) is None:
+                    return
+            else:
+                self.learned[corp_code] = {
+                    "fs_div": fs_div,
+                    "learned_at": time.time(),
+                }
+            self.n_unsaved += 1
+            if self.n_unsaved >= self.save_every:
+                self._save()
+
+    def _save(self) -> None:
+        self.n_unsaved = 0
+        if not self.path:
+            return
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="UTF-8") as fh:
+            json.dump(self.learned, fh)
+        os.replace(tmp_path, self.path)
+
+    def save(self) -> None:
+        """저장하지 않은 변경을 저장합니다."""
+
+        with self.lock:
+            if self.n_unsaved:
+                self._save()
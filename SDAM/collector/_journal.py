@@ -0,0 +1,67 @@
+import os
+import json
+import threading
+
+
+class CheckpointJournal(object):
+    """수집된 행을 기업마다 한 줄씩 덧붙이는 JSON Lines 파일
+
+    각 행은 기록 즉시 fsync 되므로 수집이 중단되어도 기록된 행은 남으며, 같은
+    조건으로 다시 실행하면 load()로 기록된 행을 불러와 이어서 수집할 수 있습니다.
+    중단으로 잘린 마지막 줄은 무시합니다.
+
+    Parameters
+    ----------
+    path (str): journal 파일 경로
+
+    Example
+    -------
+        >>> journal = CheckpointJournal("cache/journal/2022_1.jsonl")
+        >>> journal.append("00152686", ["코리아써키트", "007810", "00152686", 0])
+        >>> journal.load()
+        {'00152686': ['코리아써키트', '007810', '00152686', 0]}
+    """
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+
+        truncated = False
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, "rb") as fh:
+                fh.seek(-1, os.SEEK_END)
+                truncated = fh.read(1) != b"\n"
+
+        self.fh = open(path, "a", encoding="UTF-8")
+        if truncated:
+            self.fh.write("\n")
+
+    def load(self) -> dict:
+        rows = dict()
+        with open(self.path, "r", encoding="UTF-8", errors="replace") as fh:
+            for line in fh:
+                try:
+                    key, row = json.loads(line)
+                except ValueError:
+                    continue
+                rows[key] = row
+
+        return rows
+
+    def append(self, key: str, row: list) -> None:
+        line = json.dumps([key, row], ensure_ascii=False) + "\n"
+        with self.lock:
+            self.fh.write(line)
+            self.fh.flush()
+            os.fsync(self.fh.fileno())
+
+    def close(self) -> None:
+        """파일을 닫습니다. 기록된 행은 남으며 여러 번 호출해도 됩니다."""
+
+        with self.lock:
+            self.fh.close()
+
+    def remove(self) -> None:
+        self.close()
+        os.remove(self.path)
@@ -0,0 +1,162 @@
+import os
+import json
+import hashlib
+import threading
+from logging import Logger
+from datetime import datetime
+
+from ._scheduler import KST
+
+
+def key_id(key: str) -> str:
+    """파일에 인증키 대신 기록하는 인증키의 식별자를 반환합니다."""
+
+    return hashlib.sha1(key.encode("UTF-8")).hexdigest()[:12]
+
+
+class KeyPool(object):
+    """여러 DART API 인증키에 요청을 나누고 인증키별 일일 요청 수를 관리합니다.
+
+    acquire는 오늘(KST) 요청 수가 가장 적고 한도가 남은 인증키를 반환하므로
+    요청이 인증키들에 고르게 나뉩니다. 요청 수가 daily_quota에 이르렀거나
+    DART API가 요청 제한 초과(status 020)를 반환하여 exhaust된 인증키는 다음
+    날까지 사용하지 않습니다.
+
+    path가 주어지면 요청 수를 save_every번마다, 그리고 인증키가 exhaust될 때
+    json으로 저장하고 다시 불러오므로 여러 번 나누어 실행해도 인증키별 한도를
+    지킵니다. 파일에는 인증키 대신 key_id만 기록합니다.
+
+    Parameters
+    ----------
+    keys (list): DART API 인증키 목록
+    path (str): 요청 수를 저장할 json 파일의 경로
+    daily_quota (int): 인증키별 일일 요청 한도
+    save_every (int): 요청 수를 저장하는 주기
+    logger (Logger): python built-in logger
+
+    Example
+    -------
+        >>> pool = KeyPool(["key1", "key2"], path="cache/key_usage.json")
+        >>> pool.acquire()
+        'key1'
+        >>> pool.exhaust("key1")
+        >>> pool.acquire(), pool.acquire()
+        ('key2', 'key2')
+    """
+
+    def __init__(
+        self,
+        keys: list,
+        path: str = None,
+        daily_quota: int = 20_000,
+        save_every: int = 100,
+        logger: Logger = Logger(__name__),
+    ) -> None:
+        if not keys:
+            raise ValueError("At least one DART API key is required")
+
+        self.keys = list(dict.fromkeys(keys))
+        self.path = path
+        self.daily_quota = daily_quota
+        self.save_every = save_every
+        self.logger = logger
+        self.lock = threading.Lock()
+
+        self.date = None
+        self.counts = dict()
+        self.exhausted = set()
+        self.n_unsaved = 0
+        self._load()
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now(KST).date().isoformat()
+
+    def _load(self) -> None:
+        self.date = self.today()
+        self.counts = {key: 0 for key in self.keys}
+        self.exhausted = set()
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r", encoding="UTF-8") as fh:
+            usage = json.load(fh)
+        if usage.get("date") != self.date:
+            return
+
+        for key in self.keys:
+            self.counts[key] = usage["counts"].get(key_id(key), 0)
+            if key_id(key) in usage["exhausted"]:
+                self.exhausted.add(key)
+
+    def _save(self) -> None:
+        self.n_unsaved = 0
+        if not self.path:
+            return
+
+        usage = {
+            "date": self.date,
+            "counts": {key_id(key): count for key, count in self.counts.items()},
+            "exhausted": sorted(key_id(key) for key in self.exhausted),
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="UTF-8") as fh:
+            json.dump(usage, fh)
+        os.replace(tmp_path, self.path)
+
+    def _roll_over(self) -> None:
+        if self.date != self.today():
+            self.logger.info("Reset request counts of DART API keys")
+            self._load()
+
+    def _available(self) -> list:
+        self._roll_over()
+        return [
+            key
+            for key in self.keys
+            if key not in self.exhausted and self.counts[key] < self.daily_quota
+        ]
+
+    def available(self) -> list:
+        """오늘 한도가 남은 인증키 목록을 반환합니다."""
+
+        with self.lock:
+            return self._available()
+
+    def acquire(self) -> str:
+        """요청에 사용할 인증키를 반환합니다. 한도가 남은 인증키가 없으면 None을 반환합니다."""
+
+        with self.lock:
+            candidates = self._available()
+            if not candidates:
+                return None
+
+            key = min(candidates, key=self.counts.get)
+            self.counts[key] += 1
+            self.n_unsaved += 1
+            if self.n_unsaved >= self.save_every:
+                self._save()
+
+            return key
+
+    def exhaust(self, key: str) -> None:
+        """key를 오늘 더 이상 사용하지 않습니다."""
+
+        with self.lock:
+            self._roll_over()
+            if key in self.exhausted:
+                return
+
+            self.exhausted.add(key)
+            self.logger.warning(
+                f"DART API key {key_id(key)} exhausted after {self.counts[key]} "
+                f"requests; {len(self.keys) - len(self.exhausted)} keys left"
+            )
+            self._save()
+
+    def save(self) -> None:
+        """저장하지 않은 요청 수를 저장합니다."""
+
+        with self.lock:
+            self._save()
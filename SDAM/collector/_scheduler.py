@@ -0,0 +1,180 @@
+import os
+import sys
+import time
+import random
+import threading
+from logging import Logger
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+COLLECTOR_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(COLLECTOR_DIR)
+sys.path.append(ROOT_DIR)
+
+from throttle import RateLimiter
+from error_handler import DartAPIError, CollectionAborted, QuotaExceeded
+
+KST = timezone(timedelta(hours=9))
+
+# DART API 에러 및 정보 코드
+# https://opendart.fss.or.kr/guide/detail.do?apiGrpCd=DS001&apiId=2019001
+OK_STATUSES = frozenset(["000", "013"])  # 정상, 조회된 데이타가 없음
+QUOTA_STATUS = "020"  # 요청 제한 초과
+ABORT_STATUSES = frozenset(["010", "011", "012", "901"])  # 인증키, IP 오류
+RETRY_STATUSES = frozenset(["800", "900"])  # 시스템 점검, 정의되지 않은 오류
+
+
+def seconds_until_quota_reset(now: datetime = None) -> float:
+    """DART API 요청 한도가 초기화되는 다음 자정(KST)까지 남은 초를 반환합니다."""
+
+    now = (now or datetime.now(KST)).astimezone(KST)
+    tomorrow = (now + timedelta(days=1)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    return (tomorrow - now).total_seconds()
+
+
+class RequestScheduler(object):
+    """DART API 요청의 속도 제한, 재시도, 수집 중단을 모든 worker에 걸쳐 관리합니다.
+
+    - 요청마다 rate_limiter의 token을 받은 뒤 보냅니다.
+    - 연결 오류, HTTP 오류, status 800/900은 지수적으로 늘어나는 시간(full
+      jitter)만큼 기다린 뒤 max_retries번까지 다시 요청합니다.
+    - status 010/011/012/901(인증키, IP 오류)을 받으면 circuit을 열어 이후의
+      모든 요청을 보내지 않고 CollectionAborted를 발생시킵니다.
+    - status 020(요청 제한 초과)을 받으면 key_pool이 있는 경우 해당 인증키를
+      exhaust하고 다른 인증키로 다시 요청합니다. 한도가 남은 인증키가 없으면
+      wait_on_quota가 False인 경우 같은 방식으로 QuotaExceeded를 발생시키고,
+      True인 경우 모든 worker가 한도가 초기화되는 다음 자정(KST)까지 기다린 뒤
+      다시 요청합니다.
+    - 그 밖의 status는 해당 요청만 DartAPIError로 실패시킵니다.
+
+    Parameters
+    ----------
+    rate_limiter (RateLimiter): 요청 속도를 제한하는 token bucket
+    logger (Logger): python built-in logger
+    max_retries (int): 재시도할 수 있는 오류에서 다시 요청하는 최대 횟수
+    backoff_base (float): 첫 재시도에서 기다리는 최대 초
+    backoff_max (float): 재시도에서 기다리는 최대 초
+    wait_on_quota (bool): 요청 제한 초과 시 멈추지 않고 기다릴지 여부
+    key_pool (KeyPool): 요청마다 인증키를 나누어 주는 KeyPool. 주어지면 send를
+        인증키와 함께 send(key)로 호출
+
+    Example
+    -------
+        >>> scheduler = RequestScheduler(RateLimiter(10))
+        >>> scheduler.run(lambda: session.get(url, params=params).json())
+        {'status': '000', 'message': '정상', 'list': [...]}
+    """
+
+    def __init__(
+        self,
+        rate_limiter: RateLimiter = None,
+        logger: Logger = Logger(__name__),
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        wait_on_quota: bool = False,
+        key_pool=None,
+    ) -> None:
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.logger = logger
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.wait_on_quota = wait_on_quota
+        self.key_pool = key_pool
+
+        self.lock = threading.Lock()
+        self.aborted = None
+        self.paused_until = 0.0
+
+    def backoff(self, attempt: int) -> float:
+        """attempt번째 재시도 전에 기다릴 초를 반환합니다."""
+
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def abort(self, error: CollectionAborted) -> None:
+        with self.lock:
+            if self.aborted is None:
+                self.logger.error(f"Stop requesting DART API: {error}")
+                self.aborted = error
+
+    def _wait_if_paused(self) -> None:
+        while True:
+            if self.aborted is not None:
+                raise self.aborted
+
+            wait = self.paused_until - time.time()
+            if wait <= 0:
+                return
+            time.sleep(min(wait, 60))
+
+    def _pause_until_quota_reset(self) -> None:
+        with self.lock:
+            if self.paused_until <= time.time():
+                wait = seconds_until_quota_reset()
+                self.logger.warning(f"Quota exceeded: waiting {wait:.0f}s")
+                self.paused_until = time.time() + wait
+
+    def run(self, send) -> dict:
+        """send()로 요청한 DART API 응답(dict)을 반환합니다.
+
+        Args:
+            send (callable): 요청을 보내고 응답의 json을 dict로 반환하는 함수.
+                key_pool이 있으면 사용할 인증키를 인자로 받음
+
+        Return:
+            dict: status가 000(정상) 또는 013(조회된 데이타가 없음)인 응답
+        """
+
+        attempt = 0
+        while True:
+            self._wait_if_paused()
+
+            key = None
+            if self.key_pool is not None:
+                key = self.key_pool.acquire()
+
+            if self.key_pool is not None and key is None:
+                status, message = QUOTA_STATUS, "No DART API key with quota left"
+            else:
+                self.rate_limiter.acquire()
+                try:
+                    result = send() if key is None else send(key)
+                    status = result.get("status", "000")
+                    message = result.get("message", "")
+                except (requests.RequestException, ValueError) as error:
+                    status, message = None, f"{type(error).__name__}: {error}"
+
+            if status in OK_STATUSES:
+                return result
+
+            if status in ABORT_STATUSES:
+                self.abort(CollectionAborted(status, message))
+                raise self.aborted
+
+            if status == QUOTA_STATUS:
+                if key is not None:
+                    self.key_pool.exhaust(key)
+                    continue
+                if not self.wait_on_quota:
+                    self.abort(QuotaExceeded(status, message))
+                    raise self.aborted
+                self._pause_until_quota_reset()
+                continue
+
+            if status is not None and status not in RETRY_STATUSES:
+                raise DartAPIError(status, message)
+
+            if attempt >= self.max_retries:
+                raise DartAPIError(status, message)
+
+            wait = self.backoff(attempt)
+            attempt += 1
+            self.logger.debug(
+                f"Retry {attempt}/{self.max_retries} in {wait:.1f}s: "
+                f"[{status}] {message}"
+            )
+            time.sleep(wait)
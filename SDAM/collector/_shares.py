@@ -0,0 +1,160 @@
+import os
+import time
+import sqlite3
+import threading
+
+
+def to_period(year: int, quarter: int) -> int:
+    """(year, quarter)를 분기 단위의 정수로 바꿉니다. 연속한 분기는 1씩 차이납니다."""
+
+    return int(year) * 4 + int(quarter) - 1
+
+
+class ShareCountStore(object):
+    """기업별 발행주식수(istc_totqy)를 분기와 함께 저장하고 다음 분기로 이어 씁니다.
+
+    발행주식수는 분기마다 거의 바뀌지 않으므로, 보고서에서 조회한 값이
+    carry_quarters 분기 이내에 있으면 다음 분기의 값을 요청하지 않고 그 값을
+    이어 씁니다. 분기보고서에 발행주식수를 작성하지 않아 0을 받은 경우(예,
+    코스맥스)에는 fill_quarters 분기 이내에 조회한 값으로 대신합니다.
+
+    보고서에서 조회한 값은 만료되지 않으며, 이어 쓴 값과 0은 max_age초 동안만
+    사용한 뒤 다시 조회합니다. 정기보고서나 증자, 감자 등의 공시를 접수한
+    기업은 invalidate로 저장된 값을 지워 다시 조회하도록 합니다.
+
+    Parameters
+    ----------
+    path (str): sqlite 파일 경로
+    carry_quarters (int): 요청하지 않고 이어 쓰는 최대 분기 수. 0이면 이어 쓰지 않음
+    fill_quarters (int): 0 대신 이전 값을 사용하는 최대 분기 수
+    max_age (int): 이어 쓴 값과 0의 유효시간(초)
+
+    Example
+    -------
+        >>> store = ShareCountStore("cache/share_counts.sqlite3")
+        >>> store.set("00126380", 2022, 1, 5969782550)
+        5969782550
+        >>> store.get("00126380", 2022, 2)  # 2022년 1분기의 값을 이어 씀
+        5969782550
+        >>> store.get("00126380", 2022, 3)  # 다시 조회해야 함
+    """
+
+    def __init__(
+        self,
+        path: str,
+        carry_quarters: int = 1,
+        fill_quarters: int = 4,
+        max_age: int = 7 * 24 * 60 * 60,
+    ) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.carry_quarters = carry_quarters
+        self.fill_quarters = fill_quarters
+        self.max_age = max_age
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS shares (
+                    dart_code TEXT NOT NULL,
+                    period INTEGER NOT NULL,
+                    n_shares INTEGER NOT NULL,
+                    source_period INTEGER NOT NULL,
+                    checked_at REAL NOT NULL,
+                    PRIMARY KEY (dart_code, period)
+                )
+                """
+            )
+
+    def _reported(self, dart_code: str, period: int, n_quarters: int) -> tuple:
+        """period 이전 n_quarters 분기 이내에 보고서에서 조회한 가장 최근의 0이
+        아닌 값을 (n_shares, period)로 반환합니다. 없으면 None을 반환합니다.
+        """
+
+        return self.conn.execute(
+            "SELECT n_shares, period FROM shares "
+            "WHERE dart_code=? AND period<? AND period>=? "
+            "AND source_period=period AND n_shares>0 "
+            "ORDER BY period DESC LIMIT 1",
+            (dart_code, period, period - n_quarters),
+        ).fetchone()
+
+    def get(self, dart_code: str, year: int, quarter: int) -> int:
+        """사용할 발행주식수를 반환합니다. 다시 조회해야 하면 None을 반환합니다."""
+
+        period = to_period(year, quarter)
+        now = time.time()
+        with self.lock:
+            record = self.conn.execute(
+                "SELECT n_shares, source_period, checked_at FROM shares "
+                "WHERE dart_code=? AND period=?",
+                (dart_code, period),
+            ).fetchone()
+            if record is not None:
+                n_shares, source_period, checked_at = record
+                if source_period == period and n_shares > 0:
+                    return n_shares
+                if now - checked_at >= self.max_age:
+                    return None
+                if n_shares > 0:
+                    return n_shares
+
+                filled = self._reported(dart_code, period, self.fill_quarters)
+                return filled[0] if filled else 0
+
+            if self.carry_quarters <= 0:
+                return None
+
+            carried = self._reported(dart_code, period, self.carry_quarters)
+            if carried is None:
+                return None
+
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO shares VALUES (?, ?, ?, ?, ?)",
+                    (dart_code, period, carried[0], carried[1], now),
+                )
+            return carried[0]
+
+    def set(self, dart_code: str, year: int, quarter: int, n_shares: int) -> int:
+        """보고서에서 조회한 발행주식수를 저장하고 사용할 값을 반환합니다.
+
+        n_shares가 0이면 fill_quarters 분기 이내에 조회한 값을 반환합니다.
+        """
+
+        period = to_period(year, quarter)
+        with self.lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO shares VALUES (?, ?, ?, ?, ?)",
+                    (dart_code, period, int(n_shares), period, time.time()),
+                )
+            if n_shares:
+                return n_shares
+
+            filled = self._reported(dart_code, period, self.fill_quarters)
+            return filled[0] if filled else 0
+
+    def invalidate(self, dart_code: str, year: int = None, quarter: int = None) -> None:
+        """dart_code의 저장된 값을 지워 다음에 다시 조회하도록 합니다.
+
+        year와 quarter가 주어지면 그 분기의 값만 만료시켜, 이전 분기의 값을 이어
+        쓰지 않고 다시 조회하도록 합니다.
+        """
+
+        with self.lock:
+            with self.conn:
+                if year is None or quarter is None:
+                    self.conn.execute(
+                        "DELETE FROM shares WHERE dart_code=?", (dart_code,)
+                    )
+                    return
+
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO shares VALUES (?, ?, 0, -1, 0)",
+                    (dart_code, to_period(year, quarter)),
+                )
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,197 @@
+import threading
+
+import numpy as np
+
+# 표준계정코드를 사용하지 않는 계정의 account_id
+NON_STANDARD_ACCOUNT_ID = "-표준계정코드 미사용-"
+MISSING = -1
+
+
+def parse_amount(text: str):
+    """DART 금액 문자열을 int로 반환합니다. 금액이 아닌 경우 None을 반환합니다.
+
+    Example:
+        >>> parse_amount("1,234"), parse_amount("-"), parse_amount("")
+        (1234, None, None)
+    """
+
+    if text is None:
+        return None
+
+    text = text.replace(",", "").strip()
+    if not text.lstrip("-").isdigit():
+        return None
+
+    return int(text)
+
+
+class AccountCodes(object):
+    """account_id, account_nm, sj_div 문자열과 작은 정수 코드의 대응표
+
+    같은 문자열은 수집하는 동안 한 번만 저장되고, 모든 FinancialStatement는
+    문자열 대신 코드를 가집니다. 여러 worker가 동시에 등록해도 안전합니다.
+
+    Example:
+        >>> codes = AccountCodes()
+        >>> codes.intern("유동자산"), codes.intern("유동부채"), codes.intern("유동자산")
+        (0, 1, 0)
+        >>> codes.lookup("자산총계"), codes.name(1)
+        (-1, '유동부채')
+    """
+
+    def __init__(self) -> None:
+        self.codes = dict()
+        self.names = list()
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, name: str) -> int:
+        code = self.codes.get(name)
+        if code is not None:
+            return code
+
+        with self.lock:
+            code = self.codes.get(name)
+            if code is None:
+                code = len(self.names)
+                self.names.append(name)
+                self.codes[name] = code
+
+        return code
+
+    def lookup(self, name: str) -> int:
+        """등록된 name의 코드를, 없으면 MISSING(-1)을 반환합니다."""
+
+        return self.codes.get(name, MISSING)
+
+    def name(self, code: int) -> str:
+        return self.names[code]
+
+
+ACCOUNT_CODES = AccountCodes()
+
+
+class FinancialStatement(object):
+    """DART 재무제표 응답의 계정 목록을 배열로 압축한 표현
+
+    계정마다 sj_div, account_id, account_nm의 코드(AccountCodes)와 당기,
+    전기 금액만 int 배열로 남기고 응답의 dict는 버립니다. account_id 또는
+    account_nm으로 찾으면 dict 한 번으로 행을 찾습니다. 같은 이름의 계정이
+    여러 번 나오면 마지막 계정을 반환합니다.
+
+    금액이 아닌 값("-", "")은 0으로 저장되며, 당기 금액이 없는 계정은
+    당기금액을 조회할 때 없는 계정으로 취급합니다.
+
+    Example:
+        >>> fs = FinancialStatement.parse(stock_info["list"])
+        >>> fs.amount("유동자산"), fs.amount("ifrs-full_CurrentAssets")
+        (177388524000000, 177388524000000)
+        >>> fs.prior_amount("유동자산")
+        174697424000000
+    """
+
+    __slots__ = (
+        "codes",
+        "sj_divs",
+        "account_ids",
+        "account_names",
+        "current",
+        "prior",
+        "has_current",
+        "_rows",
+    )
+
+    def __init__(
+        self,
+        sj_divs: np.ndarray,
+        account_ids: np.ndarray,
+        account_names: np.ndarray,
+        current: np.ndarray,
+        prior: np.ndarray,
+        has_current: np.ndarray,
+        codes: AccountCodes = ACCOUNT_CODES,
+    ) -> None:
+        self.codes = codes
+        self.sj_divs = sj_divs
+        self.account_ids = account_ids
+        self.account_names = account_names
+        self.current = current
+        self.prior = prior
+        self.has_current = has_current
+
+        self._rows = dict()
+        for row, (account_id, account_name) in enumerate(
+            zip(account_ids.tolist(), account_names.tolist())
+        ):
+            if account_id != MISSING:
+                self._rows[account_id] = row
+            self._rows[account_name] = row
+
+    @classmethod
+    def parse(
+        cls, account_items: list, codes: AccountCodes = ACCOUNT_CODES
+    ) -> "FinancialStatement":
+        """fnlttSinglAcntAll.json 또는 fnlttMultiAcnt.json의 list를 압축합니다."""
+
+        n_items = len(account_items)
+        sj_divs = np.empty(n_items, dtype=np.int32)
+        account_ids = np.empty(n_items, dtype=np.int32)
+        account_names = np.empty(n_items, dtype=np.int32)
+        current = np.zeros(n_items, dtype=np.int64)
+        prior = np.zeros(n_items, dtype=np.int64)
+        has_current = np.zeros(n_items, dtype=bool)
+
+        for row, account_item in enumerate(account_items):
+            account_id = account_item.get("account_id", NON_STANDARD_ACCOUNT_ID)
+            sj_div = account_item.get("sj_div")
+            sj_divs[row] = codes.intern(sj_div) if sj_div else MISSING
+            account_ids[row] = (
+                MISSING
+                if account_id == NON_STANDARD_ACCOUNT_ID
+                else codes.intern(account_id)
+            )
+            account_names[row] = codes.intern(account_item["account_nm"])
+
+            amount = parse_amount(account_item.get("thstrm_amount"))
+            if amount is not None:
+                current[row] = amount
+                has_current[row] = True
+
+            amount = parse_amount(account_item.get("frmtrm_amount"))
+            if amount is not None:
+                prior[row] = amount
+
+        return cls(
+            sj_divs, account_ids, account_names, current, prior, has_current, codes
+        )
+
+    def __len__(self) -> int:
+        return len(self.current)
+
+    def __contains__(self, account: str) -> bool:
+        return self.row(account) != MISSING
+
+    def row(self, account: str) -> int:
+        """account_id 또는 account_nm에 해당하는 행의 위치를, 없으면 -1을 반환합니다."""
+
+        return self._rows.get(self.codes.lookup(account), MISSING)
+
+    def amount(self, account: str, default: int = 0) -> int:
+        """account_id 또는 account_nm에 해당하는 계정의 당기금액을 반환합니다."""
+
+        row = self.row(account)
+        if row == MISSING or not self.has_current[row]:
+            return default
+
+        return int(self.current[row])
+
+    def prior_amount(self, account: str, default: int = 0) -> int:
+        """account_id 또는 account_nm에 해당하는 계정의 전기금액을 반환합니다."""
+
+        row = self.row(account)
+        if row == MISSING:
+            return default
+
+        return int(self.prior[row])
@@ -0,0 +1,121 @@
+import os
+import json
+
+import pandas as pd
+
+
+class CorpUniverse(object):
+    """상장기업의 기업명, DART 고유번호, 종목코드, 시장구분 index
+
+    KRX 종목 목록(data/corp_list.csv)과 DART 고유번호 목록을 종목코드로 hash join
+    하여 만들며, 기업명, DART 고유번호, 종목코드로 O(1) 조회가 가능합니다.
+
+    Parameters
+    ----------
+    records (list): {'corp_name', 'dart_code', 'stock_code', 'market'}의 목록
+
+    Example
+    -------
+        >>> universe = CorpUniverse.build(market_table, corpcodes)
+        >>> universe.by_stock_code("005930")
+        {'corp_name': '삼성전자', 'dart_code': '00126380',
+         'stock_code': '005930', 'market': 'KOSPI'}
+        >>> len(universe.filter(["KOSDAQ"]))
+        1532
+    """
+
+    FIELDS = ("corp_name", "dart_code", "stock_code", "market")
+
+    def __init__(self, records: list) -> None:
+        self.records = records
+        self.name_index = {record["corp_name"]: record for record in records}
+        self.dart_code_index = {record["dart_code"]: record for record in records}
+        self.stock_code_index = {record["stock_code"]: record for record in records}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    @staticmethod
+    def read_market_table(path: str) -> pd.DataFrame:
+        """KRX 종목 목록을 읽고 숫자로만 된 단축코드를 6자리로 맞춥니다."""
+
+        data = pd.read_csv(path, encoding="cp949", dtype={"단축코드": str})
+        codes = data["단축코드"].str.strip()
+        data["단축코드"] = codes.where(~codes.str.isdigit(), codes.str.zfill(6))
+        return data
+
+    @classmethod
+    def build(cls, market_table: pd.DataFrame, corpcodes: list) -> "CorpUniverse":
+        """DART 고유번호 목록 중 KRX 종목 목록에 있는 기업만 고유번호 목록 순서대로 남깁니다."""
+
+        markets = dict(zip(market_table["단축코드"], market_table["시장구분"]))
+
+        records = list()
+        for corp_info in corpcodes:
+            market = markets.get(corp_info["stock_code"])
+            if market is None:
+                continue
+
+            records.append(
+                {
+                    "corp_name": corp_info["corp_name"],
+                    "dart_code": corp_info["corp_code"],
+                    "stock_code": corp_info["stock_code"],
+                    "market": market,
+                }
+            )
+
+        return cls(records)
+
+    def by_name(self, corp_name: str) -> dict:
+        return self.name_index.get(corp_name)
+
+    def by_dart_code(self, dart_code: str) -> dict:
+        return self.dart_code_index.get(dart_code)
+
+    def by_stock_code(self, stock_code: str) -> dict:
+        return self.stock_code_index.get(stock_code)
+
+    def filter(self, market: list) -> "CorpUniverse":
+        markets = set(market)
+        return CorpUniverse(
+            [record for record in self.records if record["market"] in markets]
+        )
+
+    def to_stock_codes(self) -> dict:
+        """DART.stock_codes 형식으로 변환합니다.
+
+        Example:
+            >>> universe.to_stock_codes()
+            {'코리아써키트': {'dart_code': '00152686', 'stock_code': '007810'}}
+        """
+
+        return {
+            record["corp_name"]: {
+                "dart_code": record["dart_code"],
+                "stock_code": record["stock_code"],
+            }
+            for record in self.records
+        }
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="UTF-8") as fh:
+            json.dump(
+                [[record[field] for field in self.FIELDS] for record in self.records],
+                fh,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CorpUniverse":
+        with open(path, "r", encoding="UTF-8") as fh:
+            rows = json.load(fh)
+
+        return cls([dict(zip(cls.FIELDS, row)) for row in rows])
@@ -0,0 +1,274 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+class WorkQueue(object):
+    """여러 host의 worker가 (기업, 분기) 단위로 나누어 수집하는 작업 queue
+
+    공유 파일시스템에 있는 SQLite 파일 하나로 동작하며 별도의 broker가 필요하지
+    않습니다. worker는 claim으로 같은 분기의 작업을 lease_seconds 동안 빌리고,
+    수집한 행을 complete로 기록합니다. worker가 중간에 멈춰 lease가 끝난 작업은
+    다른 worker가 다시 빌립니다. 결과는 (year, quarter, dart_code)마다 한 행만
+    남으므로 같은 작업이 두 번 수집되어도 merge 결과는 같습니다.
+
+    SQLite의 file lock을 사용하므로 NFS 등에서는 lock을 지원하도록 mount해야
+    하며, WAL 모드는 사용하지 않습니다.
+
+    Parameters
+    ----------
+    path (str): 공유 파일시스템에 있는 sqlite 파일의 경로
+    lease_seconds (float): claim한 작업을 다른 worker가 가져가지 못하는 시간
+    max_attempts (int): 실패한 작업을 다시 빌려주는 최대 횟수
+
+    Example
+    -------
+        >>> queue = WorkQueue("/mnt/shared/queue.sqlite3")
+        >>> queue.enqueue(account_names, DART_API.stock_codes.items(), [(2022, 1)])
+        >>> year, quarter, companies = queue.claim("host-1", 100)
+        >>> queue.complete("host-1", year, quarter, rows)
+    """
+
+    def __init__(
+        self, path: str, lease_seconds: float = 600, max_attempts: int = 5
+    ) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(
+            path, timeout=60, isolation_level=None, check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=DELETE")
+        with self._transaction():
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS items (
+                    year INTEGER NOT NULL,
+                    quarter INTEGER NOT NULL,
+                    dart_code TEXT NOT NULL,
+                    corp_name TEXT NOT NULL,
+                    stock_code TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    worker TEXT,
+                    lease_until REAL NOT NULL DEFAULT 0,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    PRIMARY KEY (year, quarter, dart_code)
+                )
+                """
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS items_state ON items (state, lease_until)"
+            )
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    year INTEGER NOT NULL,
+                    quarter INTEGER NOT NULL,
+                    dart_code TEXT NOT NULL,
+                    row TEXT NOT NULL,
+                    worker TEXT NOT NULL,
+                    finished_at REAL NOT NULL,
+                    PRIMARY KEY (year, quarter, dart_code)
+                )
+                """
+            )
+
+    @contextmanager
+    def _transaction(self):
+        """다른 process와 겹치지 않도록 쓰기 lock을 먼저 잡는 transaction"""
+
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    @property
+    def account_names(self) -> list:
+        with self.lock:
+            record = self.conn.execute(
+                "SELECT value FROM meta WHERE key='account_names'"
+            ).fetchone()
+
+        return json.loads(record[0]) if record else None
+
+    def enqueue(self, account_names: list, companies, periods) -> int:
+        """companies((corp_name, corp_code_info))와 periods((year, quarter))의
+        모든 조합을 작업으로 추가하고 새로 추가된 작업의 수를 반환합니다.
+
+        이미 있는 작업은 그대로 두므로 여러 번 실행해도 됩니다. queue의
+        account_names와 다른 account_names로는 추가할 수 없습니다.
+        """
+
+        items = [
+            (year, quarter, info["dart_code"], corp_name, info["stock_code"], PENDING)
+            for year, quarter in periods
+            for corp_name, info in companies
+        ]
+        with self._transaction() as conn:
+            record = conn.execute(
+                "SELECT value FROM meta WHERE key='account_names'"
+            ).fetchone()
+            if record is None:
+                conn.execute(
+                    "INSERT INTO meta VALUES ('account_names', ?)",
+                    (json.dumps(account_names, ensure_ascii=False),),
+                )
+            elif json.loads(record[0]) != list(account_names):
+                raise ValueError(
+                    f"Queue collects {json.loads(record[0])}, not {account_names}"
+                )
+
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO items "
+                "(year, quarter, dart_code, corp_name, stock_code, state) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                items,
+            )
+            return conn.total_changes - before
+
+    def claim(self, worker: str, n_items: int) -> tuple:
+        """같은 분기의 작업을 최대 n_items개 빌려 (year, quarter, companies)로 반환합니다.
+
+        대기 중이거나 lease가 끝난 작업을 빌리며, 빌릴 작업이 없으면 None을
+        반환합니다. companies는 (corp_name, corp_code_info)의 목록입니다.
+        lease가 끝난 작업도 실패로 세어 max_attempts번 빌려간 작업은 더 이상
+        빌려주지 않습니다.
+        """
+
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE items SET state=?, lease_until=0, error=? "
+                "WHERE state=? AND lease_until<? AND attempts>=?",
+                (FAILED, "Lease expired", LEASED, now, self.max_attempts),
+            )
+            record = conn.execute(
+                "SELECT year, quarter FROM items "
+                "WHERE state=? OR (state=? AND lease_until<?) "
+                "ORDER BY year, quarter LIMIT 1",
+                (PENDING, LEASED, now),
+            ).fetchone()
+            if record is None:
+                return None
+
+            year, quarter = record
+            rows = conn.execute(
+                "SELECT dart_code, corp_name, stock_code FROM items "
+                "WHERE year=? AND quarter=? "
+                "AND (state=? OR (state=? AND lease_until<?)) "
+                "ORDER BY dart_code LIMIT ?",
+                (year, quarter, PENDING, LEASED, now, n_items),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE items SET state=?, worker=?, lease_until=?, "
+                "attempts=attempts+1 WHERE year=? AND quarter=? AND dart_code=?",
+                [
+                    (LEASED, worker, now + self.lease_seconds, year, quarter, dart_code)
+                    for dart_code, _, _ in rows
+                ],
+            )
+
+        companies = [
+            (corp_name, {"dart_code": dart_code, "stock_code": stock_code})
+            for dart_code, corp_name, stock_code in rows
+        ]
+        return year, quarter, companies
+
+    def complete(self, worker: str, year: int, quarter: int, rows: dict) -> None:
+        """수집한 행({dart_code: row})을 기록하고 작업을 끝냅니다.
+
+        같은 작업의 결과가 이미 있으면 덮어쓰므로 여러 번 기록해도 됩니다.
+        """
+
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        year,
+                        quarter,
+                        dart_code,
+                        json.dumps(row, ensure_ascii=False),
+                        worker,
+                        now,
+                    )
+                    for dart_code, row in rows.items()
+                ],
+            )
+            conn.executemany(
+                "UPDATE items SET state=?, worker=?, error=NULL "
+                "WHERE year=? AND quarter=? AND dart_code=?",
+                [(DONE, worker, year, quarter, dart_code) for dart_code in rows],
+            )
+
+    def release(self, worker: str, year: int, quarter: int, errors: dict) -> None:
+        """worker가 실패한 작업({dart_code: 에러 메시지})을 다시 빌릴 수 있게
+        돌려 놓습니다. max_attempts번 실패한 작업은 더 이상 빌려주지 않습니다.
+        """
+
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE items SET "
+                "state=CASE WHEN attempts>=? THEN ? ELSE ? END, "
+                "lease_until=0, error=? "
+                "WHERE year=? AND quarter=? AND dart_code=? AND state=? AND worker=?",
+                [
+                    (self.max_attempts, FAILED, PENDING, error)
+                    + (year, quarter, dart_code, LEASED, worker)
+                    for dart_code, error in errors.items()
+                ],
+            )
+
+    def progress(self) -> dict:
+        """상태별 작업의 수를 반환합니다."""
+
+        with self.lock:
+            counts = dict(
+                self.conn.execute(
+                    "SELECT state, COUNT(*) FROM items GROUP BY state"
+                ).fetchall()
+            )
+
+        return {
+            state: counts.get(state, 0) for state in (PENDING, LEASED, DONE, FAILED)
+        }
+
+    def periods(self) -> list:
+        with self.lock:
+            return self.conn.execute(
+                "SELECT DISTINCT year, quarter FROM items ORDER BY year, quarter"
+            ).fetchall()
+
+    def results(self, year: int, quarter: int) -> list:
+        """분기의 수집된 행을 dart_code 순서로 반환합니다."""
+
+        with self.lock:
+            records = self.conn.execute(
+                "SELECT row FROM results WHERE year=? AND quarter=? ORDER BY dart_code",
+                (year, quarter),
+            ).fetchall()
+
+        return [json.loads(record) for (record,) in records]
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,73 @@
+import os
+import sys
+import pytest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+COLLECTOR_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(COLLECTOR_DIR)
+sys.path.append(ROOT_DIR)
+from collector._cache import ResponseCache
+
+PARAMS = {
+    "crtfc_key": "key",
+    "corp_code": "00126380",
+    "bsns_year": 2022,
+    "reprt_code": 11013,
+    "fs_div": "CFS",
+}
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    _cache = ResponseCache(str(tmp_path / "cache.sqlite3"), negative_ttl=60)
+    yield _cache
+    _cache.close()
+
+
+def test_cache_roundtrip(cache):
+    response = {"status": "000", "message": "정상", "list": [{"istc_totqy": "1"}]}
+    cache.set("fnlttSinglAcntAll.json", PARAMS, response)
+
+    assert cache.get("fnlttSinglAcntAll.json", PARAMS) == response
+    assert cache.get("fnlttSinglAcntAll.json", dict(PARAMS, fs_div="OFS")) is None
+    assert cache.get("stockTotqySttus.json", PARAMS) is None
+
+
+def test_cache_skips_errors(cache):
+    cache.set("stockTotqySttus.json", PARAMS, {"status": "020", "message": "초과"})
+    assert cache.get("stockTotqySttus.json", PARAMS) is None
+
+
+def test_cache_negative_ttl(cache):
+    response = {"status": "013", "message": "조회된 데이타가 없습니다."}
+    cache.set("stockTotqySttus.json", PARAMS, response)
+    assert cache.get("stockTotqySttus.json", PARAMS) == response
+
+    cache.negative_ttl = -1
+    assert cache.get("stockTotqySttus.json", PARAMS) is None
+
+
+def test_cache_eviction(cache):
+    cache.max_size = 1
+    cache.set("stockTotqySttus.json", PARAMS, {"status": "000", "list": []})
+    cache.set(
+        "stockTotqySttus.json", dict(PARAMS, bsns_year=2021), {"status": "000"}
+    )
+
+    assert cache.get("stockTotqySttus.json", PARAMS) is None
+
+
+def test_cache_invalidate(cache):
+    response = {"status": "000", "message": "정상", "list": list()}
+    cache.set("fnlttSinglAcntAll.json", PARAMS, response)
+    cache.set(
+        "fnlttMultiAcnt.json", dict(PARAMS, corp_code="00126380,00152686"), response
+    )
+    cache.set("fnlttSinglAcntAll.json", dict(PARAMS, corp_code="00152686"), response)
+
+    assert cache.invalidate("00126380", PARAMS["bsns_year"], "11012") == 0
+    assert cache.invalidate("00126380", PARAMS["bsns_year"], PARAMS["reprt_code"]) == 2
+    assert cache.get("fnlttSinglAcntAll.json", PARAMS) is None
+    assert cache.get(
+        "fnlttSinglAcntAll.json", dict(PARAMS, corp_code="00152686")
+    ) == response
@@ -1,7 +1,10 @@
 import os
 import sys
+import time
 import yaml
+import random
 import pytest
+import pandas as pd
 from unittest.mock import Mock, patch
 
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -9,6 +12,7 @@ COLLECTOR_DIR = os.path.dirname(TEST_DIR)
 ROOT_DIR = os.path.dirname(COLLECTOR_DIR)
 sys.path.append(ROOT_DIR)
 from collector import DART
+from collector._collector import iter_periods
 
 
 @pytest.fixture(scope="module")
@@ -122,3 +126,456 @@ def test_create_table(dart_collector):
     ]
 
     assert expected_columns == list(result_table.columns)
+
+
+def test_create_table_concurrent_keeps_order(config):
+    stock_codes = {
+        f"corp_{idx}": {"dart_code": f"{idx:08}", "stock_code": f"{idx:06}"}
+        for idx in range(20)
+    }
+
+    def finance_sheet(dart_code, year, quarter):
+        time.sleep(random.random() / 100)
+        return [{"account_nm": "유동자산", "thstrm_amount": str(int(dart_code))}]
+
+    tables = list()
+    for n_workers in (1, 4):
+        dart = DART(config, Mock(), n_workers=n_workers, max_requests_per_second=1000)
+        dart.set_stock_codes = Mock()
+        dart.stock_codes = stock_codes
+        dart.get_finance_sheet = Mock(side_effect=finance_sheet)
+        dart.get_issued_stocks = Mock(return_value=100)
+        tables.append(dart.create_table(["유동자산", "유동부채"], 2022, 1))
+
+    pd.testing.assert_frame_equal(tables[0], tables[1])
+    assert list(tables[1]["CURRENT_ASSET"]) == list(range(20))
+
+
+def test_get_issued_stocks_cached(config, tmp_path):
+    config = dict(config, ENV=dict(config["ENV"], CACHE_DIR=str(tmp_path)))
+    dart = DART(config, Mock())
+    dart.session = Mock()
+    dart.session.get.return_value.url = "stockTotqySttus.json"
+    dart.session.get.return_value.json.return_value = {
+        "status": "000",
+        "message": "정상",
+        "list": [{"istc_totqy": "5,969,782,550"}],
+    }
+
+    assert dart.get_issued_stocks("00126380", 2022, 1) == 5969782550
+    assert dart.get_issued_stocks("00126380", 2022, 1) == 5969782550
+    assert dart.session.get.call_count == 1
+
+
+def test_get_issued_stocks_carried(config, tmp_path):
+    config = dict(config, ENV=dict(config["ENV"], CACHE_DIR=str(tmp_path)))
+    dart = DART(config, Mock())
+    dart.session = Mock()
+    dart.session.get.return_value.url = "stockTotqySttus.json"
+    dart.session.get.return_value.json.side_effect = [
+        {"status": "000", "message": "정상", "list": [{"istc_totqy": "1,000"}]},
+        {"status": "000", "message": "정상", "list": [{"istc_totqy": "-"}]},
+    ]
+
+    assert dart.get_issued_stocks("00126380", 2022, 1) == 1000
+    assert dart.get_issued_stocks("00126380", 2022, 2) == 1000
+    assert dart.session.get.call_count == 1
+    assert dart.get_issued_stocks("00126380", 2022, 3) == 1000
+    assert dart.session.get.call_count == 2
+
+
+def test_create_table_batch(config):
+    dart = DART(config, Mock())
+    dart.set_stock_codes = Mock()
+    dart.stock_codes = {
+        "코리아써키트": {"dart_code": "00152686", "stock_code": "007810"},
+        "텔레필드": {"dart_code": "00560122", "stock_code": "091440"},
+    }
+    dart._get_json = Mock(
+        return_value={
+            "status": "000",
+            "message": "정상",
+            "list": [
+                {
+                    "stock_code": "007810",
+                    "fs_div": "CFS",
+                    "account_nm": "유동자산",
+                    "thstrm_amount": "596,695,845,194",
+                },
+                {
+                    "stock_code": "007810",
+                    "fs_div": "OFS",
+                    "account_nm": "유동자산",
+                    "thstrm_amount": "1",
+                },
+                {
+                    "corp_code": "00560122",
+                    "fs_div": "CFS",
+                    "account_nm": "유동부채",
+                    "thstrm_amount": "160,606,524",
+                },
+            ],
+        }
+    )
+    dart.get_finance_sheet = Mock(return_value=list())
+    dart.get_issued_stocks = Mock(return_value=0)
+
+    table = dart.create_table(["유동자산", "유동부채"], 2022, 1, batch=True)
+
+    assert dart._get_json.call_count == 1
+    assert dart.get_finance_sheet.call_count == 0
+    assert list(table["CURRENT_ASSET"]) == [596695845194, 0]
+    assert list(table["CURRENT_LIAB"]) == [0, 160606524]
+
+
+def test_get_finance_sheet_falls_back_to_ofs(config):
+    dart = DART(config, Mock())
+    ofs = {
+        "status": "000",
+        "message": "정상",
+        "list": [{"account_nm": "유동자산", "thstrm_amount": "100"}],
+    }
+    no_data = {"status": "013", "message": "조회된 데이타가 없습니다."}
+    dart._get_json = Mock(
+        side_effect=lambda url, params: ofs if params["fs_div"] == "OFS" else no_data
+    )
+
+    assert dart.get_finance_sheet("00560122", 2022, 1).amount("유동자산") == 100
+    assert dart.get_finance_sheet("00560122", 2022, 2).amount("유동자산") == 100
+    assert [call[1]["params"]["fs_div"] for call in dart._get_json.call_args_list] == [
+        "CFS",
+        "OFS",
+        "OFS",
+    ]
+
+
+def test_multi_finance_sheets_use_ofs_only_filers(config):
+    dart = DART(config, Mock())
+    dart._get_json = Mock(
+        return_value={
+            "status": "000",
+            "message": "정상",
+            "list": [
+                {
+                    "corp_code": "00560122",
+                    "fs_div": "OFS",
+                    "account_nm": "유동자산",
+                    "thstrm_amount": "100",
+                },
+            ],
+        }
+    )
+
+    sheets = dart.get_multi_finance_sheets(
+        [{"dart_code": "00560122", "stock_code": "091440"}], 2022, 1
+    )
+
+    assert sheets["00560122"].amount("유동자산") == 100
+    assert dart.fs_divs.order("00560122") == ("OFS", "CFS")
+
+
+def test_create_panel_fetches_missing_cells(config):
+    dart = DART(config, Mock(), n_workers=1)
+    dart.set_stock_codes = Mock()
+    dart.stock_codes = {
+        "코리아써키트": {"dart_code": "00152686", "stock_code": "007810"},
+        "텔레필드": {"dart_code": "00560122", "stock_code": "091440"},
+    }
+    dart.get_finance_sheet = Mock(
+        return_value=[{"account_nm": "유동자산", "thstrm_amount": "10"}]
+    )
+    dart.get_issued_stocks = Mock(return_value=100)
+
+    panel = dart.create_panel(["유동자산"], (2021, 4), (2022, 1))
+    assert dart.get_finance_sheet.call_count == 4
+    assert list(panel.index.names) == ["KRX_CODE", "YEAR", "QUARTER"]
+    assert ("091440", 2021, 4) in panel.index
+
+    panel = dart.create_panel(["유동자산"], (2021, 4), (2022, 2), panel=panel)
+    assert dart.get_finance_sheet.call_count == 6
+    assert len(panel) == 6
+
+
+def test_iter_periods():
+    assert list(iter_periods((2021, 3), (2022, 1))) == [(2021, 3), (2021, 4), (2022, 1)]
+
+
+def test_create_table_resumes_from_journal(config, tmp_path):
+    config = dict(config, ENV=dict(config["ENV"], CACHE_DIR=str(tmp_path)))
+    dart = DART(config, Mock(), n_workers=1)
+    dart.set_stock_codes = Mock()
+    dart.stock_codes = {
+        "코리아써키트": {"dart_code": "00152686", "stock_code": "007810"},
+        "텔레필드": {"dart_code": "00560122", "stock_code": "091440"},
+    }
+    dart.get_finance_sheet = Mock(
+        side_effect=[
+            [{"account_nm": "유동자산", "thstrm_amount": "10"}],
+            ConnectionError("killed"),
+        ]
+    )
+    dart.get_issued_stocks = Mock(return_value=100)
+
+    with pytest.raises(ConnectionError):
+        dart.create_table(["유동자산"], 2022, 1)
+
+    dart.get_finance_sheet = Mock(
+        return_value=[{"account_nm": "유동자산", "thstrm_amount": "20"}]
+    )
+    table = dart.create_table(["유동자산"], 2022, 1)
+
+    assert dart.get_finance_sheet.call_count == 1
+    assert list(table["CURRENT_ASSET"]) == [10, 20]
+    assert os.listdir(os.path.join(str(tmp_path), "journal")) == []
+
+
+def test_iter_table_yields_chunks(config):
+    dart = DART(config, Mock(), n_workers=3, max_requests_per_second=1000)
+    dart.set_stock_codes = Mock()
+    dart.stock_codes = {
+        f"corp_{idx}": {"dart_code": f"{idx:08}", "stock_code": f"{idx:06}"}
+        for idx in range(10)
+    }
+    dart.get_finance_sheet = Mock(
+        return_value=[{"account_nm": "유동자산", "thstrm_amount": "10"}]
+    )
+    dart.get_issued_stocks = Mock(return_value=100)
+
+    chunks = list(dart.iter_table(["유동자산"], 2022, 1, chunk_size=4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert sorted(pd.concat(chunks).index) == [f"{idx:06}" for idx in range(10)]
+
+
+def test_create_table_skips_failed_companies(config, tmp_path):
+    from error_handler import DartAPIError, QuotaExceeded
+
+    config = dict(config, ENV=dict(config["ENV"], CACHE_DIR=str(tmp_path)))
+    dart = DART(config, Mock(), n_workers=1)
+    dart.set_stock_codes = Mock()
+    dart.stock_codes = {
+        "코리아써키트": {"dart_code": "00152686", "stock_code": "007810"},
+        "텔레필드": {"dart_code": "00560122", "stock_code": "091440"},
+    }
+    dart.get_finance_sheet = Mock(
+        return_value=[{"account_nm": "유동자산", "thstrm_amount": "1"}]
+    )
+    dart.get_issued_stocks = Mock(side_effect=[100, DartAPIError("900", "오류")])
+
+    table = dart.create_table(["유동자산"], 2022, 1)
+    assert list(table.index) == ["007810"]
+    assert list(dart.failures) == [("00560122", 2022, 1)]
+
+    dart.get_issued_stocks = Mock(return_value=200)
+    table = dart.create_table(["유동자산"], 2022, 1)
+    assert list(table.index) == ["007810", "091440"]
+    assert dart.get_issued_stocks.call_count == 1
+    assert dart.failures == dict()
+
+    dart.get_issued_stocks = Mock(side_effect=QuotaExceeded("020", "요청 제한 초과"))
+    with pytest.raises(QuotaExceeded):
+        dart.create_table(["유동자산"], 2022, 1)
+
+
+def test_collection_closes_kept_journals(config, tmp_path):
+    from error_handler import DartAPIError, QuotaExceeded
+
+    config = dict(config, ENV=dict(config["ENV"], CACHE_DIR=str(tmp_path)))
+    dart = DART(config, Mock(), n_workers=1)
+    dart.set_stock_codes = Mock()
+    dart.stock_codes = {
+        "코리아써키트": {"dart_code": "00152686", "stock_code": "007810"},
+    }
+    dart.get_finance_sheet = Mock(
+        return_value=[{"account_nm": "유동자산", "thstrm_amount": "1"}]
+    )
+    journals = list()
+    _open_journal = dart._open_journal
+
+    def open_journal(*args):
+        journals.append(_open_journal(*args))
+        return journals[-1]
+
+    dart._open_journal = open_journal
+
+    dart.get_issued_stocks = Mock(side_effect=DartAPIError("900", "오류"))
+    dart.create_table(["유동자산"], 2022, 1)
+    dart.get_issued_stocks = Mock(side_effect=QuotaExceeded("020", "요청 제한 초과"))
+    with pytest.raises(QuotaExceeded):
+        list(dart.iter_table(["유동자산"], 2022, 1))
+    with pytest.raises(QuotaExceeded):
+        dart.create_panel(["유동자산"], (2022, 1), (2022, 2))
+
+    assert len(journals) == 3
+    for journal in journals:
+        assert journal.fh.closed
+        assert os.path.exists(journal.path)
+
+
+def test_refresh_table_requests_filers_only(config):
+    from datetime import date
+
+    dart = DART(config, Mock(), n_workers=1)
+    dart.set_stock_codes = Mock()
+    dart.stock_codes = {
+        "코리아써키트": {"dart_code": "00152686", "stock_code": "007810"},
+        "텔레필드": {"dart_code": "00560122", "stock_code": "091440"},
+        "삼성전자": {"dart_code": "00126380", "stock_code": "005930"},
+    }
+    disclosures = {
+        "A": [
+            {"corp_code": "00152686", "report_nm": "분기보고서 (2022.03)"},
+            {"corp_code": "00560122", "report_nm": "증권발행실적보고서"},
+            {"corp_code": "00560122", "report_nm": "반기보고서 (2022.06)"},
+            {"corp_code": "99999999", "report_nm": "분기보고서 (2022.03)"},
+        ],
+        "B": [{"corp_code": "00126380", "report_nm": "주요사항보고서(무상증자결정)"}],
+        "I": list(),
+    }
+    dart.get_disclosures = Mock(
+        side_effect=lambda start, end, pblntf_ty: disclosures[pblntf_ty]
+    )
+    dart.get_finance_sheet = Mock(
+        return_value=[{"account_nm": "유동자산", "thstrm_amount": "1"}]
+    )
+    dart.get_issued_stocks = Mock(return_value=100)
+
+    table = dart.refresh_table(
+        ["유동자산"], 2022, 1, date(2022, 1, 1), until=date(2022, 5, 16)
+    )
+
+    assert sorted(table.index) == ["005930", "007810"]
+    assert dart.get_disclosures.call_count == 6
+    assert dart.get_disclosures.call_args_list[3].args[:2] == (
+        date(2022, 4, 1),
+        date(2022, 5, 16),
+    )
+
+
+def test_refresh_table_bypasses_cached_responses(config, tmp_path):
+    from datetime import date
+
+    config = dict(config, ENV=dict(config["ENV"], CACHE_DIR=str(tmp_path)))
+    dart = DART(config, Mock(), n_workers=1)
+    dart.set_stock_codes = Mock()
+    dart.stock_codes = {
+        "코리아써키트": {"dart_code": "00152686", "stock_code": "007810"},
+    }
+    amounts = {"fnlttSinglAcntAll.json": "100", "stockTotqySttus.json": "10"}
+
+    def get(url, params):
+        response = Mock(url=url)
+        endpoint = url.rsplit("/", 1)[-1]
+        if endpoint == "fnlttSinglAcntAll.json":
+            items = [{"account_nm": "유동자산", "thstrm_amount": amounts[endpoint]}]
+        else:
+            items = [{"istc_totqy": amounts[endpoint]}]
+        response.json.return_value = {"status": "000", "message": "정상", "list": items}
+        return response
+
+    dart.session = Mock()
+    dart.session.get.side_effect = get
+
+    table = dart.create_table(["유동자산"], 2022, 1)
+    assert list(table["CURRENT_ASSET"]) == [100]
+
+    amounts = {"fnlttSinglAcntAll.json": "200", "stockTotqySttus.json": "20"}
+    dart.get_disclosures = Mock(
+        side_effect=lambda start, end, pblntf_ty: (
+            [{"corp_code": "00152686", "report_nm": "[기재정정]분기보고서 (2022.03)"}]
+            if pblntf_ty == "A"
+            else list()
+        )
+    )
+    table = dart.refresh_table(
+        ["유동자산"], 2022, 1, date(2022, 5, 1), until=date(2022, 5, 16)
+    )
+
+    assert list(table["CURRENT_ASSET"]) == [200]
+    assert list(table["ISSUED_STOCK"]) == [20]
+    assert dart.session.get.call_count == 4
+
+
+def test_refresh_table_invalidates_refreshed_period_only(config, tmp_path):
+    from datetime import date
+
+    config = dict(config, ENV=dict(config["ENV"], CACHE_DIR=str(tmp_path)))
+    dart = DART(config, Mock(), n_workers=1)
+    dart.set_stock_codes = Mock()
+    dart.stock_codes = {
+        "코리아써키트": {"dart_code": "00152686", "stock_code": "007810"},
+    }
+    response = {"status": "000", "message": "정상", "list": list()}
+    for quarter in (1, 2):
+        params = {
+            "corp_code": "00152686",
+            "bsns_year": 2022,
+            "reprt_code": config["DART"]["MAPPER"][quarter],
+        }
+        dart.cache.set("fnlttSinglAcntAll.json", params, response)
+        dart.share_counts.set("00152686", 2022, quarter, 100)
+
+    dart.get_disclosures = Mock(
+        side_effect=lambda start, end, pblntf_ty: (
+            [{"corp_code": "00152686", "report_nm": "반기보고서 (2022.06)"}]
+            if pblntf_ty == "A"
+            else list()
+        )
+    )
+    dart._collect_rows = Mock(return_value=list())
+    dart.refresh_table(["유동자산"], 2022, 1, date(2022, 8, 1), until=date(2022, 8, 16))
+
+    assert dart._collect_rows.call_args.args[0] == list()
+    assert dart.share_counts.get("00152686", 2022, 1) == 100
+
+    dart.refresh_table(["유동자산"], 2022, 2, date(2022, 8, 1), until=date(2022, 8, 16))
+
+    assert len(dart._collect_rows.call_args.args[0]) == 1
+    params["reprt_code"] = config["DART"]["MAPPER"][1]
+    assert dart.cache.get("fnlttSinglAcntAll.json", params) == response
+    params["reprt_code"] = config["DART"]["MAPPER"][2]
+    assert dart.cache.get("fnlttSinglAcntAll.json", params) is None
+    assert dart.share_counts.get("00152686", 2022, 1) == 100
+    assert dart.share_counts.get("00152686", 2022, 2) is None
+
+
+def test_iter_rows_interleaves_batch_requests(config):
+    config = dict(config, COLLECTOR=dict(config["COLLECTOR"], MULTI_BATCH_SIZE=2))
+    dart = DART(config, Mock(), n_workers=1)
+    dart.set_translation_dict()
+    dart.get_multi_finance_sheets = Mock(return_value=dict())
+    dart.get_finance_sheet = Mock(return_value=list())
+    dart.get_issued_stocks = Mock(return_value=0)
+    companies = [
+        (f"corp{idx}", {"dart_code": f"{idx:08d}", "stock_code": f"{idx:06d}"})
+        for idx in range(6)
+    ]
+
+    rows = dart._iter_rows(companies, ["유동자산"], 2022, 1, batch=True)
+    next(rows)
+    assert dart.get_multi_finance_sheets.call_count == 1
+
+    assert len(list(rows)) == 5
+    assert dart.get_multi_finance_sheets.call_count == 3
+
+
+def test_get_universe_without_cache_dir(config):
+    config = dict(config, ENV=dict(config["ENV"], CACHE_DIR=None))
+    dart = DART(config, Mock(), n_workers=1)
+    dart._get_corpcode = Mock(
+        return_value=[
+            {
+                "corp_code": "00126380",
+                "corp_name": "삼성전자",
+                "stock_code": "005930",
+                "modify_date": "20220509",
+            }
+        ]
+    )
+
+    universe = dart.get_universe()
+
+    assert universe.filter(["KOSPI"]).to_stock_codes()["삼성전자"] == {
+        "dart_code": "00126380",
+        "stock_code": "005930",
+    }
@@ -0,0 +1,118 @@
+import io
+import os
+import sys
+import pytest
+from zipfile import ZipFile
+from unittest.mock import Mock
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+COLLECTOR_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(COLLECTOR_DIR)
+sys.path.append(ROOT_DIR)
+from collector._corpcode import CorpCodeLoader
+from collector._keys import KeyPool
+from collector._scheduler import RequestScheduler
+from error_handler import DartAPIError
+
+CORPCODE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<result>
+    <list>
+        <corp_code>00126380</corp_code>
+        <corp_name>삼성전자</corp_name>
+        <stock_code>005930</stock_code>
+        <modify_date>20220509</modify_date>
+    </list>
+    <list>
+        <corp_code>00434003</corp_code>
+        <corp_name>다코</corp_name>
+        <stock_code> </stock_code>
+        <modify_date>20170630</modify_date>
+    </list>
+</result>
+"""
+
+
+def make_response(status_code=200):
+    buffer = io.BytesIO()
+    with ZipFile(buffer, "w") as zip_file:
+        zip_file.writestr("CORPCODE.xml", CORPCODE_XML)
+
+    response = Mock(status_code=status_code, content=buffer.getvalue())
+    response.headers = {"ETag": '"v1"'}
+    return response
+
+
+@pytest.fixture()
+def session():
+    _session = Mock()
+    _session.get.return_value = make_response()
+    return _session
+
+
+def test_load_keeps_listed_companies(session):
+    loader = CorpCodeLoader("key", session=session)
+
+    assert loader.load() == [
+        {
+            "corp_code": "00126380",
+            "corp_name": "삼성전자",
+            "stock_code": "005930",
+            "modify_date": "20220509",
+        }
+    ]
+
+
+def test_load_reuses_stored_zip(session, tmp_path):
+    loader = CorpCodeLoader("key", cache_dir=str(tmp_path), session=session)
+    loader.load()
+    loader.load()
+    assert session.get.call_count == 1
+
+    loader.max_age = -1
+    session.get.return_value = make_response(status_code=304)
+    assert len(loader.load()) == 1
+    assert session.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+def test_load_keeps_stored_zip_on_error_response(session, tmp_path):
+    error = Mock(status_code=200, headers=dict())
+    error.content = (
+        "<?xml version='1.0' encoding='UTF-8'?><result><status>020</status>"
+        "<message>요청 제한을 초과하였습니다.</message></result>"
+    ).encode()
+
+    loader = CorpCodeLoader("key", cache_dir=str(tmp_path), session=session)
+    session.get.return_value = error
+    with pytest.raises(DartAPIError) as raised:
+        loader.load()
+    assert raised.value.status == "020"
+    assert not os.path.exists(loader.zip_path)
+
+    session.get.return_value = make_response()
+    loader.load()
+
+    loader._write_meta({"etag": '"v1"', "checked_at": 0})
+    session.get.return_value = error
+    assert len(loader.load()) == 1
+    assert len(loader.load()) == 1
+    assert session.get.call_count == 4
+    assert loader._read_meta()["checked_at"] == 0
+
+
+def test_load_uses_key_pool(session):
+    quota = Mock(status_code=200, headers=dict())
+    quota.content = (
+        "<?xml version='1.0' encoding='UTF-8'?><result><status>020</status>"
+        "<message>요청 제한을 초과하였습니다.</message></result>"
+    ).encode()
+    session.get.side_effect = [quota, make_response()]
+    key_pool = KeyPool(["key1", "key2"], logger=Mock())
+    scheduler = RequestScheduler(logger=Mock(), key_pool=key_pool)
+
+    loader = CorpCodeLoader("key1", session=session, scheduler=scheduler)
+
+    assert len(loader.load()) == 1
+    keys = [call.kwargs["params"]["crtfc_key"] for call in session.get.call_args_list]
+    assert keys == ["key1", "key2"]
+    assert key_pool.available() == ["key2"]
+    assert key_pool.counts == {"key1": 1, "key2": 1}
@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+COLLECTOR_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(COLLECTOR_DIR)
+sys.path.append(ROOT_DIR)
+from collector._statement import AccountCodes, FinancialStatement
+from collector._extraction import AccountSpec, ExtractionPlan, read_account_specs
+
+
+def load_samsung_statement(codes: AccountCodes) -> FinancialStatement:
+    with open(
+        os.path.join(TEST_DIR, "data", "samsung_2019_1Q.txt"), encoding="UTF-8"
+    ) as fh:
+        return FinancialStatement.parse(json.loads("[" + fh.read() + "]"), codes)
+
+
+def test_account_spec_parse_keeps_two_field_lines():
+    spec = AccountSpec.parse("유동자산:CURRENT_ASSET\n")
+
+    assert (spec.name, spec.column) == ("유동자산", "CURRENT_ASSET")
+    assert spec.sj_divs == spec.account_ids == spec.synonyms == ()
+
+
+def test_plan_matches_ids_synonyms_and_statement():
+    codes = AccountCodes()
+    specs = read_account_specs(os.path.join(COLLECTOR_DIR, "kr2eng.txt"))
+    plan = ExtractionPlan(
+        ["유동자산", "영업이익", "매출액", "당기순이익", "기타유동자산", "없는계정"],
+        specs,
+        codes,
+    )
+
+    assert plan.extract(load_samsung_statement(codes)) == {
+        "유동자산": 177388524000000,
+        "영업이익": 6233282000000,
+        "매출액": 52385546000000,
+        "당기순이익": 5043585000000,
+        "기타유동자산": 2987497000000,
+    }
+
+
+def test_plan_prefers_account_id_over_name():
+    codes = AccountCodes()
+    spec = AccountSpec("유동자산", "CURRENT_ASSET", ["BS"], ["ifrs-full_CurrentAssets"])
+    plan = ExtractionPlan(["유동자산"], {"유동자산": spec}, codes)
+
+    fs = FinancialStatement.parse(
+        [
+            {"sj_div": "BS", "account_nm": "유동자산", "thstrm_amount": "1"},
+            {
+                "sj_div": "BS",
+                "account_id": "ifrs-full_CurrentAssets",
+                "account_nm": "유동자산합계",
+                "thstrm_amount": "2",
+            },
+            {
+                "sj_div": "IS",
+                "account_id": "ifrs-full_CurrentAssets",
+                "account_nm": "유동자산",
+                "thstrm_amount": "3",
+            },
+        ],
+        codes,
+    )
+
+    assert plan.extract(fs) == {"유동자산": 2}
+    assert plan.extract([{"account_nm": "유동자산", "thstrm_amount": "4"}]) == {
+        "유동자산": 4
+    }
@@ -0,0 +1,38 @@
+import os
+import sys
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+COLLECTOR_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(COLLECTOR_DIR)
+sys.path.append(ROOT_DIR)
+from collector._fsdiv import StatementTypeResolver
+
+
+def test_resolver_learns_across_runs(tmp_path):
+    path = str(tmp_path / "fs_div.json")
+    resolver = StatementTypeResolver(path)
+    assert resolver.order("00152686") == ("CFS", "OFS")
+
+    resolver.learn("00152686", "OFS")
+    resolver.learn("00126380", "CFS")
+    resolver.save()
+
+    resolver = StatementTypeResolver(path)
+    assert resolver.order("00152686") == ("OFS", "CFS")
+    assert resolver.order("00126380") == ("CFS", "OFS")
+    assert StatementTypeResolver(path, preferred="OFS").order("00126380") == (
+        "OFS",
+        "CFS",
+    )
+
+
+def test_resolver_forgets(tmp_path):
+    resolver = StatementTypeResolver(str(tmp_path / "fs_div.json"))
+    resolver.learn("00152686", "OFS")
+
+    resolver.learn("00152686", "CFS")
+    assert resolver.order("00152686") == ("CFS", "OFS")
+
+    resolver.learn("00152686", "OFS")
+    resolver.max_age = 0
+    assert resolver.order("00152686") == ("CFS", "OFS")
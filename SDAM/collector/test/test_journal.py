@@ -0,0 +1,27 @@
+import os
+import sys
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+COLLECTOR_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(COLLECTOR_DIR)
+sys.path.append(ROOT_DIR)
+from collector._journal import CheckpointJournal
+
+
+def test_journal_ignores_truncated_line(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = CheckpointJournal(path)
+    journal.append("00152686", ["코리아써키트", "007810", "00152686", 1])
+    journal.fh.write('["00560122", ["텔레')
+    journal.fh.close()
+
+    journal = CheckpointJournal(path)
+    journal.append("00560122", ["텔레필드", "091440", "00560122", 2])
+
+    assert journal.load() == {
+        "00152686": ["코리아써키트", "007810", "00152686", 1],
+        "00560122": ["텔레필드", "091440", "00560122", 2],
+    }
+
+    journal.remove()
+    assert not os.path.exists(path)
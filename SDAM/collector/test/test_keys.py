@@ -0,0 +1,66 @@
+import os
+import sys
+import json
+from unittest.mock import Mock
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+COLLECTOR_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(COLLECTOR_DIR)
+sys.path.append(ROOT_DIR)
+from collector._keys import KeyPool, key_id
+from collector._scheduler import RequestScheduler
+
+OK = {"status": "000", "message": "정상", "list": []}
+QUOTA = {"status": "020", "message": "요청 제한 초과"}
+
+
+def test_key_pool_spreads_requests():
+    pool = KeyPool(["a", "b", "c"], logger=Mock())
+
+    keys = [pool.acquire() for _ in range(6)]
+
+    assert sorted(keys) == ["a", "a", "b", "b", "c", "c"]
+
+
+def test_key_pool_respects_daily_quota_across_runs(tmp_path):
+    path = str(tmp_path / "key_usage.json")
+    pool = KeyPool(["a", "b"], path=path, daily_quota=2, logger=Mock())
+    assert [pool.acquire() for _ in range(3)] == ["a", "b", "a"]
+    pool.save()
+
+    with open(path) as fh:
+        assert json.load(fh)["counts"] == {key_id("a"): 2, key_id("b"): 1}
+
+    pool = KeyPool(["a", "b"], path=path, daily_quota=2, logger=Mock())
+    assert pool.acquire() == "b"
+    assert pool.acquire() is None
+
+
+def test_key_pool_forgets_previous_day(tmp_path):
+    path = str(tmp_path / "key_usage.json")
+    with open(path, "w") as fh:
+        json.dump(
+            {
+                "date": "2000-01-01",
+                "counts": {key_id("a"): 5},
+                "exhausted": [key_id("a")],
+            },
+            fh,
+        )
+
+    pool = KeyPool(["a"], path=path, daily_quota=5, logger=Mock())
+
+    assert pool.acquire() == "a"
+
+
+def test_scheduler_fails_over_to_next_key():
+    pool = KeyPool(["a", "b"], logger=Mock())
+    responses = {"a": QUOTA, "b": OK}
+    send = Mock(side_effect=lambda key: responses[key])
+
+    scheduler = RequestScheduler(logger=Mock(), key_pool=pool)
+
+    assert scheduler.run(send) == OK
+    assert scheduler.run(send) == OK
+    assert [call.args[0] for call in send.call_args_list] == ["a", "b", "b"]
+    assert pool.available() == ["b"]
@@ -0,0 +1,71 @@
+import os
+import sys
+import pytest
+import requests
+from unittest.mock import Mock
+from datetime import datetime
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+COLLECTOR_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(COLLECTOR_DIR)
+sys.path.append(ROOT_DIR)
+from error_handler import DartAPIError, CollectionAborted, QuotaExceeded
+from collector._scheduler import KST, RequestScheduler, seconds_until_quota_reset
+
+OK = {"status": "000", "message": "정상", "list": []}
+
+
+def make_scheduler(**kwargs) -> RequestScheduler:
+    return RequestScheduler(logger=Mock(), backoff_base=0.001, **kwargs)
+
+
+def test_retries_transient_errors():
+    send = Mock(
+        side_effect=[
+            requests.ConnectionError("reset"),
+            {"status": "800", "message": "시스템 점검"},
+            OK,
+        ]
+    )
+
+    assert make_scheduler().run(send) == OK
+    assert send.call_count == 3
+
+
+def test_gives_up_after_max_retries():
+    send = Mock(return_value={"status": "900", "message": "정의되지 않은 오류"})
+
+    with pytest.raises(DartAPIError) as error:
+        make_scheduler(max_retries=2).run(send)
+
+    assert error.value.status == "900"
+    assert send.call_count == 3
+
+
+def test_fails_request_without_retry():
+    send = Mock(return_value={"status": "100", "message": "필드의 부적절한 값"})
+    scheduler = make_scheduler()
+
+    with pytest.raises(DartAPIError):
+        scheduler.run(send)
+
+    assert send.call_count == 1
+    assert scheduler.run(Mock(return_value=OK)) == OK
+
+
+def test_quota_exceeded_stops_every_request():
+    scheduler = make_scheduler()
+
+    with pytest.raises(QuotaExceeded):
+        scheduler.run(Mock(return_value={"status": "020", "message": "요청 제한 초과"}))
+
+    send = Mock(return_value=OK)
+    with pytest.raises(CollectionAborted):
+        scheduler.run(send)
+    assert send.call_count == 0
+
+
+def test_seconds_until_quota_reset():
+    now = datetime(2022, 5, 13, 23, 0, tzinfo=KST)
+
+    assert seconds_until_quota_reset(now) == 3600
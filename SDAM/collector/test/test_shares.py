@@ -0,0 +1,51 @@
+import os
+import sys
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+COLLECTOR_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(COLLECTOR_DIR)
+sys.path.append(ROOT_DIR)
+from collector._shares import ShareCountStore
+
+
+def test_carry_forward(tmp_path):
+    store = ShareCountStore(str(tmp_path / "shares.sqlite3"), carry_quarters=1)
+
+    assert store.get("00126380", 2022, 1) is None
+    assert store.set("00126380", 2022, 1, 5969782550) == 5969782550
+    assert store.get("00126380", 2022, 1) == 5969782550
+    assert store.get("00126380", 2022, 2) == 5969782550
+    assert store.get("00126380", 2022, 3) is None
+    assert store.get("00126380", 2021, 4) is None
+
+
+def test_fill_zero_and_expire(tmp_path):
+    store = ShareCountStore(
+        str(tmp_path / "shares.sqlite3"), carry_quarters=0, fill_quarters=4
+    )
+    store.set("00126380", 2021, 4, 100)
+
+    assert store.get("00126380", 2022, 1) is None
+    assert store.set("00126380", 2022, 1, 0) == 100
+    assert store.get("00126380", 2022, 1) == 100
+    assert store.set("00126380", 2023, 1, 0) == 0
+
+    store.max_age = 0
+    assert store.get("00126380", 2022, 1) is None
+    assert store.get("00126380", 2021, 4) == 100
+
+
+def test_invalidate(tmp_path):
+    path = str(tmp_path / "shares.sqlite3")
+    store = ShareCountStore(path)
+    store.set("00126380", 2022, 1, 100)
+    store.set("00152686", 2022, 1, 200)
+    store.close()
+
+    store = ShareCountStore(path)
+    store.invalidate("00126380", 2022, 2)
+    assert store.get("00126380", 2022, 1) == 100
+    assert store.get("00126380", 2022, 2) is None
+    store.invalidate("00126380")
+    assert store.get("00126380", 2022, 1) is None
+    assert store.get("00152686", 2022, 1) == 200
@@ -0,0 +1,62 @@
+import os
+import sys
+import json
+import tracemalloc
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+COLLECTOR_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(COLLECTOR_DIR)
+sys.path.append(ROOT_DIR)
+from collector._statement import AccountCodes, FinancialStatement, parse_amount
+
+
+def load_samsung_items() -> list:
+    with open(
+        os.path.join(TEST_DIR, "data", "samsung_2019_1Q.txt"), encoding="UTF-8"
+    ) as fh:
+        return json.loads("[" + fh.read() + "]")
+
+
+def test_statement_lookup_by_name_and_id():
+    fs = FinancialStatement.parse(load_samsung_items(), AccountCodes())
+
+    assert fs.amount("유동자산") == 177388524000000
+    assert fs.amount("ifrs_CurrentAssets") == 177388524000000
+    assert fs.prior_amount("유동자산") == 174697424000000
+    assert "없는계정" not in fs
+    assert fs.amount("없는계정", default=None) is None
+
+
+def test_statement_skips_non_numeric_amounts():
+    fs = FinancialStatement.parse(
+        [
+            {"account_nm": "유동자산", "thstrm_amount": "1,234", "frmtrm_amount": "-"},
+            {"account_nm": "유동부채", "thstrm_amount": ""},
+        ],
+        AccountCodes(),
+    )
+
+    assert fs.amount("유동자산") == 1234
+    assert fs.prior_amount("유동자산") == 0
+    assert "유동부채" in fs
+    assert fs.amount("유동부채", default=None) is None
+    assert parse_amount("-1,000") == -1000
+
+
+def test_statement_is_smaller_than_response():
+    items = load_samsung_items()
+    codes = AccountCodes()
+    FinancialStatement.parse(items, codes)
+
+    tracemalloc.start()
+    raw = json.loads(json.dumps(items))
+    raw_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    fs = FinancialStatement.parse(raw, codes)
+    fs_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(fs) == len(items)
+    assert fs_size * 10 < raw_size
@@ -0,0 +1,54 @@
+import os
+import sys
+import yaml
+import pytest
+import pandas as pd
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+COLLECTOR_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(COLLECTOR_DIR)
+sys.path.append(ROOT_DIR)
+from collector import CorpUniverse
+
+CORPCODES = [
+    {"corp_code": "00152686", "corp_name": "코리아써키트", "stock_code": "007810"},
+    {"corp_code": "00434003", "corp_name": "다코", "stock_code": "999999"},
+    {"corp_code": "00560122", "corp_name": "텔레필드", "stock_code": "091440"},
+]
+
+
+@pytest.fixture(scope="module")
+def universe():
+    market_table = pd.DataFrame(
+        {"단축코드": ["007810", "091440"], "시장구분": ["KOSPI", "KOSDAQ"]}
+    )
+    return CorpUniverse.build(market_table, CORPCODES)
+
+
+def test_build_and_lookup(universe):
+    assert len(universe) == 2
+    assert universe.by_stock_code("091440")["corp_name"] == "텔레필드"
+    assert universe.by_dart_code("00152686")["market"] == "KOSPI"
+    assert universe.by_name("다코") is None
+    assert universe.filter(["KOSDAQ"]).to_stock_codes() == {
+        "텔레필드": {"dart_code": "00560122", "stock_code": "091440"}
+    }
+
+
+def test_save_and_load(universe, tmp_path):
+    path = str(tmp_path / "universe.json")
+    universe.save(path)
+
+    assert CorpUniverse.load(path).records == universe.records
+
+
+def test_read_market_table():
+    with open(os.path.join(ROOT_DIR, "config.yaml")) as f:
+        config = yaml.safe_load(f)
+
+    data = CorpUniverse.read_market_table(
+        os.path.join(COLLECTOR_DIR, config["DATA"]["MARKET"])
+    )
+
+    assert "098120" in set(data["단축코드"])
+    assert (data["단축코드"].str.len() == 6).all()
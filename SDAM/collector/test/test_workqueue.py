@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import yaml
+from unittest.mock import Mock
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+COLLECTOR_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(COLLECTOR_DIR)
+sys.path.append(ROOT_DIR)
+from collector import DART, WorkQueue
+from error_handler import DartAPIError
+
+COMPANIES = [
+    (f"corp_{idx}", {"dart_code": f"{idx:08}", "stock_code": f"{idx:06}"})
+    for idx in range(5)
+]
+
+
+def make_dart(tmp_path) -> DART:
+    with open(os.path.join(ROOT_DIR, "config.yaml")) as f:
+        config = yaml.safe_load(f)
+
+    dart = DART(config, Mock(), n_workers=1)
+    dart.stock_codes = dict(COMPANIES)
+    dart.set_stock_codes = Mock()
+    dart.get_finance_sheet = Mock(
+        side_effect=lambda dart_code, year, quarter: [
+            {"account_nm": "유동자산", "thstrm_amount": str(int(dart_code) + year)}
+        ]
+    )
+    dart.get_issued_stocks = Mock(return_value=100)
+    return dart
+
+
+def test_claim_reclaims_expired_lease(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite3"), lease_seconds=0.05)
+    assert queue.enqueue(["유동자산"], COMPANIES, [(2022, 1)]) == 5
+    assert queue.enqueue(["유동자산"], COMPANIES, [(2022, 1)]) == 0
+
+    year, quarter, companies = queue.claim("dead-worker", 3)
+    assert (year, quarter, len(companies)) == (2022, 1, 3)
+    _, _, others = queue.claim("worker", 10)
+    queue.complete("worker", 2022, 1, {info["dart_code"]: [1] for _, info in others})
+    assert queue.claim("worker", 10) is None
+
+    time.sleep(0.1)
+    assert queue.claim("worker", 10)[2] == companies
+
+
+def test_claim_fails_items_leased_max_attempts(tmp_path):
+    queue = WorkQueue(
+        str(tmp_path / "queue.sqlite3"), lease_seconds=0.05, max_attempts=2
+    )
+    queue.enqueue(["유동자산"], COMPANIES[:1], [(2022, 1)])
+
+    for _ in range(2):
+        assert len(queue.claim("dead-worker", 10)[2]) == 1
+        time.sleep(0.1)
+
+    assert queue.claim("worker", 10) is None
+    assert queue.progress()["failed"] == 1
+
+
+def test_distributed_collection_matches_create_panel(tmp_path):
+    path = str(tmp_path / "queue.sqlite3")
+    dart = make_dart(tmp_path)
+    dart.enqueue_work(WorkQueue(path), ["유동자산"], (2021, 4), (2022, 1))
+
+    workers = [make_dart(tmp_path) for _ in range(2)]
+    workers[1].get_issued_stocks = Mock(
+        side_effect=[DartAPIError("900", "오류")] + [100] * 10
+    )
+    queue = WorkQueue(path)
+    assert workers[1].work(queue, "host-1", chunk_size=2) == 10
+    assert workers[0].work(WorkQueue(path), "host-0", chunk_size=2) == 0
+    assert queue.progress()["done"] == 10
+
+    panel = dart.merge_work(WorkQueue(path))
+    expected = make_dart(tmp_path).create_panel(["유동자산"], (2021, 4), (2022, 1))
+
+    assert (panel.values == expected.values).all()
+    assert list(panel.index) == list(expected.index)
+    assert panel.equals(dart.merge_work(WorkQueue(path)))
+
+
+def test_work_releases_failed_items(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite3"))
+    queue.enqueue(["유동자산"], COMPANIES, [(2022, 1)])
+
+    dart = make_dart(tmp_path)
+    dart.get_issued_stocks = Mock(
+        side_effect=[DartAPIError("900", "오류")] + [100] * 9
+    )
+
+    assert dart.work(queue, "host-0") == 5
+    assert queue.progress()["done"] == 5
+    assert dart.get_issued_stocks.call_count == 6
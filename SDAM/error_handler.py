@@ -1,3 +1,25 @@
 class AccountNotFound(KeyError):
     def __init__(self, msg):
         self.msg = msg
+
+
+class DartAPIError(Exception):
+    """DART API가 요청을 처리하지 못한 경우
+
+    Args:
+        status (str): DART API의 에러 및 정보 코드. 응답을 받지 못한 경우 None
+        msg (str): 에러 메시지
+    """
+
+    def __init__(self, status, msg):
+        super().__init__(f"[{status}] {msg}")
+        self.status = status
+        self.msg = msg
+
+
+class CollectionAborted(DartAPIError):
+    """다시 요청해도 처리되지 않아 수집을 멈춰야 하는 경우 (인증키 오류 등)"""
+
+
+class QuotaExceeded(CollectionAborted):
+    """인증키의 요청 한도를 넘은 경우 (status 020)"""
@@ -1,3 +1,5 @@
 from ._indicator import Indicator
+from ._registry import IndicatorRegistry, INDICATORS
+from .enterprise_value import EnterpriseValue
 
-__all__ = ["Indicator"]
+__all__ = ["Indicator", "IndicatorRegistry", "INDICATORS", "EnterpriseValue"]
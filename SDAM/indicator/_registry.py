@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+
+class IndicatorSpec:
+    """An indicator computed column-wise from other columns or indicators
+
+    Args:
+        name (str): column name of the indicator
+        inputs (tuple): table columns or indicator names passed to func in order
+        func (callable): function of numpy arrays returning a numpy array
+    """
+
+    def __init__(self, name: str, inputs: tuple, func):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.func = func
+
+
+class IndicatorRegistry:
+    """Indicators declaring their inputs, evaluated in dependency order
+
+    Requested indicators are planned in topological order of their inputs and
+    evaluated in one column-wise pass over the table. Each intermediate
+    indicator is computed only once, however many indicators use it. Each
+    table column is read, and widened to int64 if it holds integers, only once
+    before it is passed to the indicators. Only the requested indicators are
+    added to the table.
+
+    Example:
+        >>> registry = IndicatorRegistry()
+        >>> @registry.register("NCAV", ["CURRENT_ASSET", "TOTAL_LIAB"])
+        ... def net_current_asset(current_asset, total_liab):
+        ...     return current_asset - total_liab
+        >>> registry.evaluate(table, ["NCAV"])
+    """
+
+    def __init__(self):
+        self.specs = dict()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.specs
+
+    def copy(self) -> "IndicatorRegistry":
+        registry = IndicatorRegistry()
+        registry.specs.update(self.specs)
+        return registry
+
+    def register(self, name: str, inputs: list):
+        def decorator(func):
+            self.specs[name] = IndicatorSpec(name, inputs, func)
+            return func
+
+        return decorator
+
+    def plan(self, names: list) -> list:
+        """Return specs needed for names, each after the specs it depends on"""
+
+        planned = dict()
+        visiting = set()
+
+        def visit(name):
+            if name in planned or name not in self.specs:
+                return
+            if name in visiting:
+                raise ValueError(f"Circular dependency of indicator {name}")
+
+            visiting.add(name)
+            for input_name in self.specs[name].inputs:
+                visit(input_name)
+            visiting.remove(name)
+            planned[name] = self.specs[name]
+
+        for name in names:
+            if name not in self.specs:
+                raise KeyError(f"Indicator not registered: {name}")
+            visit(name)
+
+        return list(planned.values())
+
+    def evaluate(self, table: pd.DataFrame, names: list) -> pd.DataFrame:
+        columns = dict()
+        for spec in self.plan(names):
+            arrays = list()
+            for input_name in spec.inputs:
+                if input_name not in columns:
+                    columns[input_name] = as_array(table[input_name])
+                arrays.append(columns[input_name])
+            columns[spec.name] = spec.func(*arrays)
+
+        for name in names:
+            table[name] = columns[name]
+
+        return table
+
+
+def as_array(column: pd.Series) -> np.ndarray:
+    """column as a numpy array, with integer columns widened to int64 once"""
+
+    array = column.to_numpy()
+    if array.dtype.kind in "iu":
+        return array.astype(np.int64, copy=False)
+    return array
+
+
+def divide_or_zero(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """numerator / denominator, with 0 where denominator is 0"""
+
+    result = np.zeros(len(numerator), dtype=np.float64)
+    np.divide(numerator, denominator, out=result, where=denominator != 0)
+    return result
+
+
+INDICATORS = IndicatorRegistry()
+
+
+@INDICATORS.register("TOTAL_LIAB", ["CURRENT_LIAB", "NON_CURRENT_LIAB"])
+def total_liabilities(current_liab, non_current_liab):
+    return current_liab + non_current_liab
+
+
+@INDICATORS.register("NET_WORKING_CAPITAL", ["CURRENT_ASSET", "CURRENT_LIAB"])
+def net_working_capital(current_asset, current_liab):
+    return current_asset - current_liab
+
+
+@INDICATORS.register("MARKET_VALUE", ["STOCK_PRICE", "ISSUED_STOCK"])
+def market_value(stock_price, issued_stock):
+    return stock_price * issued_stock
+
+
+@INDICATORS.register("NCAV", ["CURRENT_ASSET", "TOTAL_LIAB"])
+def net_current_asset(current_asset, total_liab):
+    return current_asset - total_liab
+
+
+@INDICATORS.register("NCAV_SHARE", ["NCAV", "MARKET_VALUE"])
+def net_current_asset_per_share(ncav, market_value):
+    return divide_or_zero(ncav, market_value)
@@ -1,3 +1,8 @@
+import pandas as pd
+
+from ._registry import IndicatorRegistry, INDICATORS, divide_or_zero
+
+
 class EnterpriseValue:
     def __init__(self, config):
         self.config = config
@@ -28,4 +33,65 @@ class EnterpriseValue:
         return share_holder_value / issued_shares
 
     def buffer_safety_margin(self, value_per_share: int) -> float:
-        return
+        """
+        안전마진을 둔 주당 기업가치를 계산함. 주당 기업가치의 배열도 받음.
+
+        Args:
+            value_per_share (int): 주당 기업가치
+        """
+
+        return value_per_share * self.config["NON_CURRNET_ASSET_DISCOUNT"]
+
+    def register(self, registry: IndicatorRegistry) -> IndicatorRegistry:
+        """
+        주당 기업가치(EV_SHARE)와 안전마진을 둔 주당 기업가치(EV_SHARE_BUFFERED)를
+        registry에 등록함. 발행주식수가 0인 행은 0으로 채움.
+        자산가치는 registry의 순운전자본(NET_WORKING_CAPITAL)에서 유동부채의 10%를
+        더 빼서 계산하므로 registry는 INDICATORS처럼 NET_WORKING_CAPITAL을 가져야 함.
+
+        Args:
+            registry (IndicatorRegistry): 지표를 등록할 registry
+        """
+
+        discount = self.config["NON_CURRNET_ASSET_DISCOUNT"]
+
+        @registry.register(
+            "EV_SHARE",
+            [
+                "OPERATING_PROFIT",
+                "NET_WORKING_CAPITAL",
+                "CURRENT_LIAB",
+                "NON_CURRENT_ASSET",
+                "ISSUED_STOCK",
+            ],
+        )
+        def value_per_share(
+            operating_profit,
+            net_working_capital,
+            current_liabilities,
+            non_current_asset,
+            issued_shares,
+        ):
+            business_value = operating_profit * 10
+            asset_value = net_working_capital - current_liabilities * 0.1
+            share_holder_value = (
+                business_value - asset_value + non_current_asset * discount
+            )
+            return divide_or_zero(share_holder_value, issued_shares)
+
+        registry.register("EV_SHARE_BUFFERED", ["EV_SHARE"])(self.buffer_safety_margin)
+        return registry
+
+    def calculate_table(self, table: pd.DataFrame) -> pd.DataFrame:
+        """
+        테이블(또는 패널)의 모든 행에 대해 주당 기업가치(EV_SHARE)와 안전마진을 둔
+        주당 기업가치(EV_SHARE_BUFFERED)를 열 단위로 계산하여 추가함.
+        발행주식수가 0인 행은 0으로 채움.
+
+        Args:
+            table (pd.DataFrame): OPERATING_PROFIT, CURRENT_ASSET, CURRENT_LIAB,
+                NON_CURRENT_ASSET, ISSUED_STOCK 열을 가진 테이블
+        """
+
+        registry = self.register(INDICATORS.copy())
+        return registry.evaluate(table, ["EV_SHARE", "EV_SHARE_BUFFERED"])
@@ -0,0 +1,47 @@
+import os
+import sys
+import yaml
+import pytest
+import pandas as pd
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+INDICATOR_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(INDICATOR_DIR)
+sys.path.append(ROOT_DIR)
+
+from indicator import EnterpriseValue
+
+
+@pytest.fixture(scope="module")
+def enterprise_value():
+    with open(os.path.join(ROOT_DIR, "config.yaml")) as f:
+        config = yaml.safe_load(f)
+    return EnterpriseValue(config["EVAL"])
+
+
+def test_calculate_table_matches_calculate(enterprise_value):
+    table = pd.DataFrame(
+        {
+            "OPERATING_PROFIT": [14121400000000, 5000000, -300000],
+            "CURRENT_ASSET": [218163185000000, 761374506, 1000],
+            "CURRENT_LIAB": [82004838000000, 370201176, 1000],
+            "NON_CURRENT_ASSET": [233000000000000, 121180026, 1000],
+            "ISSUED_STOCK": [5969782550, 44000000, 0],
+        }
+    )
+
+    result = enterprise_value.calculate_table(table)
+
+    for idx in range(2):
+        row = table.iloc[idx]
+        expected = enterprise_value.calculate(
+            row["OPERATING_PROFIT"],
+            row["CURRENT_ASSET"],
+            row["CURRENT_LIAB"],
+            row["NON_CURRENT_ASSET"],
+            row["ISSUED_STOCK"],
+        )
+        assert result["EV_SHARE"].iloc[idx] == pytest.approx(expected)
+        assert result["EV_SHARE_BUFFERED"].iloc[idx] == pytest.approx(expected * 0.8)
+
+    assert result["EV_SHARE"].iloc[2] == 0
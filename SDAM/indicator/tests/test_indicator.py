@@ -0,0 +1,64 @@
+import os
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import Mock
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+INDICATOR_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(INDICATOR_DIR)
+sys.path.append(ROOT_DIR)
+
+from indicator import Indicator
+
+
+@pytest.fixture()
+def table():
+    return pd.DataFrame(
+        {
+            "KRX_CODE": ["005930", "950130", "900070", "000000"],
+            "CORP_NAME": ["삼성전자", "엑세스바이오", "글로벌에스엠", "GRT"],
+            "CURRENT_ASSET": [218163185000000, 761374506, 550811241, 0],
+            "CURRENT_LIAB": [82004838000000, 370201176, 160606524, 0],
+            "NON_CURRENT_ASSET": [233000000000000, 121180026, 258756994, 0],
+            "NON_CURRENT_LIAB": [19019542000000, 34423861, 71183918, 0],
+            "ISSUED_STOCK": [5969782550, 0, 44000000, 0],
+            "STOCK_PRICE": [66500, 7000, 0, 0],
+        }
+    ).set_index("KRX_CODE")
+
+
+def indicate_by_row(table):
+    """Former row-wise Indicator.indicate"""
+
+    table["NCAV"] = table.apply(
+        lambda x: x["CURRENT_ASSET"] - (x["CURRENT_LIAB"] + x["NON_CURRENT_LIAB"]),
+        axis=1,
+    )
+    table["NCAV_SHARE"] = table.apply(
+        lambda x: 0
+        if x["STOCK_PRICE"] == 0 or x["ISSUED_STOCK"] == 0
+        else x["NCAV"] / (x["STOCK_PRICE"] * x["ISSUED_STOCK"]),
+        axis=1,
+    )
+    return table
+
+
+def test_indicate_matches_row_wise(table):
+    indicator = Indicator(Mock())
+
+    expected = indicate_by_row(table.copy())
+    result = indicator.indicate(table.copy())
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert result["NCAV"].dtype == np.int64
+
+
+def test_indicate_keeps_int64_exact(table):
+    table["CURRENT_ASSET"] = 2**62
+    table["CURRENT_LIAB"] = 1
+
+    result = Indicator(Mock()).indicate(table)
+
+    assert result["NCAV"].iloc[0] == 2**62 - 1 - 19019542000000
@@ -0,0 +1,87 @@
+import os
+import sys
+import yaml
+import pytest
+import pandas as pd
+from unittest.mock import Mock
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+INDICATOR_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(INDICATOR_DIR)
+sys.path.append(ROOT_DIR)
+
+from indicator import IndicatorRegistry, INDICATORS, EnterpriseValue
+
+
+def test_plan_orders_dependencies():
+    names = [spec.name for spec in INDICATORS.plan(["NCAV_SHARE", "NCAV"])]
+
+    assert names.index("TOTAL_LIAB") < names.index("NCAV")
+    assert names.index("NCAV") < names.index("NCAV_SHARE")
+    assert names.index("MARKET_VALUE") < names.index("NCAV_SHARE")
+    assert len(names) == len(set(names))
+
+
+def test_shared_intermediate_computed_once():
+    registry = IndicatorRegistry()
+    shared = Mock(side_effect=lambda a, b: a - b)
+    registry.register("DIFF", ["A", "B"])(shared)
+    registry.register("DOUBLE", ["DIFF"])(lambda diff: diff * 2)
+    registry.register("HALF", ["DIFF"])(lambda diff: diff / 2)
+
+    table = pd.DataFrame({"A": [10, 20], "B": [2, 4]})
+    result = registry.evaluate(table, ["DOUBLE", "HALF"])
+
+    assert shared.call_count == 1
+    assert list(result.columns) == ["A", "B", "DOUBLE", "HALF"]
+    assert list(result["DOUBLE"]) == [16, 32]
+
+
+def test_table_column_widened_once():
+    registry = IndicatorRegistry()
+    arrays = list()
+    registry.register("X", ["A"])(lambda a: arrays.append(a) or a)
+    registry.register("Y", ["A"])(lambda a: arrays.append(a) or a)
+
+    table = pd.DataFrame({"A": pd.Series([1, 2], dtype="int32")})
+    registry.evaluate(table, ["X", "Y"])
+
+    assert arrays[0] is arrays[1]
+    assert arrays[0].dtype == "int64"
+
+
+def test_circular_dependency():
+    registry = IndicatorRegistry()
+    registry.register("A", ["B"])(lambda b: b)
+    registry.register("B", ["A"])(lambda a: a)
+
+    with pytest.raises(ValueError):
+        registry.plan(["A"])
+
+
+def test_evaluate_with_enterprise_value():
+    with open(os.path.join(ROOT_DIR, "config.yaml")) as f:
+        config = yaml.safe_load(f)
+
+    registry = INDICATORS.copy()
+    EnterpriseValue(config["EVAL"]).register(registry)
+    names = [spec.name for spec in registry.plan(["EV_SHARE"])]
+    assert names == ["NET_WORKING_CAPITAL", "EV_SHARE"]
+
+    table = pd.DataFrame(
+        {
+            "OPERATING_PROFIT": [100],
+            "CURRENT_ASSET": [1000],
+            "CURRENT_LIAB": [100],
+            "NON_CURRENT_ASSET": [500],
+            "NON_CURRENT_LIAB": [200],
+            "ISSUED_STOCK": [10],
+            "STOCK_PRICE": [7],
+        }
+    )
+    result = registry.evaluate(table, ["NCAV_SHARE", "EV_SHARE_BUFFERED"])
+
+    assert result["NCAV_SHARE"].iloc[0] == pytest.approx(700 / 70)
+    assert result["EV_SHARE_BUFFERED"].iloc[0] == pytest.approx(
+        (1000 - (1000 - 110) + 400) / 10 * 0.8
+    )
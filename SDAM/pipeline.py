@@ -0,0 +1,146 @@
+import threading
+from queue import Queue
+from logging import Logger
+
+_END = object()
+
+
+class StreamingPipeline(object):
+    """collector, annotator, indicator를 chunk 단위로 겹쳐서 실행합니다.
+
+    collector가 수집한 chunk는 바로 annotator로 넘어가고, 주가가 붙은 chunk는
+    indicator를 거쳐 ResultStore의 해당 분기에 staging됩니다. 모든 chunk가
+    저장되면 staging된 partition이 기존 partition을 대체하므로, 중간에 실패하면
+    기존 partition이 그대로 남습니다. 각 단계는 별도의 thread에서 실행되며 단계
+    사이의 queue는 queue_size개의 chunk까지만 담으므로, 기업 수와 관계없이
+    메모리에는 최대 (queue_size * 2 + 3)개의 chunk만 올라갑니다. 한 단계가
+    실패하면 collector는 더 이상 수집하지 않습니다.
+
+    Parameters
+    ----------
+    collector (DART): iter_table을 제공하는 수집기
+    annotator (Annotator): 주가를 붙이는 annotator
+    indicator (Indicator): 지표를 계산하는 indicator
+    logger (Logger): python built-in logger
+    queue_size (int): 단계 사이에 대기할 수 있는 chunk의 수
+
+    Example
+    -------
+        >>> pipeline = StreamingPipeline(DART_API, annotator, indicator, LOGGER)
+        >>> pipeline.run(account_names, 2022, 1, ResultStore("results/store"))
+        2493
+    """
+
+    def __init__(
+        self,
+        collector,
+        annotator,
+        indicator,
+        logger: Logger = Logger(__name__),
+        queue_size: int = 4,
+    ) -> None:
+        self.collector = collector
+        self.annotator = annotator
+        self.indicator = indicator
+        self.logger = logger
+        self.queue_size = queue_size
+
+    def _produce(
+        self, chunks, outbox: Queue, errors: list, stop: threading.Event
+    ) -> None:
+        try:
+            for chunk in chunks:
+                if stop.is_set():
+                    break
+                outbox.put(chunk)
+        except Exception as error:
+            errors.append(error)
+            stop.set()
+        finally:
+            chunks.close()
+            outbox.put(_END)
+
+    def _transform(
+        self, func, inbox: Queue, outbox: Queue, errors: list, stop: threading.Event
+    ) -> None:
+        try:
+            while True:
+                chunk = inbox.get()
+                if chunk is _END:
+                    break
+                outbox.put(func(chunk))
+        except Exception as error:
+            errors.append(error)
+            stop.set()
+            while inbox.get() is not _END:
+                continue
+        finally:
+            outbox.put(_END)
+
+    def run(
+        self,
+        account_names: list,
+        year: int,
+        quarter: int,
+        store,
+        batch: bool = False,
+        chunk_size: int = 100,
+    ) -> int:
+        """수집부터 지표 계산까지 실행하여 store에 저장하고 행의 수를 반환합니다."""
+
+        self.logger.info("In processing: streaming pipeline.")
+
+        collected = Queue(maxsize=self.queue_size)
+        annotated = Queue(maxsize=self.queue_size)
+        errors = list()
+        stop = threading.Event()
+
+        chunks = self.collector.iter_table(
+            account_names, year, quarter, batch=batch, chunk_size=chunk_size
+        )
+        stages = [
+            threading.Thread(
+                target=self._produce,
+                args=(chunks, collected, errors, stop),
+                daemon=True,
+            ),
+            threading.Thread(
+                target=self._transform,
+                args=(self.annotator.annotate, collected, annotated, errors, stop),
+                daemon=True,
+            ),
+        ]
+        store.discard_staged(year, quarter)
+        for stage in stages:
+            stage.start()
+
+        n_rows = 0
+        while True:
+            chunk = annotated.get()
+            if chunk is _END:
+                break
+            if errors:
+                continue
+
+            try:
+                table = self.indicator.indicate(chunk)
+                store.append_staged(table, year, quarter)
+            except Exception as error:
+                errors.append(error)
+                stop.set()
+                continue
+
+            n_rows += len(table)
+            self.logger.debug(f"{n_rows} rows staged for {year} Q{quarter}")
+
+        for stage in stages:
+            stage.join()
+
+        if errors:
+            store.discard_staged(year, quarter)
+            raise errors[0]
+
+        store.commit_staged(year, quarter)
+
+        self.logger.info("End of processing: streaming pipeline.")
+        return n_rows
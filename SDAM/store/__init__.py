@@ -0,0 +1,3 @@
+from ._store import ResultStore
+
+__all__ = ["ResultStore"]
@@ -0,0 +1,262 @@
+import os
+import re
+import json
+import shutil
+
+import numpy as np
+import pandas as pd
+
+SCHEMA_FILE = "_schema.json"
+REFRESH_FILE = "_refreshed.json"
+# .tmp and .old directories staged by write() are not partitions or parts
+YEAR_DIR = re.compile(r"^year=(\d+)$")
+QUARTER_DIR = re.compile(r"^quarter=(\d+)$")
+PART_DIR = re.compile(r"^part-\d{5}$")
+
+
+class ResultStore(object):
+    """Columnar store of result tables partitioned by year and quarter
+
+    Each partition holds one or more parts, and each part stores every column
+    as a .npy file, so tables are read without parsing text and columns can
+    be memory-mapped and selected individually. String columns are stored as
+    fixed-width unicode arrays, and their missing values as a boolean mask
+    next to them, restored as NaN on read.
+
+        root/year=2022/quarter=1/part-00000/_schema.json
+        root/year=2022/quarter=1/part-00000/c0.npy
+        ...
+
+    Parameters
+    ----------
+    root (str): directory of the store
+
+    Example
+    -------
+        >>> store = ResultStore("results/store")
+        >>> store.write(table, 2022, 1)
+        >>> store.append(next_chunk, 2022, 1)
+        >>> store.read(columns=["NCAV_SHARE"], partitions=[(2022, 1)])
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _partition_dir(self, year: int, quarter: int) -> str:
+        return os.path.join(self.root, f"year={year}", f"quarter={quarter}")
+
+    def partitions(self) -> list:
+        """Stored (year, quarter) partitions in order"""
+
+        partitions = list()
+        for year_dir in os.listdir(self.root):
+            year = YEAR_DIR.match(year_dir)
+            if year is None:
+                continue
+            for quarter_dir in os.listdir(os.path.join(self.root, year_dir)):
+                quarter = QUARTER_DIR.match(quarter_dir)
+                if quarter is not None:
+                    partitions.append((int(year.group(1)), int(quarter.group(1))))
+
+        return sorted(partitions)
+
+    def _parts(self, year: int, quarter: int) -> list:
+        partition_dir = self._partition_dir(year, quarter)
+        if not os.path.isdir(partition_dir):
+            return list()
+
+        return [
+            os.path.join(partition_dir, part)
+            for part in sorted(os.listdir(partition_dir))
+            if PART_DIR.match(part)
+        ]
+
+    @staticmethod
+    def _write_part(table: pd.DataFrame, part_dir: str) -> None:
+        tmp_dir = part_dir + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        index_names = [name for name in table.index.names if name is not None]
+        table = table.reset_index() if index_names else table
+
+        columns = list()
+        for idx, name in enumerate(table.columns):
+            values = table[name].to_numpy()
+            column = {"name": name, "file": f"c{idx}.npy"}
+            if values.dtype == object:
+                missing = pd.isna(values)
+                if missing.any():
+                    column["missing"] = f"c{idx}.missing.npy"
+                    np.save(os.path.join(tmp_dir, column["missing"]), missing)
+                    values = np.where(missing, "", values)
+                values = values.astype(str)
+
+            np.save(os.path.join(tmp_dir, column["file"]), values, allow_pickle=False)
+            columns.append(column)
+
+        with open(os.path.join(tmp_dir, SCHEMA_FILE), "w", encoding="UTF-8") as fh:
+            json.dump(
+                {"index": index_names, "columns": columns, "rows": len(table)},
+                fh,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_dir, part_dir)
+
+    def write(self, table: pd.DataFrame, year: int, quarter: int) -> None:
+        """Replace the partition of (year, quarter) with table"""
+
+        self.discard_staged(year, quarter)
+        self.append_staged(table, year, quarter)
+        self.commit_staged(year, quarter)
+
+    def append_staged(self, table: pd.DataFrame, year: int, quarter: int) -> None:
+        """Add table as a new part of the staged partition of (year, quarter)
+
+        Staged parts are not read until commit_staged replaces the partition
+        with them.
+        """
+
+        tmp_dir = self._partition_dir(year, quarter) + ".tmp"
+        os.makedirs(tmp_dir, exist_ok=True)
+        n_parts = sum(1 for part in os.listdir(tmp_dir) if PART_DIR.match(part))
+        self._write_part(table, os.path.join(tmp_dir, f"part-{n_parts:05d}"))
+
+    def commit_staged(self, year: int, quarter: int) -> None:
+        """Replace the partition of (year, quarter) with its staged parts
+
+        Without staged parts the partition is dropped.
+        """
+
+        partition_dir = self._partition_dir(year, quarter)
+        tmp_dir = partition_dir + ".tmp"
+        if not os.path.isdir(tmp_dir):
+            self.drop(year, quarter)
+            return
+
+        old_dir = partition_dir + ".old"
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if os.path.isdir(partition_dir):
+            os.replace(partition_dir, old_dir)
+        os.replace(tmp_dir, partition_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    def discard_staged(self, year: int, quarter: int) -> None:
+        shutil.rmtree(self._partition_dir(year, quarter) + ".tmp", ignore_errors=True)
+
+    def append(self, table: pd.DataFrame, year: int, quarter: int) -> None:
+        """Add table as a new part of the partition of (year, quarter)"""
+
+        partition_dir = self._partition_dir(year, quarter)
+        os.makedirs(partition_dir, exist_ok=True)
+        parts = self._parts(year, quarter)
+        next_part = int(os.path.basename(parts[-1])[5:]) + 1 if parts else 0
+        self._write_part(table, os.path.join(partition_dir, f"part-{next_part:05d}"))
+
+    def write_panel(self, panel: pd.DataFrame) -> None:
+        """Write a panel indexed by (..., YEAR, QUARTER), one partition per period"""
+
+        for (year, quarter), table in panel.groupby(level=["YEAR", "QUARTER"]):
+            self.write(table.droplevel(["YEAR", "QUARTER"]), year, quarter)
+
+    def patch(self, table: pd.DataFrame, year: int, quarter: int) -> None:
+        """Replace the rows of table in the partition of (year, quarter)
+
+        Rows are matched on the index. Rows not in the partition yet are added
+        at the end, and the partition is rewritten as one part.
+        """
+
+        existing = self.read(partitions=[(year, quarter)], mmap=False)
+        if existing.empty:
+            self.write(table, year, quarter)
+            return
+
+        existing = existing.drop(columns=["YEAR", "QUARTER"])
+        kept = existing.loc[~existing.index.isin(table.index)]
+        order = list(existing.index) + list(table.index.difference(existing.index))
+        patched = pd.concat([kept, table[existing.columns]]).loc[order]
+        self.write(patched, year, quarter)
+
+    def refreshed_on(self, year: int, quarter: int) -> str:
+        """Date (YYYY-MM-DD) the partition was last brought up to date, or None"""
+
+        path = os.path.join(self.root, REFRESH_FILE)
+        if not os.path.exists(path):
+            return None
+
+        with open(path, encoding="UTF-8") as fh:
+            return json.load(fh).get(f"{year}/{quarter}")
+
+    def mark_refreshed(self, year: int, quarter: int, date: str) -> None:
+        """Record that the partition is up to date with filings before date"""
+
+        path = os.path.join(self.root, REFRESH_FILE)
+        state = dict()
+        if os.path.exists(path):
+            with open(path, encoding="UTF-8") as fh:
+                state = json.load(fh)
+
+        state[f"{year}/{quarter}"] = date
+        with open(path + ".tmp", "w", encoding="UTF-8") as fh:
+            json.dump(state, fh)
+        os.replace(path + ".tmp", path)
+
+    def drop(self, year: int, quarter: int) -> None:
+        shutil.rmtree(self._partition_dir(year, quarter), ignore_errors=True)
+
+    def read_columns(
+        self, year: int, quarter: int, columns: list = None, mmap: bool = True
+    ) -> list:
+        """(index names, {column: array}) of each part of a partition
+
+        Index columns are always read. Arrays are memory-mapped unless mmap is False.
+        String columns with missing values are read into object arrays with NaN.
+        """
+
+        parts = list()
+        for part_dir in self._parts(year, quarter):
+            with open(os.path.join(part_dir, SCHEMA_FILE), encoding="UTF-8") as fh:
+                schema = json.load(fh)
+
+            arrays = dict()
+            for column in schema["columns"]:
+                name = column["name"]
+                if columns is None or name in columns or name in schema["index"]:
+                    arrays[name] = np.load(
+                        os.path.join(part_dir, column["file"]),
+                        mmap_mode="r" if mmap else None,
+                        allow_pickle=False,
+                    )
+                    if "missing" in column:
+                        missing = np.load(os.path.join(part_dir, column["missing"]))
+                        arrays[name] = arrays[name].astype(object)
+                        arrays[name][missing] = np.nan
+            parts.append((schema["index"], arrays))
+
+        return parts
+
+    def read(
+        self, columns: list = None, partitions: list = None, mmap: bool = True
+    ) -> pd.DataFrame:
+        """Read selected columns of selected partitions as one table
+
+        YEAR and QUARTER columns are added from the partition of each row, and
+        the index the tables were written with is restored.
+        """
+
+        frames = list()
+        index_names = list()
+        for year, quarter in partitions or self.partitions():
+            for part_index, arrays in self.read_columns(year, quarter, columns, mmap):
+                index_names = part_index
+                frame = pd.DataFrame(arrays, copy=False)
+                frame["YEAR"] = year
+                frame["QUARTER"] = quarter
+                frames.append(frame)
+
+        if not frames:
+            return pd.DataFrame(columns=(columns or list()) + ["YEAR", "QUARTER"])
+
+        table = pd.concat(frames, ignore_index=True)
+        return table.set_index(index_names) if index_names else table
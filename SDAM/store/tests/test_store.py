@@ -0,0 +1,122 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.dirname(TEST_DIR)
+ROOT_DIR = os.path.dirname(STORE_DIR)
+sys.path.append(ROOT_DIR)
+
+from store import ResultStore
+
+
+def make_table(codes, ncav_share):
+    return pd.DataFrame(
+        {
+            "KRX_CODE": codes,
+            "CORP_NAME": [f"corp_{code}" for code in codes],
+            "CURRENT_ASSET": np.arange(len(codes), dtype=np.int64) * 10**13,
+            "NCAV_SHARE": ncav_share,
+        }
+    ).set_index("KRX_CODE")
+
+
+@pytest.fixture()
+def store(tmp_path):
+    return ResultStore(str(tmp_path / "store"))
+
+
+def test_write_and_read(store):
+    table = make_table(["005930", "950130"], [0.5, 1.5])
+    store.write(table, 2022, 1)
+
+    result = store.read()
+    assert list(result.index) == ["005930", "950130"]
+    assert list(result["CORP_NAME"]) == ["corp_005930", "corp_950130"]
+    assert result["CURRENT_ASSET"].iloc[1] == 10**13
+    assert list(result["QUARTER"]) == [1, 1]
+
+
+def test_append_and_select(store):
+    store.append(make_table(["005930"], [0.5]), 2022, 1)
+    store.append(make_table(["950130"], [1.5]), 2022, 1)
+    store.write(make_table(["000660"], [2.5]), 2022, 2)
+
+    assert store.partitions() == [(2022, 1), (2022, 2)]
+
+    result = store.read(columns=["NCAV_SHARE"], partitions=[(2022, 1)])
+    assert list(result.columns) == ["NCAV_SHARE", "YEAR", "QUARTER"]
+    assert list(result.index) == ["005930", "950130"]
+
+    store.write(make_table(["035720"], [3.5]), 2022, 1)
+    assert list(store.read(partitions=[(2022, 1)]).index) == ["035720"]
+
+
+def test_read_columns_memory_mapped(store):
+    store.write(make_table(["005930", "950130"], [0.5, 1.5]), 2022, 1)
+
+    [(index_names, arrays)] = store.read_columns(2022, 1, ["NCAV_SHARE"])
+    assert index_names == ["KRX_CODE"]
+    assert isinstance(arrays["NCAV_SHARE"], np.memmap)
+    assert set(arrays) == {"KRX_CODE", "NCAV_SHARE"}
+
+
+def test_write_panel(store):
+    panel = pd.concat(
+        [
+            make_table(["005930"], [0.5]).assign(YEAR=2021, QUARTER=4),
+            make_table(["005930"], [0.7]).assign(YEAR=2022, QUARTER=1),
+        ]
+    ).set_index(["YEAR", "QUARTER"], append=True)
+    store.write_panel(panel)
+
+    assert store.partitions() == [(2021, 4), (2022, 1)]
+    assert list(store.read()["NCAV_SHARE"]) == [0.5, 0.7]
+
+
+def test_patch_replaces_and_adds_rows(store):
+    store.write(make_table(["005930", "950130"], [0.5, 1.5]), 2022, 1)
+
+    store.patch(make_table(["950130", "000660"], [2.5, 3.5]), 2022, 1)
+
+    result = store.read(partitions=[(2022, 1)])
+    assert list(result.index) == ["005930", "950130", "000660"]
+    assert list(result["NCAV_SHARE"]) == [0.5, 2.5, 3.5]
+
+
+def test_refresh_state(store):
+    assert store.refreshed_on(2022, 1) is None
+
+    store.mark_refreshed(2022, 1, "2022-05-16")
+    store.mark_refreshed(2022, 2, "2022-08-16")
+
+    assert store.refreshed_on(2022, 1) == "2022-05-16"
+    assert store.partitions() == []
+
+
+def test_ignores_staged_directories(store):
+    store.write(make_table(["005930"], [0.5]), 2022, 1)
+    partition_dir = os.path.join(store.root, "year=2022", "quarter=1")
+    os.makedirs(partition_dir + ".tmp")
+    os.makedirs(partition_dir + ".old")
+    os.makedirs(os.path.join(partition_dir, "part-00001.tmp"))
+
+    assert store.partitions() == [(2022, 1)]
+    assert list(store.read().index) == ["005930"]
+
+    store.append(make_table(["950130"], [1.5]), 2022, 1)
+    store.write(make_table(["000660"], [2.5]), 2022, 1)
+    assert list(store.read().index) == ["000660"]
+
+
+def test_keeps_missing_strings_missing(store):
+    table = make_table(["005930", "950130"], [0.5, 1.5])
+    table["CORP_NAME"] = ["삼성전자", None]
+    store.write(table, 2022, 1)
+
+    result = store.read()
+    assert result["CORP_NAME"].iloc[0] == "삼성전자"
+    assert pd.isna(result["CORP_NAME"].iloc[1])
+    assert list(result.index) == ["005930", "950130"]
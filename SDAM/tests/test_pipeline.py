@@ -0,0 +1,97 @@
+import os
+import sys
+import pytest
+import pandas as pd
+from unittest.mock import Mock
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TEST_DIR)
+sys.path.append(ROOT_DIR)
+
+from store import ResultStore
+from pipeline import StreamingPipeline
+
+
+def make_chunks(n_chunks):
+    for idx in range(n_chunks):
+        yield pd.DataFrame(
+            {"KRX_CODE": [f"{idx:06}"], "CURRENT_ASSET": [idx]}
+        ).set_index("KRX_CODE")
+
+
+def annotate(table):
+    table["STOCK_PRICE"] = 1000
+    return table
+
+
+def indicate(table):
+    table["NCAV"] = table["CURRENT_ASSET"] * 2
+    return table
+
+
+def test_pipeline_writes_all_chunks(tmp_path):
+    collector = Mock()
+    collector.iter_table.return_value = make_chunks(10)
+    pipeline = StreamingPipeline(
+        collector,
+        Mock(annotate=annotate),
+        Mock(indicate=indicate),
+        logger=Mock(),
+        queue_size=1,
+    )
+
+    store = ResultStore(str(tmp_path / "store"))
+    assert pipeline.run(["유동자산"], 2022, 1, store) == 10
+
+    table = store.read()
+    assert list(table.columns) == [
+        "CURRENT_ASSET",
+        "STOCK_PRICE",
+        "NCAV",
+        "YEAR",
+        "QUARTER",
+    ]
+    assert list(table["NCAV"]) == [idx * 2 for idx in range(10)]
+
+
+def test_pipeline_raises_stage_error(tmp_path):
+    collector = Mock()
+    collector.iter_table.return_value = make_chunks(10)
+    pipeline = StreamingPipeline(
+        collector,
+        Mock(annotate=Mock(side_effect=ValueError("naver"))),
+        Mock(indicate=indicate),
+        logger=Mock(),
+        queue_size=1,
+    )
+
+    with pytest.raises(ValueError):
+        pipeline.run(["유동자산"], 2022, 1, ResultStore(str(tmp_path / "store")))
+
+
+def test_pipeline_keeps_partition_and_stops_collecting_on_error(tmp_path):
+    store = ResultStore(str(tmp_path / "store"))
+    store.write(pd.DataFrame({"KRX_CODE": ["005930"]}).set_index("KRX_CODE"), 2022, 1)
+
+    produced = list()
+
+    def chunks():
+        for chunk in make_chunks(1000):
+            produced.append(chunk)
+            yield chunk
+
+    collector = Mock()
+    collector.iter_table.return_value = chunks()
+    pipeline = StreamingPipeline(
+        collector,
+        Mock(annotate=annotate),
+        Mock(indicate=Mock(side_effect=ValueError("indicate"))),
+        logger=Mock(),
+        queue_size=1,
+    )
+
+    with pytest.raises(ValueError):
+        pipeline.run(["유동자산"], 2022, 1, store)
+
+    assert list(store.read().index) == ["005930"]
+    assert len(produced) < 10
@@ -0,0 +1,29 @@
+import os
+import sys
+import time
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TEST_DIR)
+sys.path.append(ROOT_DIR)
+
+from throttle import RateLimiter
+
+
+def test_rate_limiter_caps_rate():
+    limiter = RateLimiter(rate=50)
+
+    start = time.monotonic()
+    for _ in range(11):
+        limiter.acquire()
+
+    assert time.monotonic() - start >= 0.19
+
+
+def test_rate_limiter_unlimited():
+    limiter = RateLimiter(rate=None)
+
+    start = time.monotonic()
+    for _ in range(1000):
+        limiter.acquire()
+
+    assert time.monotonic() - start < 0.1
@@ -0,0 +1,44 @@
+import time
+import threading
+
+
+class RateLimiter(object):
+    """Thread-safe token bucket limiting how often a shared resource is hit
+
+    Parameters
+    ----------
+    rate (float): tokens refilled per second. None or 0 disables the limit
+    burst (int): maximum number of tokens kept in the bucket
+
+    Example
+    -------
+        >>> limiter = RateLimiter(rate=10)
+        >>> limiter.acquire()  # blocks until a token is available
+    """
+
+    def __init__(self, rate: float = None, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self) -> None:
+        if not self.rate:
+            return
+
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)